@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+"""
+Dashboard 共用模組
+==================
+儀表板腳本（update_dashboard.py 與 scripts/update_tools.py）共用的元件
+
+Author: abc214315
+License: MIT
+"""
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+非同步 GitHub API 客戶端
+========================
+以 aiohttp 的共用連線池（keep-alive）發送請求，彼此獨立的請求透過
+asyncio.gather 重疊等待時間。PyGithub 每次延遲載入屬性都是一個阻塞的
+往返，這裡則由呼叫端一次排出所有請求，並以 concurrency 限制同時在途的數量。
+
+aiohttp 為選用依賴且導入成本高，只在建立客戶端時才導入；
+未安裝時導入本模組不會失敗，建立客戶端時才會報錯。
+
+每個請求都經過 RequestScheduler：節流與暫時性錯誤自動退避重試，
+並行視窗依速率限制回應自動調整。
+"""
+
+import asyncio
+import json
+import re
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from dashboard.graphql import (BRANCH_REFS_QUERY, GITHUB_API_URL, PAGE_SIZE,
+                               REPOSITORY_INVENTORY_QUERY, graphql_url_for)
+from dashboard import scheduler as scheduling
+from dashboard.scheduler import RequestScheduler, active_scheduler
+from dashboard.telemetry import Telemetry, active_telemetry
+
+# 預設同時在途的請求數（也是連線池大小）
+DEFAULT_CONCURRENCY = 10
+
+_NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+class AsyncGitHubError(Exception):
+    """非同步請求失敗（HTTP 狀態碼非 2xx 或 GraphQL 回應包含 errors）"""
+
+    def __init__(self, message: str, status: Optional[int] = None, errors: Optional[list] = None):
+        super().__init__(message)
+        self.status = status
+        self.errors = errors or []
+
+
+class BudgetExhausted(AsyncGitHubError, scheduling.BudgetExhausted):
+    """已達本次執行的請求預算上限（客戶端的 max_requests 或排程器的 budget）"""
+
+
+class AsyncGitHubClient:
+    """
+    最小化的非同步 GitHub REST/GraphQL 客戶端
+
+    用法：
+        async with AsyncGitHubClient(token) as client:
+            repo = await client.get_json('/repos/owner/name')
+    """
+
+    def __init__(self, token: str, base_url: str = GITHUB_API_URL,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: int = 30,
+                 telemetry: Optional[Telemetry] = None, max_requests: int = 0,
+                 scheduler: Optional[RequestScheduler] = None):
+        """
+        初始化客戶端
+
+        Args:
+            token (str): GitHub Personal Access Token
+            base_url (str): REST API 基礎網址
+            concurrency (int): 同時在途的請求上限（連線池大小）
+            timeout (int): 單一請求逾時秒數
+            telemetry (Telemetry): 遙測收集器，默認使用目前已安裝的收集器
+            max_requests (int): 本客戶端最多發送的請求數，0 表示不限制
+            scheduler (RequestScheduler): 請求排程器，默認使用共用 session 上已安裝的排程器，
+                都沒有時建立一個以 concurrency 為視窗上限的排程器
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise RuntimeError("非同步客戶端需要 aiohttp，請執行: pip install aiohttp") from None
+        self._aiohttp = aiohttp
+        self.base_url = base_url.rstrip('/')
+        self.graphql_url = graphql_url_for(self.base_url)
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_requests = max_requests
+        self.requests = 0
+        self.telemetry = telemetry if telemetry is not None else active_telemetry()
+        if scheduler is None:
+            scheduler = active_scheduler() or RequestScheduler(max_concurrency=self.concurrency)
+        self.scheduler = scheduler
+        self.headers = {
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github+json',
+            'User-Agent': 'branch-dashboard',
+        }
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncGitHubClient':
+        aiohttp = self._aiohttp
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._session.close()
+        self._session = None
+
+    @property
+    def exhausted(self) -> bool:
+        """是否已用完請求預算"""
+        return (bool(self.max_requests) and self.requests >= self.max_requests) or self.scheduler.exhausted
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith(('http://', 'https://')) else f"{self.base_url}{path}"
+
+    async def request(self, method: str, path: str, params: Optional[Dict] = None,
+                      payload: Optional[Dict] = None) -> Tuple[object, Dict]:
+        """
+        發送單一請求並解析 JSON
+
+        Args:
+            method (str): HTTP 方法
+            path (str): API 路徑（'/repos/...'）或完整網址
+            params (Dict): 查詢參數
+            payload (Dict): JSON 請求內容
+
+        Returns:
+            Tuple[object, Dict]: (解析後的 JSON, 回應標頭)
+
+        Raises:
+            AsyncGitHubError: HTTP 狀態碼非 2xx（重試後）
+            BudgetExhausted: 已達 max_requests 或排程器的預算上限
+            RateLimited: 重試次數用完仍被速率限制
+        """
+        if self.exhausted:
+            raise BudgetExhausted(f"已達請求預算上限（{self.max_requests or self.scheduler.budget} 個請求）")
+        self.requests += 1
+        url = self._url(path)
+        body = json.dumps(payload) if payload is not None else None
+        scheduler = self.scheduler
+        attempt = 0
+        while True:
+            try:
+                await scheduler.acquire_async()
+            except scheduling.BudgetExhausted as e:
+                raise BudgetExhausted(str(e)) from None
+            try:
+                status, headers, raw = await self._send(method, url, params, body)
+            except (self._aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                scheduler.release()
+                delay = scheduler.observe_error(attempt)
+                if delay is None:
+                    raise
+            else:
+                scheduler.release()
+                delay = scheduler.observe(status, headers, raw if status == 403 else b'', attempt)
+                if delay is None:
+                    break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if status >= 400:
+            raise AsyncGitHubError(f"HTTP {status}: {raw[:200].decode('utf-8', 'replace')}", status=status)
+        return (json.loads(raw) if raw else None), headers
+
+    async def _send(self, method: str, url: str, params: Optional[Dict], body: Optional[str]):
+        """發送一次請求並記錄遙測，返回 (狀態碼, 標頭, 內容)"""
+        async with self._semaphore:
+            async with self._session.request(method, url, params=params, data=body,
+                                             headers={'Content-Type': 'application/json'} if body else None) as response:
+                raw = await response.read()
+                if self.telemetry is not None:
+                    self.telemetry.record(method, str(response.url), body, response.status, response.headers, len(raw))
+                return response.status, response.headers, raw
+
+    async def get_json(self, path: str, params: Optional[Dict] = None):
+        """GET 並返回解析後的 JSON"""
+        data, _ = await self.request('GET', path, params=params)
+        return data
+
+    async def paginate(self, path: str, params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        依 Link 標頭逐頁產生列表項目（每頁 100 個）
+
+        Args:
+            path (str): 列表端點路徑
+            params (Dict): 額外查詢參數
+
+        Yields:
+            Dict: 列表中的每個項目
+        """
+        url, query = self._url(path), dict(params or {}, per_page=PAGE_SIZE)
+        while url:
+            items, headers = await self.request('GET', url, params=query)
+            for item in items:
+                yield item
+            match = _NEXT_LINK.search(headers.get('Link', ''))
+            # next 連結已包含所有查詢參數
+            url, query = (match.group(1), None) if match else (None, None)
+
+    async def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """
+        執行 GraphQL 查詢
+
+        Returns:
+            Dict: 回應中的 data 欄位
+
+        Raises:
+            AsyncGitHubError: HTTP 錯誤或回應包含 errors
+        """
+        payload, _ = await self.request('POST', self.graphql_url,
+                                        payload={'query': query, 'variables': variables or {}})
+        if payload.get('errors'):
+            messages = '; '.join(e.get('message', 'Unknown error') for e in payload['errors'])
+            raise AsyncGitHubError(messages, errors=payload['errors'])
+        return payload.get('data') or {}
+
+    async def iter_branch_refs(self, owner: str, name: str,
+                               page_size: int = PAGE_SIZE) -> AsyncIterator[Dict]:
+        """
+        逐頁產生分支 ref 節點（與 GraphQLClient.iter_branch_refs 相同格式）
+
+        Yields:
+            Dict: refs 節點
+        """
+        after = None
+        while True:
+            data = await self.graphql(BRANCH_REFS_QUERY, {
+                'owner': owner, 'name': name, 'first': min(page_size, PAGE_SIZE), 'after': after,
+            })
+            repository = data.get('repository')
+            if repository is None:
+                raise AsyncGitHubError(f"找不到倉庫: {owner}/{name}")
+            refs = repository['refs']
+            for node in refs['nodes']:
+                yield node
+            if not refs['pageInfo']['hasNextPage']:
+                break
+            after = refs['pageInfo']['endCursor']
+
+    async def iter_repositories(self, login: str, page_size: int = PAGE_SIZE) -> AsyncIterator[Dict]:
+        """
+        逐頁產生帳號的公開倉庫清單（與 GraphQLClient.iter_repositories 相同格式）
+
+        Yields:
+            Dict: repositories 節點
+        """
+        after = None
+        while True:
+            data = await self.graphql(REPOSITORY_INVENTORY_QUERY, {
+                'login': login, 'first': min(page_size, PAGE_SIZE), 'after': after,
+            })
+            owner = data.get('repositoryOwner')
+            if owner is None:
+                raise AsyncGitHubError(f"找不到帳號: {login}")
+            repositories = owner['repositories']
+            for node in repositories['nodes']:
+                yield node
+            if not repositories['pageInfo']['hasNextPage']:
+                break
+            after = repositories['pageInfo']['endCursor']
+
+    async def gather_json(self, paths: List[str]) -> List[object]:
+        """
+        並行 GET 多個路徑，結果依輸入順序返回；失敗的請求以例外物件代替
+
+        Args:
+            paths (List[str]): API 路徑列表
+
+        Returns:
+            List[object]: 每個路徑的 JSON 或例外
+        """
+        return await asyncio.gather(*(self.get_json(path) for path in paths), return_exceptions=True)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+自架徽章
+========
+工具網格的每個儲存格原本引用兩個 shields.io 徽章與一個 icons8 圖示，
+工具一多，每次瀏覽 Profile 都要經 GitHub 的 camo 代理取得數百張外部圖片。
+這裡在本地產生同樣外觀的小型 SVG，以內容雜湊命名存放在倉庫中：
+
+- 檔名含內容雜湊（assets/badges/use-3fa2b1c4d5e6.svg），內容相同即同一個檔案，
+  內容改變就換檔名，瀏覽器與 camo 可以永久快取。
+- 同一次執行中內容相同的徽章只產生一個檔案。
+- 檔案已存在時不重寫，只有新的或改變的徽章會寫入。
+"""
+
+import hashlib
+import os
+import posixpath
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from dashboard.readme_sections import write_atomic
+from dashboard.render import TOOL_IMAGES
+
+DEFAULT_BADGE_DIR = 'assets/badges'
+
+# 名稱 -> (文字, 底色)，對應 render.TOOL_IMAGES 中的 shields.io 徽章
+BADGES: Dict[str, Tuple[str, str]] = {
+    'use': ('🚀 立即使用', '#4CAF50'),
+    'source': ('📦 源碼', '#2196F3'),
+    'suggest': ('💡 提交建議', '#9C27B0'),
+}
+
+# for-the-badge 樣式：高 28、左右留白 12、粗體 10px 加字距
+_HEIGHT = 28
+_PADDING = 12
+_NARROW_WIDTH = 7.5
+_WIDE_WIDTH = 12.5
+
+_BADGE_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img" aria-label="{label}">'
+    '<title>{label}</title>'
+    '<rect width="{width}" height="{height}" fill="{color}"/>'
+    '<text x="{center:g}" y="18" fill="#fff" text-anchor="middle" '
+    'font-family="Verdana,Geneva,DejaVu Sans,sans-serif" font-size="10" font-weight="bold" '
+    'letter-spacing="1">{text}</text>'
+    '</svg>\n'
+).format
+
+# 取代 icons8 的「程式碼」圖示
+ICON_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="96" height="96" viewBox="0 0 96 96" role="img" '
+    'aria-label="code"><rect x="4" y="4" width="88" height="88" rx="20" fill="#2196F3"/>'
+    '<path d="M38 30 20 48l18 18M58 30l18 18-18 18" fill="none" stroke="#fff" stroke-width="8" '
+    'stroke-linecap="round" stroke-linejoin="round"/></svg>\n'
+)
+
+_XML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+
+def text_width(text: str) -> int:
+    """估算粗體 10px 文字（含字距）的寬度；全形字與 emoji 以較寬的字寬計算"""
+    width = 0.0
+    for char in text:
+        wide = unicodedata.east_asian_width(char) in 'WF' or ord(char) >= 0x1F000
+        width += _WIDE_WIDTH if wide else _NARROW_WIDTH
+    return round(width)
+
+
+def badge_svg(label: str, color: str) -> str:
+    """
+    產生 for-the-badge 樣式的單段徽章
+
+    Args:
+        label (str): 徽章文字（與 shields.io 相同，英文字母轉為大寫）
+        color (str): 底色（CSS 色碼）
+
+    Returns:
+        str: SVG 內容
+    """
+    text = label.upper().translate(_XML_ESCAPES)
+    width = text_width(label) + 2 * _PADDING
+    return _BADGE_SVG(width=width, height=_HEIGHT, color=color, center=width / 2,
+                      label=label.translate(_XML_ESCAPES), text=text)
+
+
+def asset_digest(content: bytes) -> str:
+    """資產內容的雜湊（檔名的一部分）"""
+    return hashlib.sha256(content).hexdigest()[:12]
+
+
+class BadgeStore:
+    """
+    以內容雜湊命名的 SVG 資產目錄
+
+    Attributes:
+        directory (str): 資產目錄（相對於倉庫根目錄，README 以此相對路徑引用）
+        written (int): 本次執行新寫入的檔案數
+        reused (int): 已存在而沿用的檔案數
+    """
+
+    def __init__(self, directory: str = DEFAULT_BADGE_DIR):
+        self.directory = directory
+        self.written = 0
+        self.reused = 0
+        self._paths: Dict[str, str] = {}
+
+    def add(self, name: str, svg: str) -> str:
+        """
+        存入一個 SVG，返回 README 中引用的路徑
+
+        內容與本次已存入的資產相同時直接返回同一個路徑；
+        檔案已存在時（內容由檔名保證相同）不重寫。
+
+        Args:
+            name (str): 檔名前綴
+            svg (str): SVG 內容
+
+        Returns:
+            str: 以 '/' 分隔的相對路徑
+        """
+        content = svg.encode('utf-8')
+        digest = asset_digest(content)
+        if digest in self._paths:
+            return self._paths[digest]
+        filename = f"{name}-{digest}.svg"
+        path = os.path.join(self.directory, filename)
+        if os.path.exists(path):
+            self.reused += 1
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            write_atomic(path, svg)
+            self.written += 1
+        self._paths[digest] = posixpath.join(self.directory.replace(os.sep, '/'), filename)
+        return self._paths[digest]
+
+    def tool_images(self) -> Dict[str, str]:
+        """
+        產生工具網格用到的所有圖片，返回可傳給 render.tools_grid 的對照表
+
+        Returns:
+            Dict[str, str]: 與 render.TOOL_IMAGES 相同的鍵 -> 倉庫內的路徑
+        """
+        images = {name: self.add(name, badge_svg(label, color)) for name, (label, color) in BADGES.items()}
+        images['icon'] = self.add('icon', ICON_SVG)
+        missing = set(TOOL_IMAGES) - set(images)
+        if missing:
+            raise ValueError(f"缺少圖片: {', '.join(sorted(missing))}")
+        return images
+
+    def paths(self) -> List[str]:
+        """本次執行引用的資產路徑（例如交給 Git Data API 一併提交）"""
+        return sorted(self._paths.values())
+
+    def stale(self) -> List[str]:
+        """
+        目錄中本次執行沒有引用的 SVG（內容改變後留下的舊檔名）
+
+        Returns:
+            List[str]: 以 '/' 分隔的相對路徑（例如交給 Git Data API 從倉庫中刪除）
+        """
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        referenced = {posixpath.basename(path) for path in self._paths.values()}
+        directory = self.directory.replace(os.sep, '/')
+        return sorted(posixpath.join(directory, filename) for filename in names
+                      if filename.endswith('.svg') and filename not in referenced)
+
+    def prune(self) -> int:
+        """
+        刪除目錄中本次執行沒有引用的 SVG
+
+        Returns:
+            int: 刪除的檔案數
+        """
+        stale = self.stale()
+        for path in stale:
+            os.unlink(path)
+        return len(stale)
+
+
+def tool_images(directory: Optional[str]) -> Tuple[Dict[str, str], Optional[BadgeStore]]:
+    """
+    工具網格的圖片：指定目錄時改用自架的 SVG，否則沿用外部服務
+
+    Args:
+        directory (str): 資產目錄，None 或空字串表示不自架
+
+    Returns:
+        Tuple[Dict[str, str], Optional[BadgeStore]]: (圖片對照表, 資產目錄)
+    """
+    if not directory:
+        return dict(TOOL_IMAGES), None
+    store = BadgeStore(directory)
+    return store.tool_images(), store
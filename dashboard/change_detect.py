@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+內容雜湊變更偵測
+================
+只對區段的資料部分計算雜湊，並以 HTML 註解嵌在時間戳記之後。
+資料雜湊相同時沿用 README 中的舊區段（包括舊時間戳記），
+因此只有時間戳記不同的執行不會產生任何變更或提交。
+"""
+
+import hashlib
+import os
+import re
+from typing import Iterable, Iterator, Optional
+
+# 雜湊標記一定在區段最後（頁尾之後）；只比對結尾，提交標題等資料中出現相同文字時不會誤判
+HASH_PATTERN = re.compile(r'<!-- data-hash: ([0-9a-f]{16}) -->\s*\Z')
+
+# 無變更時的退出碼（GitHub Actions 的傳統 "neutral" 狀態），需以環境變數開啟
+NOOP_EXIT_CODE = 78
+
+
+def data_hash(data: str) -> str:
+    """
+    計算資料部分的雜湊
+
+    Args:
+        data (str): 不含時間戳記的渲染內容
+
+    Returns:
+        str: 16 位十六進位摘要
+    """
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+def stamp(data: str, footer: str) -> str:
+    """
+    組合資料與頁尾，並在頁尾後嵌入資料雜湊
+
+    Args:
+        data (str): 資料部分（表格、網格等）
+        footer (str): 易變的頁尾（例如更新時間）
+
+    Returns:
+        str: 完整的區段內容
+    """
+    return f"{data}{footer} <!-- data-hash: {data_hash(data)} -->"
+
+
+def stamp_stream(chunks: Iterable[str], footer: str) -> Iterator[str]:
+    """
+    stamp() 的串流版本：邊輸出資料片段邊計算雜湊，最後輸出頁尾與雜湊
+
+    ''.join(stamp_stream(chunks, footer)) 與 stamp(''.join(chunks), footer) 相同。
+
+    Args:
+        chunks (Iterable[str]): 資料部分的片段
+        footer (str): 易變的頁尾
+
+    Yields:
+        str: 輸出片段
+    """
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode('utf-8'))
+        yield chunk
+    yield f"{footer} <!-- data-hash: {digest.hexdigest()[:16]} -->"
+
+
+def extract_hash(section: str) -> Optional[str]:
+    """
+    從區段內容取出資料雜湊（只認區段結尾、頁尾之後的標記）
+
+    Returns:
+        Optional[str]: 雜湊，區段結尾沒有雜湊標記時返回 None
+    """
+    match = HASH_PATTERN.search(section)
+    return match.group(1) if match else None
+
+
+def same_data(old_section: str, new_section: str) -> bool:
+    """
+    判斷新舊區段的資料部分是否相同
+
+    Args:
+        old_section (str): README 中現有的區段內容
+        new_section (str): 新渲染的區段內容
+
+    Returns:
+        bool: 兩者都帶有雜湊且相同時返回 True
+    """
+    new_hash = extract_hash(new_section)
+    return new_hash is not None and new_hash == extract_hash(old_section)
+
+
+def noop_exit_code() -> int:
+    """
+    返回「無變更」時應使用的退出碼
+
+    設置 DASHBOARD_NOOP_EXIT_CODE 環境變數時使用該值（工作流程可據此略過提交），
+    否則返回 0 以維持原本的行為。
+    """
+    value = os.getenv('DASHBOARD_NOOP_EXIT_CODE')
+    return int(value) if value else 0
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+"""
+本地提交圖索引
+==============
+以一次 git rev-list 讀出所有分支可達的提交與其父提交，轉成整數索引的
+鄰接表並計算 generation 數（根提交為 1，其餘為父提交最大值 + 1）。
+
+相對預設分支的 ahead/behind 不逐分支走完整歷史：
+
+- 先標記預設分支可達的所有提交（整個執行只走一次）。
+- ahead：從分支 HEAD 往下走，碰到預設分支可達的提交即停，
+  成本與分支獨有的提交數成正比；碰到的邊界提交即合併基底。
+- behind：預先由舊到新累加預設分支歷史中每個提交的祖先數（合併提交以
+  generation 排序的 paint-down 著色計算其帶進來的提交數），單一合併基底的分支
+  落後數即兩個祖先數相減；多個合併基底時才從預設分支 HEAD 與合併基底同時著色。
+"""
+
+import heapq
+import subprocess
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+_BASE = 1
+_TIP = 2
+
+
+class CommitGraphError(Exception):
+    """無法建立提交圖（不是 Git 倉庫、提交不存在等）"""
+
+
+class CommitGraph:
+    """
+    整數索引的提交圖
+
+    Attributes:
+        index (Dict[str, int]): 完整 SHA -> 索引
+        parents (List[Tuple[int, ...]]): 每個提交的父提交索引
+        generation (List[int]): 每個提交的 generation 數
+    """
+
+    def __init__(self, shas: List[str], parents: List[Tuple[int, ...]]):
+        """
+        Args:
+            shas (List[str]): 提交 SHA，父提交必須排在子提交之後（拓撲順序）
+            parents (List[Tuple[int, ...]]): 每個提交的父提交索引
+        """
+        self.shas = shas
+        self.index = {sha: i for i, sha in enumerate(shas)}
+        self.parents = parents
+        self.generation = [0] * len(shas)
+        # 由最舊的提交往回算，父提交一定先算好
+        for i in range(len(shas) - 1, -1, -1):
+            self.generation[i] = 1 + max((self.generation[p] for p in parents[i]), default=0)
+
+    @classmethod
+    def from_git(cls, path: str, tips: Iterable[str]) -> 'CommitGraph':
+        """
+        以一次 git rev-list --topo-order --parents 讀出 tips 可達的所有提交
+
+        Args:
+            path (str): 倉庫目錄
+            tips (Iterable[str]): 分支 HEAD 的完整 SHA
+
+        Returns:
+            CommitGraph: 提交圖
+
+        Raises:
+            CommitGraphError: git 執行失敗
+        """
+        tips = '\n'.join(tips)
+        if not tips:
+            return cls([], [])
+        try:
+            output = subprocess.run(
+                ['git', '-C', path, 'rev-list', '--topo-order', '--parents', '--stdin'],
+                input=tips + '\n', check=True, capture_output=True, text=True,
+            ).stdout
+        except FileNotFoundError:
+            raise CommitGraphError("找不到 git 指令") from None
+        except subprocess.CalledProcessError as e:
+            raise CommitGraphError(e.stderr.strip() or f"git rev-list 失敗（{e.returncode}）") from None
+
+        rows = [line.split() for line in output.splitlines()]
+        index = {row[0]: i for i, row in enumerate(rows)}
+        # 淺層檢出的邊界提交，其父提交不在輸出中，視為根提交
+        parents = [tuple(index[p] for p in row[1:] if p in index) for row in rows]
+        return cls([row[0] for row in rows], parents)
+
+    def __len__(self) -> int:
+        return len(self.shas)
+
+    def reachable(self, tip: int) -> bytearray:
+        """
+        標記 tip 可達的所有提交（含 tip）
+
+        Returns:
+            bytearray: 第 i 個位元組為 1 表示提交 i 可達
+        """
+        mask = bytearray(len(self.shas))
+        mask[tip] = 1
+        stack = [tip]
+        while stack:
+            for parent in self.parents[stack.pop()]:
+                if not mask[parent]:
+                    mask[parent] = 1
+                    stack.append(parent)
+        return mask
+
+    def _ahead(self, tip: int, base_mask: bytearray) -> Tuple[int, FrozenSet[int]]:
+        """從 tip 往下走到預設分支可達的提交為止，返回 (獨有提交數, 合併基底)"""
+        if base_mask[tip]:
+            return 0, frozenset((tip,))
+        seen = {tip}
+        bases = set()
+        stack = [tip]
+        while stack:
+            for parent in self.parents[stack.pop()]:
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                if base_mask[parent]:
+                    bases.add(parent)
+                else:
+                    stack.append(parent)
+        return len(seen) - len(bases), frozenset(bases)
+
+    def _exclusive(self, starts: Iterable[int], stops: Iterable[int]) -> int:
+        """
+        starts 可達、但 stops 不可達的提交數
+
+        依 generation 由大到小著色（子提交一定先於父提交處理），
+        佇列中只剩 stops 可達的提交時即停，成本與結果大小成正比。
+        """
+        generation = self.generation
+        flags: Dict[int, int] = {}
+        for commit in starts:
+            flags[commit] = _BASE
+        for commit in stops:
+            flags[commit] = flags.get(commit, 0) | _TIP
+        heap = [(-generation[commit], commit) for commit in flags]
+        heapq.heapify(heap)
+        # 佇列中尚未被 stops 著色的提交數，歸零即可停止
+        pending = sum(1 for flag in flags.values() if flag == _BASE)
+        count = 0
+        while pending:
+            _, commit = heapq.heappop(heap)
+            flag = flags[commit]
+            if flag == _BASE:
+                pending -= 1
+                count += 1
+            for parent in self.parents[commit]:
+                old = flags.get(parent)
+                if old is None:
+                    flags[parent] = flag
+                    heapq.heappush(heap, (-generation[parent], parent))
+                    if flag == _BASE:
+                        pending += 1
+                elif old | flag != old:
+                    flags[parent] = old | flag
+                    if old == _BASE:
+                        pending -= 1
+        return count
+
+    def ancestor_counts(self, mask: bytearray) -> Dict[int, int]:
+        """
+        計算 mask 中每個提交的祖先數（含自己）
+
+        由最舊的提交往上累加：一般提交為第一父提交的祖先數 + 1；
+        合併提交再加上其他父提交帶進來、第一父提交不可達的提交數。
+        線性歷史只需常數時間，合併的成本與被合併的分支大小成正比。
+
+        Args:
+            mask (bytearray): reachable() 的結果
+
+        Returns:
+            Dict[int, int]: 提交索引 -> 祖先數
+        """
+        counts: Dict[int, int] = {}
+        for commit in range(len(self.shas) - 1, -1, -1):
+            if not mask[commit]:
+                continue
+            parents = self.parents[commit]
+            if not parents:
+                counts[commit] = 1
+            elif len(parents) == 1:
+                counts[commit] = counts[parents[0]] + 1
+            else:
+                counts[commit] = (counts[parents[0]] + 1
+                                  + self._exclusive(parents[1:], parents[:1]))
+        return counts
+
+    def ahead_behind(self, base_sha: str, tips: Dict[str, str]) -> Dict[str, Optional[Tuple[int, int]]]:
+        """
+        計算每個分支相對預設分支的 (ahead, behind)
+
+        Args:
+            base_sha (str): 預設分支 HEAD 的完整 SHA
+            tips (Dict[str, str]): 分支名稱 -> HEAD 完整 SHA
+
+        Returns:
+            Dict[str, Optional[Tuple[int, int]]]: 分支名稱 -> (ahead, behind)；
+            提交不在圖中時為 None
+        """
+        base = self.index.get(base_sha)
+        if base is None:
+            return {name: None for name in tips}
+        base_mask = self.reachable(base)
+        counts = self.ancestor_counts(base_mask)
+        behind_cache: Dict[FrozenSet[int], int] = {}
+        result = {}
+        for name, sha in tips.items():
+            tip = self.index.get(sha)
+            if tip is None:
+                result[name] = None
+                continue
+            ahead, merge_bases = self._ahead(tip, base_mask)
+            if len(merge_bases) == 1:
+                # 單一合併基底：落後數 = 預設分支的祖先數 - 合併基底的祖先數
+                behind = counts[base] - counts[next(iter(merge_bases))]
+            else:
+                if merge_bases not in behind_cache:
+                    behind_cache[merge_bases] = self._exclusive((base,), merge_bases)
+                behind = behind_cache[merge_bases]
+            result[name] = (ahead, behind)
+        return result
@@ -0,0 +1,835 @@
+# -*- coding: utf-8 -*-
+
+"""
+離線 GitHub API 替身
+====================
+以合成資料模擬 update_dashboard.py 與 scripts/update_tools.py 用到的
+REST 與 GraphQL 端點，可設定延遲、速率限制標頭與次級速率限制（同時在途的
+請求過多時回應 403 + Retry-After），不需要 token 或網路。
+分支倉庫另有一個記憶體中的 Git 物件庫（README 與 Git Data API 的
+refs/commits/trees/blobs/contents 端點），可模擬其他工作同時推送造成的衝突。
+
+用法：
+    with FakeGitHub(branches=1000, repos=500, latency=0.02) as server:
+        updater = BranchDashboardUpdater('token', server.repo_name, base_url=server.base_url)
+        ...
+        print(server.stats())
+
+伺服器預設在獨立行程中執行，避免其記憶體與 CPU 用量干擾基準測試的量測。
+"""
+
+import base64
+import hashlib
+import json
+import multiprocessing
+import random
+import re
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlencode, urlparse
+
+DEFAULT_OWNER = 'octo'
+DEFAULT_REPO = 'monorepo'
+
+_AUTHORS = ['Alice Chen', 'Bob Lin', 'Carol Wang', 'Dave Huang', 'Eve Tsai',
+            'github-actions[bot]', 'Frank Liu', 'Grace Wu']
+_LANGUAGES = ['HTML', 'JavaScript', 'Python', 'CSS', 'TypeScript', 'Shell']
+_TOPICS = ['tool', 'calculator', 'html', 'utility', 'finance', 'education', 'game']
+_BASE_TIME = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+_COMMIT_ALIAS = re.compile(r'(c\d+): object\(oid: "([0-9a-f]+)"\)')
+
+DEFAULT_README = """# Profile
+
+<!-- BRANCH_ACTIVITY:START -->
+<!-- BRANCH_ACTIVITY:END -->
+
+<!-- TOOLS_LIST:START -->
+<!-- TOOLS_LIST:END -->
+"""
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def make_branches(count: int, seed: int = 0) -> List[Dict]:
+    """
+    產生合成分支資料（依名稱排序，與 GitHub API 順序相同）
+
+    Args:
+        count (int): 分支數量
+        seed (int): 亂數種子
+
+    Returns:
+        List[Dict]: 每個元素包含 name、sha、message、author、date
+    """
+    rng = random.Random(seed)
+    branches = []
+    for i in range(count):
+        name = 'main' if i == 0 else f"{rng.choice(['feature', 'fix', 'chore', 'release'])}/task-{i:06d}"
+        moment = _BASE_TIME - timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+        branches.append({
+            'name': name,
+            'sha': hashlib.sha1(f"{seed}:{name}".encode()).hexdigest(),
+            'message': f"Update {name} ({rng.choice(['docs', 'tests', 'api', 'ui'])})\n\nDetails for {i}",
+            'author': rng.choice(_AUTHORS),
+            'date': _iso(moment),
+        })
+    branches.sort(key=lambda branch: branch['name'])
+    return branches
+
+
+def make_local_repo(path: str, branches: int, seed: int = 0, remote: str = 'origin') -> None:
+    """
+    建立與 make_branches 資料相同的本地倉庫（'local' 引擎用）
+
+    每個分支是 refs/remotes/<remote>/ 下的單一提交，作者、訊息與日期
+    與 API 替身返回的相同（SHA 不同）；以一次 git fast-import 寫入。
+
+    Args:
+        path (str): 倉庫目錄（不存在時建立）
+        branches (int): 分支數量
+        seed (int): 亂數種子
+        remote (str): 遠端名稱
+    """
+    stream = bytearray()
+    for index, branch in enumerate(make_branches(branches, seed)):
+        moment = datetime.strptime(branch['date'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+        ident = f"{branch['author']} <dev{index}@example.com> {int(moment.timestamp())} +0000"
+        message = branch['message'].encode('utf-8')
+        stream += (f"commit refs/remotes/{remote}/{branch['name']}\n"
+                   f"author {ident}\ncommitter {ident}\ndata {len(message)}\n").encode('utf-8')
+        stream += message + b'\n'
+    subprocess.run(['git', 'init', '-q', path], check=True)
+    subprocess.run(['git', '-C', path, 'fast-import', '--quiet'], input=bytes(stream), check=True)
+
+
+def make_repos(count: int, seed: int = 0, html_ratio: float = 0.4) -> List[Dict]:
+    """
+    產生合成倉庫資料，約 html_ratio 比例的倉庫根目錄含有 HTML 工具文件
+
+    Args:
+        count (int): 倉庫數量
+        seed (int): 亂數種子
+        html_ratio (float): 含 HTML 文件的倉庫比例
+
+    Returns:
+        List[Dict]: 每個元素包含倉庫屬性、根目錄檔案、語言、主題與 Pages 狀態
+    """
+    rng = random.Random(seed)
+    repos = []
+    for i in range(count):
+        files = ['README.md', 'LICENSE']
+        if rng.random() < html_ratio:
+            files.append(rng.choice(['index.html', 'app.HTML', 'tool.htm']))
+        if rng.random() < 0.3:
+            files.append('main.py')
+        languages = {lang: rng.randrange(100, 100000) for lang in rng.sample(_LANGUAGES, rng.randrange(0, 4))}
+        updated = _BASE_TIME - timedelta(hours=rng.randrange(0, 24 * 365))
+        repos.append({
+            'id': 1000 + i,
+            'name': f"tool-{i:04d}",
+            'description': rng.choice([None, f"Synthetic tool #{i}"]),
+            'stars': rng.randrange(0, 500),
+            'forks': rng.randrange(0, 50),
+            'updated_at': _iso(updated),
+            'pushed_at': _iso(updated - timedelta(minutes=rng.randrange(0, 120))),
+            'files': files,
+            'languages': languages,
+            'topics': rng.sample(_TOPICS, rng.randrange(0, 4)),
+            'pages': rng.random() < 0.5,
+        })
+    return repos
+
+
+def tool_html(repo: str, filename: str) -> bytes:
+    """工具倉庫中 HTML 文件的合成內容（內嵌 CSS/JS、註解與縮排，供建置流程壓縮）"""
+    return f"""<!DOCTYPE html>
+<html lang="zh-TW">
+<head>
+    <meta charset="UTF-8">
+    <title>{repo}</title>
+    <!-- {filename} -->
+    <style>
+        body {{ font-family: sans-serif; margin: 0 auto; max-width: 960px; }}
+        .result {{ color: #0D3B5C; padding: 12px 16px; }}
+    </style>
+</head>
+<body>
+    <div class="result" id="result">
+        載入中...
+    </div>
+    <script>
+        // 計算並顯示結果
+        function render(value) {{
+            const el = document.getElementById('result');
+            el.textContent = `{repo}: ${{value.toFixed(2)}}`;
+        }}
+        render(42 / 4);
+    </script>
+</body>
+</html>
+""".encode('utf-8')
+
+
+def _object_sha(kind: str, data: bytes) -> str:
+    return hashlib.sha1(f"{kind} {len(data)}\0".encode() + data).hexdigest()
+
+
+class _GitStore:
+    """
+    分支倉庫的最小 Git 物件庫
+
+    樹以 {路徑: blob SHA} 的扁平對照表示，只支援 Git Data API 發布所需的操作。
+    """
+
+    def __init__(self, readme: str, branch: str = 'main'):
+        self.blobs: Dict[str, bytes] = {}
+        self.trees: Dict[str, Dict[str, str]] = {}
+        self.commits: Dict[str, Dict] = {}
+        self.refs: Dict[str, str] = {}
+        tree = self.put_tree({'README.md': self.put_blob(readme.encode('utf-8'))})
+        self.refs[branch] = self.put_commit('Initial commit', tree, [])
+
+    def put_blob(self, data: bytes) -> str:
+        sha = _object_sha('blob', data)
+        self.blobs[sha] = data
+        return sha
+
+    def put_tree(self, entries: Dict[str, str]) -> str:
+        sha = _object_sha('tree', json.dumps(entries, sort_keys=True).encode())
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def put_commit(self, message: str, tree: str, parents: List[str]) -> str:
+        commit = {'message': message, 'tree': tree, 'parents': list(parents)}
+        sha = _object_sha('commit', json.dumps([commit, len(self.commits)], sort_keys=True).encode())
+        self.commits[sha] = commit
+        return sha
+
+    def is_ancestor(self, ancestor: str, sha: str) -> bool:
+        stack, seen = [sha], set()
+        while stack:
+            current = stack.pop()
+            if current == ancestor:
+                return True
+            if current not in seen and current in self.commits:
+                seen.add(current)
+                stack.extend(self.commits[current]['parents'])
+        return False
+
+    def read(self, path: str, ref: Optional[str] = None, branch: str = 'main') -> Optional[bytes]:
+        commit = self.commits.get(ref or self.refs[branch])
+        if commit is None:
+            return None
+        blob = self.trees[commit['tree']].get(path)
+        return self.blobs[blob] if blob else None
+
+    def commit_file(self, branch: str, path: str, data: bytes, message: str) -> str:
+        """直接在分支上提交一個檔案（模擬其他工作的推送）"""
+        head = self.refs[branch]
+        entries = dict(self.trees[self.commits[head]['tree']])
+        entries[path] = self.put_blob(data)
+        self.refs[branch] = self.put_commit(message, self.put_tree(entries), [head])
+        return self.refs[branch]
+
+
+class _State:
+    """伺服器行程內的資料與統計"""
+
+    def __init__(self, owner: str, repo: str, branches: int, repos: int, seed: int,
+                 latency: float, rate_limit: int, secondary_limit: int = 0, retry_after: int = 1,
+                 readme: str = DEFAULT_README, conflicts: int = 0):
+        self.owner = owner
+        self.repo = repo
+        self.branches = make_branches(branches, seed)
+        self.branch_index = {branch['sha']: branch for branch in self.branches}
+        self.repos = make_repos(repos, seed)
+        self.repo_index = {r['name']: r for r in self.repos}
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.secondary_limit = secondary_limit
+        self.retry_after = retry_after
+        self.git = _GitStore(readme)
+        # 接下來幾次 ref 更新前先插入一個其他工作的提交，使更新不是快轉
+        self.conflicts = conflicts
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.remaining = self.rate_limit
+            self.requests: Dict[str, int] = {}
+            self.not_modified = 0
+            self.bytes_sent = 0
+            self.throttled = 0
+            self.peak_in_flight = 0
+
+    def count(self, endpoint: str) -> None:
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                'requests': dict(self.requests),
+                'total': sum(self.requests.values()),
+                'not_modified': self.not_modified,
+                'bytes_sent': self.bytes_sent,
+                'throttled': self.throttled,
+                'peak_in_flight': self.peak_in_flight,
+                'rate_limit_remaining': self.remaining,
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state: _State = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # ---- 共用工具 ----
+
+    @property
+    def base(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _send(self, status: int, body, headers: Optional[Dict] = None, cost: int = 1) -> None:
+        data = json.dumps(body).encode('utf-8') if not isinstance(body, bytes) else body
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        state = self.state
+
+        if status == 200 and self.command == 'GET' and self.headers.get('If-None-Match') == etag:
+            # 條件請求命中：與 GitHub 相同，304 不計入速率限制
+            status, data, cost = 304, b'', 0
+            with state.lock:
+                state.not_modified += 1
+
+        with state.lock:
+            if state.rate_limit and cost:
+                if state.remaining <= 0:
+                    status = 403
+                    data = json.dumps({'message': 'API rate limit exceeded'}).encode('utf-8')
+                else:
+                    state.remaining -= cost
+            if cost:
+                state.bytes_sent += len(data)
+            remaining = state.remaining
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if status in (200, 304):
+            self.send_header('ETag', etag)
+        if state.rate_limit:
+            self.send_header('X-RateLimit-Limit', str(state.rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(max(remaining, 0)))
+            self.send_header('X-RateLimit-Used', str(state.rate_limit - max(remaining, 0)))
+            self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+            self.send_header('X-RateLimit-Resource', 'graphql' if self.path.startswith('/graphql') else 'core')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def _paginate(self, items: List, query: Dict, path: str):
+        per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+        page = int(query.get('page', ['1'])[0])
+        start = (page - 1) * per_page
+        chunk = items[start:start + per_page]
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        if page < last:
+            links.append(f'<{self.base}{path}?{urlencode({"per_page": per_page, "page": page + 1})}>; rel="next"')
+            links.append(f'<{self.base}{path}?{urlencode({"per_page": per_page, "page": last})}>; rel="last"')
+        return chunk, ({'Link': ', '.join(links)} if links else {})
+
+    # ---- 資料表示 ----
+
+    def _repo_json(self, owner: str, name: str, repo: Optional[Dict] = None) -> Dict:
+        repo = repo or {}
+        return {
+            'id': repo.get('id', 1),
+            'name': name,
+            'full_name': f"{owner}/{name}",
+            'owner': {'login': owner, 'url': f"{self.base}/users/{owner}"},
+            'url': f"{self.base}/repos/{owner}/{name}",
+            'html_url': f"https://github.com/{owner}/{name}",
+            'description': repo.get('description'),
+            'stargazers_count': repo.get('stars', 42),
+            'forks_count': repo.get('forks', 7),
+            'open_issues_count': 3,
+            'default_branch': 'main',
+            'has_pages': repo.get('pages', False),
+            'updated_at': repo.get('updated_at', _iso(_BASE_TIME)),
+            'pushed_at': repo.get('pushed_at', _iso(_BASE_TIME)),
+        }
+
+    def _commit_json(self, branch: Dict) -> Dict:
+        owner, name = self.state.owner, self.state.repo
+        person = {'name': branch['author'], 'email': 'dev@example.com', 'date': branch['date']}
+        return {
+            'sha': branch['sha'],
+            'url': f"{self.base}/repos/{owner}/{name}/commits/{branch['sha']}",
+            'html_url': f"https://github.com/{owner}/{name}/commit/{branch['sha']}",
+            'commit': {'message': branch['message'], 'author': person, 'committer': person},
+        }
+
+    def _graphql_commit(self, branch: Dict) -> Dict:
+        owner, name = self.state.owner, self.state.repo
+        return {
+            'oid': branch['sha'],
+            'messageHeadline': branch['message'].split('\n')[0],
+            'committedDate': branch['date'],
+            'url': f"https://github.com/{owner}/{name}/commit/{branch['sha']}",
+            'author': {'name': branch['author'], 'date': branch['date']},
+        }
+
+    def _admit(self) -> bool:
+        """次級速率限制：同時在途的請求超過上限時回應 403 + Retry-After"""
+        state = self.state
+        with state.lock:
+            state.in_flight += 1
+            state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+            throttled = bool(state.secondary_limit) and state.in_flight > state.secondary_limit
+            if throttled:
+                state.throttled += 1
+        if throttled:
+            self._send(403, {'message': 'You have exceeded a secondary rate limit. '
+                                        'Please wait a few minutes before you try again.'},
+                       headers={'Retry-After': str(state.retry_after)}, cost=0)
+        return not throttled
+
+    def _done(self) -> None:
+        with self.state.lock:
+            self.state.in_flight -= 1
+
+    # ---- 路由 ----
+
+    def do_GET(self):
+        # 統計端點不受限制，也不計入在途請求
+        if self.path.startswith(('/_stats', '/_file')):
+            return self._get()
+        try:
+            if self._admit():
+                self._get()
+        finally:
+            self._done()
+
+    def do_POST(self):
+        if self.path == '/_reset':
+            return self._post()
+        try:
+            if self._admit():
+                self._post()
+        finally:
+            self._done()
+
+    def do_PATCH(self):
+        try:
+            if self._admit():
+                self._patch()
+        finally:
+            self._done()
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _get(self):
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        state = self.state
+
+        if parts == ['_stats']:
+            return self._send(200, state.snapshot(), cost=0)
+        if parts == ['_file']:
+            data = state.git.read(query.get('path', ['README.md'])[0])
+            return self._send(200, {'content': data.decode('utf-8') if data is not None else None}, cost=0)
+        if parts == ['rate_limit']:
+            state.count('GET /rate_limit')
+            core = {'limit': state.rate_limit, 'remaining': state.remaining, 'reset': int(time.time()) + 3600}
+            return self._send(200, {'resources': {'core': core}, 'rate': core}, cost=0)
+
+        if len(parts) == 2 and parts[0] == 'users':
+            state.count('GET /users/{user}')
+            return self._send(200, {'login': parts[1], 'url': f"{self.base}/users/{parts[1]}",
+                                    'repos_url': f"{self.base}/users/{parts[1]}/repos"})
+        if len(parts) == 3 and parts[0] == 'users' and parts[2] == 'repos':
+            state.count('GET /users/{user}/repos')
+            items = [self._repo_json(parts[1], r['name'], r) for r in state.repos]
+            chunk, headers = self._paginate(items, query, url.path)
+            return self._send(200, chunk, headers)
+
+        if len(parts) < 3 or parts[0] != 'repos':
+            return self._send(404, {'message': 'Not Found'})
+
+        owner, name, rest = parts[1], parts[2], parts[3:]
+        repo = state.repo_index.get(name)
+
+        if not rest:
+            state.count('GET /repos/{owner}/{repo}')
+            return self._send(200, self._repo_json(owner, name, repo))
+
+        if rest == ['branches']:
+            state.count('GET /repos/{owner}/{repo}/branches')
+            items = [{'name': b['name'],
+                      'commit': {'sha': b['sha'], 'url': f"{self.base}/repos/{owner}/{name}/commits/{b['sha']}"}}
+                     for b in state.branches]
+            chunk, headers = self._paginate(items, query, url.path)
+            return self._send(200, chunk, headers)
+
+        if len(rest) == 2 and rest[0] == 'commits':
+            state.count('GET /repos/{owner}/{repo}/commits/{sha}')
+            branch = state.branch_index.get(rest[1])
+            if branch is None:
+                return self._send(404, {'message': 'No commit found'})
+            return self._send(200, self._commit_json(branch))
+
+        if rest[:2] == ['git', 'matching-refs']:
+            state.count('GET /repos/{owner}/{repo}/git/matching-refs/{ref}')
+            items = [{'ref': f"refs/heads/{b['name']}",
+                      'url': f"{self.base}/repos/{owner}/{name}/git/refs/heads/{b['name']}",
+                      'object': {'sha': b['sha'], 'type': 'commit',
+                                 'url': f"{self.base}/repos/{owner}/{name}/git/commits/{b['sha']}"}}
+                     for b in state.branches]
+            chunk, headers = self._paginate(items, query, url.path)
+            return self._send(200, chunk, headers)
+
+        if name == state.repo and rest[0] in ('git', 'contents'):
+            return self._git_get(owner, name, rest, query)
+
+        if repo is None:
+            return self._send(404, {'message': 'Not Found'})
+
+        if rest == ['contents']:
+            state.count('GET /repos/{owner}/{repo}/contents')
+            items = [{'name': f, 'path': f, 'type': 'file',
+                      'sha': _object_sha('blob', tool_html(name, f)), 'size': len(tool_html(name, f)),
+                      'url': f"{self.base}/repos/{owner}/{name}/contents/{f}"}
+                     for f in repo['files']]
+            return self._send(200, items)
+        if len(rest) == 2 and rest[0] == 'contents' and unquote(rest[1]) in repo['files']:
+            # 工具文件本身（以 Accept: application/vnd.github.raw 請求原始內容）
+            state.count('GET /repos/{owner}/{repo}/contents/{path}')
+            return self._send(200, tool_html(name, unquote(rest[1])))
+        if rest == ['pages', 'builds', 'latest']:
+            state.count('GET /repos/{owner}/{repo}/pages/builds/latest')
+            if not repo['pages']:
+                return self._send(404, {'message': 'Not Found'})
+            return self._send(200, {'url': f"{self.base}{url.path}", 'status': 'built'})
+        if rest == ['languages']:
+            state.count('GET /repos/{owner}/{repo}/languages')
+            return self._send(200, repo['languages'])
+        if rest == ['topics']:
+            state.count('GET /repos/{owner}/{repo}/topics')
+            return self._send(200, {'names': repo['topics']})
+
+        return self._send(404, {'message': 'Not Found'})
+
+    def _post(self):
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        payload = self._read_json()
+        url = urlparse(self.path)
+
+        if url.path == '/_reset':
+            self.state.reset()
+            return self._send(200, {'ok': True}, cost=0)
+        parts = [part for part in url.path.split('/') if part]
+        if len(parts) == 5 and parts[0] == 'repos' and parts[2] == self.state.repo and parts[3] == 'git':
+            return self._git_post(parts[1], parts[2], parts[4], payload)
+        if url.path != '/graphql':
+            return self._send(404, {'message': 'Not Found'})
+
+        query = payload.get('query', '')
+        variables = payload.get('variables') or {}
+        operation = re.search(r'query\s+(\w+)', query)
+        operation = operation.group(1) if operation else 'anonymous'
+        self.state.count(f"POST /graphql {operation}")
+
+        handler = getattr(self, f"_graphql_{operation}", None)
+        if handler is None:
+            return self._send(200, {'errors': [{'message': f"Unsupported operation: {operation}"}]})
+        return self._send(200, {'data': handler(query, variables)})
+
+    # ---- Git Data API ----
+
+    def _git_url(self, owner: str, name: str, kind: str, sha: str) -> str:
+        return f"{self.base}/repos/{owner}/{name}/git/{kind}/{sha}"
+
+    def _ref_json(self, owner: str, name: str, branch: str) -> Dict:
+        sha = self.state.git.refs[branch]
+        return {'ref': f"refs/heads/{branch}", 'url': self._git_url(owner, name, 'refs/heads', branch),
+                'object': {'sha': sha, 'type': 'commit', 'url': self._git_url(owner, name, 'commits', sha)}}
+
+    def _git_commit_json(self, owner: str, name: str, sha: str) -> Dict:
+        commit = self.state.git.commits[sha]
+        return {'sha': sha, 'url': self._git_url(owner, name, 'commits', sha), 'message': commit['message'],
+                'tree': {'sha': commit['tree'], 'url': self._git_url(owner, name, 'trees', commit['tree'])},
+                'parents': [{'sha': p, 'url': self._git_url(owner, name, 'commits', p)} for p in commit['parents']]}
+
+    def _git_get(self, owner: str, name: str, rest: List[str], query: Dict):
+        state = self.state
+        git = state.git
+        if rest[:3] in (['git', 'ref', 'heads'], ['git', 'refs', 'heads']) and len(rest) > 3:
+            state.count('GET /repos/{owner}/{repo}/git/ref/{ref}')
+            branch = '/'.join(rest[3:])
+            if branch not in git.refs:
+                return self._send(404, {'message': 'Not Found'})
+            return self._send(200, self._ref_json(owner, name, branch))
+        if rest[:2] == ['git', 'commits'] and len(rest) == 3:
+            state.count('GET /repos/{owner}/{repo}/git/commits/{sha}')
+            if rest[2] not in git.commits:
+                return self._send(404, {'message': 'Not Found'})
+            return self._send(200, self._git_commit_json(owner, name, rest[2]))
+        if rest[:2] == ['git', 'blobs'] and len(rest) == 3:
+            state.count('GET /repos/{owner}/{repo}/git/blobs/{sha}')
+            data = git.blobs.get(rest[2])
+            if data is None:
+                return self._send(404, {'message': 'Not Found'})
+            return self._send(200, {'sha': rest[2], 'size': len(data), 'encoding': 'base64',
+                                    'content': base64.b64encode(data).decode()})
+        if rest[0] == 'contents' and len(rest) > 1:
+            state.count('GET /repos/{owner}/{repo}/contents/{path}')
+            path = '/'.join(rest[1:])
+            ref = query.get('ref', ['main'])[0]
+            commit = git.commits.get(git.refs.get(ref, ref))
+            blob = git.trees[commit['tree']].get(path) if commit else None
+            if blob is None:
+                return self._send(404, {'message': 'Not Found'})
+            data = git.blobs[blob]
+            return self._send(200, {'type': 'file', 'name': path.rsplit('/', 1)[-1], 'path': path,
+                                    'sha': blob, 'size': len(data), 'encoding': 'base64',
+                                    'content': base64.b64encode(data).decode(),
+                                    'url': f"{self.base}/repos/{owner}/{name}/contents/{path}"})
+        return self._send(404, {'message': 'Not Found'})
+
+    def _git_post(self, owner: str, name: str, kind: str, payload: Dict):
+        state = self.state
+        git = state.git
+        state.count(f"POST /repos/{{owner}}/{{repo}}/git/{kind}")
+        # _send 也會取得 state.lock，回應在鎖外送出
+        with state.lock:
+            if kind == 'blobs':
+                content = payload['content']
+                data = base64.b64decode(content) if payload.get('encoding') == 'base64' else content.encode('utf-8')
+                sha = git.put_blob(data)
+                body = {'sha': sha, 'url': self._git_url(owner, name, 'blobs', sha)}
+            elif kind == 'trees':
+                entries = dict(git.trees.get(payload.get('base_tree'), {}))
+                for entry in payload['tree']:
+                    if entry.get('sha') is None and 'content' not in entry:
+                        entries.pop(entry['path'], None)
+                    else:
+                        entries[entry['path']] = entry.get('sha') or git.put_blob(entry['content'].encode('utf-8'))
+                sha = git.put_tree(entries)
+                body = {'sha': sha, 'url': self._git_url(owner, name, 'trees', sha),
+                        'tree': [{'path': p, 'mode': '100644', 'type': 'blob', 'sha': b}
+                                 for p, b in sorted(entries.items())]}
+            elif kind == 'commits':
+                sha = git.put_commit(payload['message'], payload['tree'], payload.get('parents', []))
+                body = self._git_commit_json(owner, name, sha)
+            else:
+                body = None
+        if body is None:
+            return self._send(404, {'message': 'Not Found'})
+        return self._send(201, body)
+
+    def _patch(self):
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        payload = self._read_json()
+        parts = [part for part in urlparse(self.path).path.split('/') if part]
+        if not (len(parts) > 6 and parts[0] == 'repos' and parts[2] == self.state.repo
+                and parts[3:6] == ['git', 'refs', 'heads']):
+            return self._send(404, {'message': 'Not Found'})
+        owner, name, branch = parts[1], parts[2], '/'.join(parts[6:])
+        state = self.state
+        git = state.git
+        state.count('PATCH /repos/{owner}/{repo}/git/refs/{ref}')
+        with state.lock:
+            if branch not in git.refs or payload['sha'] not in git.commits:
+                error = 'Reference does not exist'
+            else:
+                if state.conflicts > 0:
+                    # 模擬其他工作搶先推送：在 README 末尾附加一行
+                    state.conflicts -= 1
+                    readme = git.read('README.md', branch=branch) or b''
+                    git.commit_file(branch, 'README.md',
+                                    readme + f"<!-- concurrent {state.conflicts} -->\n".encode(),
+                                    'Concurrent update')
+                if not payload.get('force') and not git.is_ancestor(git.refs[branch], payload['sha']):
+                    error = 'Update is not a fast forward'
+                else:
+                    error = None
+                    git.refs[branch] = payload['sha']
+        if error:
+            return self._send(422, {'message': error})
+        return self._send(200, self._ref_json(owner, name, branch))
+
+    # ---- GraphQL 操作 ----
+
+    def _graphql_refs(self, variables: Dict, node):
+        start = int(variables.get('after') or 0)
+        first = variables.get('first', 100)
+        chunk = self.state.branches[start:start + first]
+        end = start + len(chunk)
+        return {'repository': {'refs': {
+            'totalCount': len(self.state.branches),
+            'pageInfo': {'hasNextPage': end < len(self.state.branches), 'endCursor': str(end)},
+            'nodes': [{'name': b['name'], 'target': node(b)} for b in chunk],
+        }}}
+
+    def _graphql_BranchRefs(self, query: str, variables: Dict):
+        return self._graphql_refs(variables, self._graphql_commit)
+
+    def _graphql_BranchHeads(self, query: str, variables: Dict):
+        return self._graphql_refs(variables, lambda b: {'oid': b['sha']})
+
+    def _graphql_Inventory(self, query: str, variables: Dict):
+        start = int(variables.get('after') or 0)
+        first = variables.get('first', 100)
+        chunk = self.state.repos[start:start + first]
+        end = start + len(chunk)
+        login = variables.get('login', self.state.owner)
+        nodes = [{
+            'databaseId': repo['id'],
+            'name': repo['name'],
+            'description': repo['description'],
+            'url': f"https://github.com/{login}/{repo['name']}",
+            'homepageUrl': None,
+            'stargazerCount': repo['stars'],
+            'forkCount': repo['forks'],
+            'updatedAt': repo['updated_at'],
+            'pushedAt': repo['pushed_at'],
+            'primaryLanguage': ({'name': max(repo['languages'], key=repo['languages'].get)}
+                                if repo['languages'] else None),
+            'repositoryTopics': {'nodes': [{'topic': {'name': t}} for t in repo['topics']]},
+            'deployments': {'totalCount': int(repo['pages'])},
+            'object': {'entries': [{'name': f, 'type': 'blob'} for f in repo['files']]},
+        } for repo in chunk]
+        return {'repositoryOwner': {'repositories': {
+            'pageInfo': {'hasNextPage': end < len(self.state.repos), 'endCursor': str(end)},
+            'nodes': nodes,
+        }}}
+
+    def _graphql_Commits(self, query: str, variables: Dict):
+        repository = {}
+        for alias, oid in _COMMIT_ALIAS.findall(query):
+            branch = self.state.branch_index.get(oid)
+            repository[alias] = self._graphql_commit(branch) if branch else None
+        return {'repository': repository}
+
+
+def _serve(config: Dict, ready, port_value) -> None:
+    state = _State(**config)
+    handler = type('Handler', (_Handler,), {'state': state})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    port_value.value = server.server_address[1]
+    ready.set()
+    server.serve_forever()
+
+
+class FakeGitHub:
+    """
+    本地 GitHub API 替身
+
+    Attributes:
+        base_url (str): 傳給 Github(base_url=...) 的網址
+        repo_name (str): 分支資料所在的 'owner/repo'
+        owner (str): 倉庫列表所屬的用戶
+    """
+
+    def __init__(self, branches: int = 10, repos: int = 0, seed: int = 0,
+                 latency: float = 0.0, rate_limit: int = 5000,
+                 owner: str = DEFAULT_OWNER, repo: str = DEFAULT_REPO,
+                 secondary_limit: int = 0, retry_after: int = 1,
+                 readme: str = DEFAULT_README, conflicts: int = 0):
+        """
+        Args:
+            branches (int): 合成分支數量
+            repos (int): 合成倉庫數量（工具掃描用）
+            seed (int): 亂數種子，相同種子產生相同資料
+            latency (float): 每個請求的模擬延遲秒數
+            rate_limit (int): 速率限制額度，0 表示不限制也不送出標頭
+            owner (str): 擁有者名稱
+            repo (str): 分支所在的倉庫名稱
+            secondary_limit (int): 同時在途請求的上限，超過時回應次級速率限制，0 表示不限制
+            retry_after (int): 次級速率限制回應的 Retry-After 秒數
+            readme (str): 分支倉庫 main 分支上的初始 README
+            conflicts (int): 前幾次 ref 更新前先插入其他工作的提交（模擬推送衝突）
+        """
+        self.config = {
+            'owner': owner, 'repo': repo, 'branches': branches, 'repos': repos,
+            'seed': seed, 'latency': latency, 'rate_limit': rate_limit,
+            'secondary_limit': secondary_limit, 'retry_after': retry_after,
+            'readme': readme, 'conflicts': conflicts,
+        }
+        self.owner = owner
+        self.repo_name = f"{owner}/{repo}"
+        self.base_url = None
+        self._process = None
+
+    def start(self) -> 'FakeGitHub':
+        """在子行程中啟動伺服器並等待就緒"""
+        context = multiprocessing.get_context('spawn')
+        ready = context.Event()
+        port = context.Value('i', 0)
+        self._process = context.Process(target=_serve, args=(self.config, ready, port), daemon=True)
+        self._process.start()
+        if not ready.wait(timeout=120):
+            self.stop()
+            raise RuntimeError("FakeGitHub 伺服器啟動逾時")
+        self.base_url = f"http://127.0.0.1:{port.value}"
+        return self
+
+    def stop(self) -> None:
+        """停止伺服器行程"""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(timeout=5)
+            self._process = None
+
+    def _call(self, method: str, path: str) -> Dict:
+        import requests
+
+        response = requests.request(method, f"{self.base_url}{path}", json={} if method == 'POST' else None)
+        return response.json()
+
+    def stats(self) -> Dict:
+        """
+        返回請求統計
+
+        Returns:
+            Dict: requests（各端點次數）、total、not_modified、bytes_sent、rate_limit_remaining、
+                throttled（次級速率限制回應數）、peak_in_flight
+        """
+        return self._call('GET', '/_stats')
+
+    def read_file(self, path: str = 'README.md') -> Optional[str]:
+        """讀取分支倉庫 main 分支上的檔案（不計入統計）"""
+        return self._call('GET', f'/_file?path={path}').get('content')
+
+    def reset_stats(self) -> None:
+        """清除請求統計並重置速率限制額度"""
+        self._call('POST', '/_reset')
+
+    def __enter__(self) -> 'FakeGitHub':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+"""
+GitHub GraphQL 客戶端
+=====================
+以單一分頁查詢取得分支與提交資訊，取代 PyGithub 的逐筆延遲載入
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+GITHUB_API_URL = 'https://api.github.com'
+GITHUB_GRAPHQL_URL = 'https://api.github.com/graphql'
+
+# 每頁最多 100 個 refs（GitHub GraphQL 上限）
+PAGE_SIZE = 100
+
+BRANCH_REFS_QUERY = """
+query BranchRefs($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    refs(refPrefix: "refs/heads/", first: $first, after: $after,
+         orderBy: {field: ALPHABETICAL, direction: ASC}) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        target {
+          ... on Commit {
+            oid
+            messageHeadline
+            committedDate
+            url
+            author { name date }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+BRANCH_HEADS_QUERY = """
+query BranchHeads($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    refs(refPrefix: "refs/heads/", first: $first, after: $after,
+         orderBy: {field: ALPHABETICAL, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name target { oid } }
+    }
+  }
+}
+"""
+
+REPOSITORY_INVENTORY_QUERY = """
+query Inventory($login: String!, $first: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER, privacy: PUBLIC,
+                 orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        description
+        url
+        homepageUrl
+        stargazerCount
+        forkCount
+        updatedAt
+        pushedAt
+        primaryLanguage { name }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        deployments(environments: ["github-pages"], first: 1) { totalCount }
+        object(expression: "HEAD:") {
+          ... on Tree { entries { name type } }
+        }
+      }
+    }
+  }
+}
+"""
+
+COMMIT_FIELDS = """
+fragment CommitFields on Commit {
+  oid
+  messageHeadline
+  committedDate
+  url
+  author { name date }
+}
+"""
+
+
+def graphql_url_for(base_url: str) -> str:
+    """
+    由 REST API 基礎網址推導 GraphQL 端點
+
+    Args:
+        base_url (str): REST API 基礎網址（例如 https://api.github.com、
+            GitHub Enterprise 的 https://host/api/v3 或本地測試伺服器）
+
+    Returns:
+        str: GraphQL 端點網址
+    """
+    base_url = base_url.rstrip('/')
+    if base_url.endswith('/api/v3'):
+        return base_url[:-len('/v3')] + '/graphql'
+    return base_url + '/graphql'
+
+
+class GraphQLError(Exception):
+    """GraphQL 查詢失敗（HTTP 錯誤或回應中包含 errors）"""
+
+    def __init__(self, message: str, errors: Optional[list] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+class GraphQLClient:
+    """
+    最小化的 GitHub GraphQL 客戶端
+
+    只負責送出查詢並處理錯誤，查詢內容由呼叫端決定
+    """
+
+    def __init__(self, token: str, url: str = GITHUB_GRAPHQL_URL,
+                 session: Optional['requests.Session'] = None, timeout: int = 30):
+        """
+        初始化客戶端
+
+        Args:
+            token (str): GitHub Personal Access Token
+            url (str): GraphQL 端點
+            session (requests.Session): HTTP session，默認使用共用 session
+            timeout (int): 請求逾時秒數
+        """
+        self.url = url
+        self.timeout = timeout
+        if session is None:
+            # requests 只在實際建立客戶端時導入
+            from dashboard.transport import get_session
+            session = get_session()
+        self.session = session
+        self.headers = {
+            'Authorization': f'bearer {token}',
+            'Content-Type': 'application/json',
+        }
+
+    def execute(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """
+        執行 GraphQL 查詢
+
+        Args:
+            query (str): GraphQL 查詢字串
+            variables (Dict): 查詢變數
+
+        Returns:
+            Dict: 回應中的 data 欄位
+
+        Raises:
+            GraphQLError: HTTP 狀態碼非 200 或回應包含 errors
+        """
+        response = self.session.post(
+            self.url,
+            json={'query': query, 'variables': variables or {}},
+            headers=self.headers,
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            raise GraphQLError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        payload = response.json()
+        if payload.get('errors'):
+            messages = '; '.join(e.get('message', 'Unknown error') for e in payload['errors'])
+            raise GraphQLError(messages, payload['errors'])
+        return payload.get('data') or {}
+
+    def _iter_refs(self, query: str, owner: str, name: str, page_size: int) -> Iterator[Dict]:
+        after = None
+        while True:
+            data = self.execute(query, {
+                'owner': owner,
+                'name': name,
+                'first': min(page_size, PAGE_SIZE),
+                'after': after,
+            })
+            repository = data.get('repository')
+            if repository is None:
+                raise GraphQLError(f"找不到倉庫: {owner}/{name}")
+
+            refs = repository['refs']
+            for node in refs['nodes']:
+                yield node
+
+            if not refs['pageInfo']['hasNextPage']:
+                break
+            after = refs['pageInfo']['endCursor']
+
+    def iter_branch_refs(self, owner: str, name: str,
+                         page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """
+        逐頁產生倉庫的分支 ref 節點
+
+        每個節點包含分支名稱與其 HEAD 提交（oid、標題、網址、作者）。
+
+        Args:
+            owner (str): 倉庫擁有者
+            name (str): 倉庫名稱
+            page_size (int): 每頁 refs 數量，最多 100
+
+        Yields:
+            Dict: refs 節點
+        """
+        return self._iter_refs(BRANCH_REFS_QUERY, owner, name, page_size)
+
+    def iter_branch_heads(self, owner: str, name: str,
+                          page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """
+        逐頁產生分支名稱與 HEAD SHA（不含提交詳情，回應極小）
+
+        Args:
+            owner (str): 倉庫擁有者
+            name (str): 倉庫名稱
+            page_size (int): 每頁 refs 數量，最多 100
+
+        Yields:
+            Dict: {'name': ..., 'target': {'oid': ...}}
+        """
+        return self._iter_refs(BRANCH_HEADS_QUERY, owner, name, page_size)
+
+    def iter_repositories(self, login: str, page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """
+        逐頁產生帳號擁有的公開倉庫清單（每頁最多 100 個倉庫只需一個請求）
+
+        每個節點包含根目錄檔案名稱、主頁、Pages 部署數、主要語言、主題、
+        星標、Fork 數與更新時間，足以判斷並描述一個工具倉庫。
+
+        Args:
+            login (str): 用戶或組織名稱
+            page_size (int): 每頁倉庫數量，最多 100
+
+        Yields:
+            Dict: repositories 節點
+        """
+        after = None
+        while True:
+            data = self.execute(REPOSITORY_INVENTORY_QUERY, {
+                'login': login,
+                'first': min(page_size, PAGE_SIZE),
+                'after': after,
+            })
+            owner = data.get('repositoryOwner')
+            if owner is None:
+                raise GraphQLError(f"找不到帳號: {login}")
+
+            repositories = owner['repositories']
+            for node in repositories['nodes']:
+                yield node
+
+            if not repositories['pageInfo']['hasNextPage']:
+                break
+            after = repositories['pageInfo']['endCursor']
+
+    def fetch_commits(self, owner: str, name: str, oids: List[str]) -> Dict[str, Dict]:
+        """
+        以別名批次查詢多個提交（每次請求最多 100 個）
+
+        Args:
+            owner (str): 倉庫擁有者
+            name (str): 倉庫名稱
+            oids (List[str]): 提交 SHA 列表
+
+        Returns:
+            Dict[str, Dict]: oid -> 提交節點（oid、messageHeadline、url、author）
+        """
+        commits = {}
+        for start in range(0, len(oids), PAGE_SIZE):
+            batch = oids[start:start + PAGE_SIZE]
+            fields = '\n'.join(
+                f'    c{i}: object(oid: "{oid}") {{ ...CommitFields }}'
+                for i, oid in enumerate(batch)
+            )
+            query = (
+                'query Commits($owner: String!, $name: String!) {\n'
+                '  repository(owner: $owner, name: $name) {\n'
+                f'{fields}\n'
+                '  }\n'
+                '}\n' + COMMIT_FIELDS
+            )
+            repository = self.execute(query, {'owner': owner, 'name': name}).get('repository')
+            if repository is None:
+                raise GraphQLError(f"找不到倉庫: {owner}/{name}")
+            for i, oid in enumerate(batch):
+                node = repository.get(f'c{i}')
+                if node:
+                    commits[oid] = node
+        return commits
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+指標歷史
+========
+每次執行把各倉庫的星標、Fork、分支數與活躍分支數（最近有提交的分支）附加到一個小型二進位檔，
+趨勢（sparkline 與增減量）直接由這個檔案渲染，不需要額外的 API 請求。
+
+- 檔案由固定大小的記錄組成（時間、鍵摘要與四個 32 位元整數），讀取時以 mmap
+  映射並以 struct.iter_unpack 逐筆解碼，不把整個檔案讀進記憶體。
+- 數值與該鍵上一筆記錄相同時不附加，檔案只隨資料實際變化而增長；
+  資料未變的執行也就不會改動這個檔案。
+- 檔案超過 COMPACT_BYTES 時依記錄的新舊降採樣：最近 RAW_DAYS 天保留全部，
+  之後每天、再之後每週各保留最後一筆，超過 RETENTION_DAYS 天的記錄捨棄。
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+HISTORY_MAGIC = b'DHST'
+HISTORY_VERSION = 1
+
+# 檔頭：magic、版本、保留欄位
+_HEADER = struct.Struct('<4sHH')
+# 記錄：UTC 秒數、鍵摘要、stars、forks、branches、active
+_RECORD = struct.Struct('<I8siiii')
+
+# 沒有這項資料（例如工具倉庫的分支數）
+MISSING = -1
+
+# 降採樣的門檻與各層的保留期限
+COMPACT_BYTES = 256 * 1024
+RAW_DAYS = 14
+DAILY_DAYS = 180
+RETENTION_DAYS = 730
+
+_DAY = 86400
+
+
+class Sample(NamedTuple):
+    """單一鍵在某次執行的指標，沒有的項目為 MISSING"""
+    stars: int = MISSING
+    forks: int = MISSING
+    branches: int = MISSING
+    active: int = MISSING
+
+
+def key_digest(key: str) -> bytes:
+    """鍵（倉庫名稱等）的 8 位元組摘要"""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+
+
+class MetricsHistory:
+    """
+    附加式指標歷史檔
+
+    Attributes:
+        path (str): 歷史檔路徑
+        compact_bytes (int): 檔案超過此大小時在附加後降採樣
+    """
+
+    def __init__(self, path: str, compact_bytes: int = COMPACT_BYTES):
+        self.path = path
+        self.compact_bytes = compact_bytes
+
+    def _records(self) -> List[Tuple]:
+        """
+        以 mmap 讀出所有完整的記錄
+
+        檔案不存在、檔頭不符或版本不同時返回空列表；
+        尾端不完整的記錄（寫入中斷）會被忽略。
+        """
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return []
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, _ = _HEADER.unpack_from(mm)
+                if magic != HISTORY_MAGIC or version != HISTORY_VERSION:
+                    return []
+                end = _HEADER.size + (size - _HEADER.size) // _RECORD.size * _RECORD.size
+                with memoryview(mm) as view, view[_HEADER.size:end] as body:
+                    return list(_RECORD.iter_unpack(body))
+
+    def points(self, key: str) -> List[Tuple[int, Sample]]:
+        """
+        讀出某個鍵的所有記錄
+
+        Args:
+            key (str): 記錄時使用的鍵
+
+        Returns:
+            List[Tuple[int, Sample]]: (UTC 秒數, 指標)，由舊到新
+        """
+        digest = key_digest(key)
+        return [(record[0], Sample(*record[2:])) for record in self._records() if record[1] == digest]
+
+    def values(self, key: str, field: str, limit: int = 0) -> List[int]:
+        """
+        某個鍵單一指標的變化序列（略過 MISSING）
+
+        Args:
+            key (str): 記錄時使用的鍵
+            field (str): Sample 的欄位名稱
+            limit (int): 只返回最後幾筆，0 表示全部
+
+        Returns:
+            List[int]: 由舊到新的數值
+        """
+        values = [value for _, sample in self.points(key)
+                  if (value := getattr(sample, field)) != MISSING]
+        return values[-limit:] if limit else values
+
+    def record(self, samples: Dict[str, Sample], now: Optional[float] = None) -> int:
+        """
+        附加本次執行的指標
+
+        與該鍵上一筆記錄相同的指標不會附加。檔案不存在或格式不符時重新建立。
+
+        Args:
+            samples (Dict[str, Sample]): 鍵 -> 指標
+            now (float): 記錄時間（UTC 秒數），預設為現在
+
+        Returns:
+            int: 實際附加的記錄數
+        """
+        now = int(time.time() if now is None else now)
+        records = self._records()
+        latest = {record[1]: record[2:] for record in records}
+        fresh = []
+        for key, sample in samples.items():
+            digest = key_digest(key)
+            if latest.get(digest) != tuple(sample):
+                fresh.append(_RECORD.pack(now, digest, *sample))
+        if not fresh:
+            return 0
+
+        if records:
+            with open(self.path, 'r+b') as f:
+                # 截掉寫入中斷留下的不完整記錄後再附加
+                f.truncate(_HEADER.size + len(records) * _RECORD.size)
+                f.seek(0, os.SEEK_END)
+                f.write(b''.join(fresh))
+        else:
+            self._write([], extra=fresh)
+
+        if os.path.getsize(self.path) > self.compact_bytes:
+            self.compact(now)
+        return len(fresh)
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        依記錄的新舊降採樣
+
+        每個鍵在每個時間區間只保留最後一筆：最近 RAW_DAYS 天不合併，
+        DAILY_DAYS 天內每天一筆，RETENTION_DAYS 天內每週一筆，更早的捨棄。
+
+        Args:
+            now (float): 基準時間（UTC 秒數），預設為現在
+
+        Returns:
+            int: 移除的記錄數
+        """
+        now = int(time.time() if now is None else now)
+        records = self._records()
+        buckets: Dict[Tuple, Tuple] = {}
+        for position, record in enumerate(records):
+            age = now - record[0]
+            if age > RETENTION_DAYS * _DAY:
+                continue
+            if age <= RAW_DAYS * _DAY:
+                bucket = ('raw', position)
+            elif age <= DAILY_DAYS * _DAY:
+                bucket = ('day', record[0] // _DAY)
+            else:
+                bucket = ('week', record[0] // (7 * _DAY))
+            # 同一區間內後面的記錄覆蓋前面的（指標是當下的數值）
+            buckets[record[1], bucket] = record
+        kept = sorted(buckets.values(), key=lambda record: record[0])
+        if len(kept) < len(records):
+            self._write(kept)
+        return len(records) - len(kept)
+
+    def _write(self, records: List[Tuple], extra: Iterable[bytes] = ()) -> None:
+        """原子重寫整個檔案（暫存檔 + 改名）"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(HISTORY_MAGIC, HISTORY_VERSION, 0))
+                f.write(b''.join(_RECORD.pack(*record) for record in records))
+                f.write(b''.join(extra))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+
+"""
+HTML 工具建置
+=============
+工具多半是內嵌 CSS/JS 的單一 HTML 檔，原樣發布時行動裝置的首次繪製很慢。
+這裡把工具文件壓縮（minify）並預先產生 gzip 與 brotli 版本，
+記錄壓縮前後的大小，讓工具網格可以顯示載入量。
+
+- 壓縮只做不改變語義的轉換：移除註解、合併空白；<pre>/<textarea> 原樣保留，
+  JS 的字串、模板字面值與正規表達式原樣保留，換行保留（不依賴自動插入分號的規則）。
+- 每個檔案以來源內容的雜湊（遠端為 Git blob SHA）記錄在建置清單中，
+  雜湊未變且輸出仍在時略過，不需重新下載或壓縮。
+- brotli 為選用依賴，沒有安裝時只產生 gzip。
+
+命令列用法：
+    python -m dashboard.html_build [--out DIR] 檔案.html ...
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dashboard.publish import git_blob_sha
+from dashboard.render import format_size
+
+BUILD_VERSION = 1
+
+MANIFEST_NAME = 'manifest.json'
+
+# ---- CSS ----
+
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/|\s+', re.S)
+_CSS_PUNCTUATION = re.compile(r' ?([{};,>]) ?')
+
+
+def minify_css(css: str) -> str:
+    """
+    壓縮 CSS：移除註解、合併空白、去掉標點兩側與冒號後的空白
+
+    冒號前的空白保留（'a :hover' 與 'a:hover' 是不同的選擇器），字串原樣保留。
+
+    Args:
+        css (str): 原始 CSS
+
+    Returns:
+        str: 壓縮後的 CSS
+    """
+    parts = []
+    pending = []  # 兩個字串之間的其他內容，一起處理才能去掉跨越註解的空白
+    position = 0
+    for match in _CSS_TOKENS.finditer(css):
+        pending.append(css[position:match.start()])
+        if match.group(1):
+            parts.append(_squeeze_css(''.join(pending)))
+            parts.append(match.group(1))
+            pending = []
+        else:
+            # 註解與空白都折成一個空白
+            pending.append(' ')
+        position = match.end()
+    pending.append(css[position:])
+    parts.append(_squeeze_css(''.join(pending)))
+    return ''.join(parts).strip()
+
+
+def _squeeze_css(text: str) -> str:
+    text = re.sub(r'\s+', ' ', text)
+    text = _CSS_PUNCTUATION.sub(r'\1', text)
+    return text.replace(': ', ':').replace(';}', '}')
+
+
+# ---- JavaScript ----
+
+# 之後的 '/' 是正規表達式而不是除號
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                   'void', 'throw', 'yield', 'await', 'instanceof'}
+
+_JS_WORD = re.compile(r'[A-Za-z0-9_$\u0080-\uffff]+')
+
+
+def _js_segments(src: str) -> Iterator[Tuple[bool, str]]:
+    """
+    把 JS 切成 (是否為程式碼, 文字) 片段
+
+    字串、模板字面值與正規表達式以 False 原樣輸出；註解以空白（含換行時為換行）取代。
+    """
+    n = len(src)
+    i = start = 0
+    braces: List[int] = []  # 每層模板 ${ } 內的大括號深度
+    prev = ''  # 最後一個有意義的 token，用來判斷 '/' 的意義
+    while i < n:
+        c = src[i]
+        if c == '`' or (c == '}' and braces and braces[-1] == 0):
+            yield True, src[start:i]
+            if c == '}':
+                braces.pop()
+            j = i + 1
+            while j < n and src[j] != '`':
+                if src[j] == '\\':
+                    j += 2
+                    continue
+                if src.startswith('${', j):
+                    braces.append(0)
+                    j += 2
+                    prev = '{'
+                    break
+                j += 1
+            else:
+                j += 1
+                prev = ')'
+            yield False, src[i:j]
+            i = start = j
+            continue
+        if c in '"\'':
+            yield True, src[start:i]
+            j = i + 1
+            while j < n and src[j] != c and src[j] != '\n':
+                j += 2 if src[j] == '\\' else 1
+            j += 1
+            yield False, src[i:j]
+            i = start = j
+            prev = ')'
+            continue
+        if c == '/' and src.startswith('//', i):
+            yield True, src[start:i]
+            j = src.find('\n', i)
+            i = start = n if j < 0 else j
+            continue
+        if c == '/' and src.startswith('/*', i):
+            yield True, src[start:i]
+            j = src.find('*/', i + 2)
+            j = n if j < 0 else j + 2
+            yield True, '\n' if '\n' in src[i:j] else ' '
+            i = start = j
+            continue
+        if c == '/' and (prev == '' or prev in _REGEX_PRECEDERS or prev in _REGEX_KEYWORDS or prev == '}'):
+            j = i + 1
+            in_class = False
+            while j < n and src[j] != '\n':
+                ch = src[j]
+                if ch == '\\':
+                    j += 2
+                    continue
+                if in_class:
+                    in_class = ch != ']'
+                elif ch == '[':
+                    in_class = True
+                elif ch == '/':
+                    break
+                j += 1
+            if j < n and src[j] == '/':
+                j += 1
+                while j < n and (src[j].isalnum() or src[j] in '_$'):
+                    j += 1
+                yield True, src[start:i]
+                yield False, src[i:j]
+                i = start = j
+                prev = ')'
+                continue
+            # 同一行內沒有結尾的 '/'：視為除號
+        if c == '{' and braces:
+            braces[-1] += 1
+        elif c == '}' and braces:
+            braces[-1] -= 1
+        if c.isspace():
+            i += 1
+            continue
+        word = _JS_WORD.match(src, i)
+        if word:
+            prev = word.group() if word.group() in _REGEX_KEYWORDS else 'a'
+            i = word.end()
+            continue
+        prev = c
+        i += 1
+    yield True, src[start:]
+
+
+_JS_PUNCTUATION = re.compile(r' ?([{}()\[\];,:=]) ?')
+
+
+def _squeeze_js(code: str) -> str:
+    code = re.sub(r'[ \t\f\v\r]*\n\s*', '\n', code)
+    code = re.sub(r'[ \t\f\v\r]+', ' ', code)
+    code = _JS_PUNCTUATION.sub(r'\1', code)
+    # 這些標點之後或之前的換行不影響自動插入分號
+    code = re.sub(r'([{;,(\[])\n', r'\1', code)
+    return re.sub(r'\n([})\]])', r'\1', code)
+
+
+def minify_js(js: str) -> str:
+    """
+    壓縮 JavaScript：移除註解、合併空白、去掉不影響語義的空白與換行
+
+    不改名、不重排，字串、模板字面值與正規表達式原樣保留；
+    其餘換行保留，語義不依賴自動插入分號的規則。
+
+    Args:
+        js (str): 原始 JS
+
+    Returns:
+        str: 壓縮後的 JS
+    """
+    parts = []
+    code = []
+    for is_code, text in _js_segments(js):
+        if is_code:
+            code.append(text)
+            continue
+        parts.append(_squeeze_js(''.join(code)))
+        code = []
+        parts.append(text)
+    parts.append(_squeeze_js(''.join(code)))
+    return ''.join(parts).strip()
+
+
+# ---- HTML ----
+
+_RAW_ELEMENTS = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.I | re.S)
+_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_BLOCK_TAGS = ('html|head|body|meta|link|title|base|div|p|ul|ol|li|dl|dt|dd|table|thead|tbody|tfoot|'
+               'tr|td|th|section|article|aside|header|footer|nav|main|form|fieldset|h[1-6]|hr|br|'
+               'script|style|noscript|template|canvas|svg|select|option|figure|figcaption|!doctype')
+_BLOCK_TAG = re.compile(r'\s*(</?(?:' + _BLOCK_TAGS + r')\b[^>]*>)\s*', re.I)
+_JS_TYPES = ('', 'text/javascript', 'application/javascript', 'module')
+_SCRIPT_TYPE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]*)', re.I)
+_TAG = re.compile(r'<[^>]*>')
+_TAG_SPACE = re.compile(r'("[^"]*"|\'[^\']*\')|\s+')
+
+
+def _squeeze_tag(tag: str) -> str:
+    # 屬性值（如 value、placeholder）中的空白有意義，原樣保留
+    return _TAG_SPACE.sub(lambda match: match.group(1) or ' ', tag).replace(' >', '>')
+
+
+def _squeeze_text(text: str) -> str:
+    # 含換行的空白折成換行，其餘折成一個空白（行內元素之間的空白仍然保留）
+    text = re.sub(r'\s*\n\s*', '\n', text)
+    return re.sub(r'[ \t\f\v\r]+', ' ', text)
+
+
+def _squeeze_markup(markup: str) -> str:
+    markup = _COMMENT.sub('', markup)
+    parts = []
+    position = 0
+    for match in _TAG.finditer(markup):
+        parts.append(_squeeze_text(markup[position:match.start()]))
+        parts.append(_squeeze_tag(match.group()))
+        position = match.end()
+    parts.append(_squeeze_text(markup[position:]))
+    return _BLOCK_TAG.sub(r'\1', ''.join(parts))
+
+
+def minify_html(html: str) -> str:
+    """
+    壓縮 HTML 文件（連同內嵌的 <style> 與 <script>）
+
+    移除註解（保留條件註解），塊級標籤兩側的空白去掉，其他空白合併；
+    <pre> 與 <textarea> 原樣保留，非 JavaScript 的 <script>（如 JSON）不處理。
+
+    Args:
+        html (str): 原始 HTML
+
+    Returns:
+        str: 壓縮後的 HTML
+    """
+    parts = []
+    position = 0
+    trim = False  # 上一個元素是 <script>/<style>，之後的空白不會顯示
+    for match in _RAW_ELEMENTS.finditer(html):
+        markup = _squeeze_markup(html[position:match.start()])
+        open_tag, name, body, close_tag = match.groups()
+        name = name.lower()
+        if name == 'style':
+            body = minify_css(body)
+        elif name == 'script':
+            script_type = _SCRIPT_TYPE.search(open_tag)
+            if (script_type.group(1).lower() if script_type else '') in _JS_TYPES:
+                body = minify_js(body)
+        if trim:
+            markup = markup.lstrip()
+        trim = name in ('script', 'style')
+        if trim:
+            markup = markup.rstrip()
+        parts.append(markup)
+        parts.append(_squeeze_markup(open_tag) + body + close_tag)
+        position = match.end()
+    markup = _squeeze_markup(html[position:])
+    parts.append(markup.lstrip() if trim else markup)
+    return ''.join(parts).strip() + '\n'
+
+
+# ---- 建置 ----
+
+def gzip_bytes(data: bytes) -> bytes:
+    """以最高壓縮等級產生 gzip（mtime 固定為 0，相同輸入得到相同輸出）"""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(data: bytes) -> Optional[bytes]:
+    """以最高品質產生 brotli；沒有安裝 brotli 套件時返回 None"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """原子寫入（暫存檔 + 改名）"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class HtmlBuilder:
+    """
+    把 HTML 工具文件壓縮並預壓縮到輸出目錄（可在多個執行緒中建置不同的文件）
+
+    輸出為 <out_dir>/<key>、<key>.gz 與 <key>.br；建置清單 <out_dir>/manifest.json
+    記錄每個 key 的來源雜湊與各版本的大小。
+
+    Attributes:
+        out_dir (str): 輸出目錄
+        built (int): 本次執行實際建置的檔案數
+        skipped (int): 來源未變而略過的檔案數
+    """
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.built = 0
+        self.skipped = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        try:
+            with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == BUILD_VERSION:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def _outputs(self, key: str, entry: Dict) -> List[str]:
+        path = os.path.join(self.out_dir, key)
+        return [path, path + '.gz'] + ([path + '.br'] if entry.get('brotli') is not None else [])
+
+    def cached(self, key: str, source_hash: str) -> Optional[Dict]:
+        """
+        來源雜湊未變且輸出都還在時，返回上次的建置記錄
+
+        Args:
+            key (str): 輸出路徑（相對於 out_dir，如 'repo/index.html'）
+            source_hash (str): 來源內容的 Git blob SHA
+
+        Returns:
+            Optional[Dict]: 建置記錄，需要重新建置時為 None
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry['hash'] != source_hash:
+            return None
+        if not all(os.path.exists(path) for path in self._outputs(key, entry)):
+            return None
+        with self._lock:
+            self._seen.add(key)
+            self.skipped += 1
+        return entry
+
+    def build(self, key: str, source: bytes, source_hash: Optional[str] = None) -> Dict:
+        """
+        壓縮一個 HTML 文件並寫出原始、gzip 與 brotli 版本
+
+        Args:
+            key (str): 輸出路徑（相對於 out_dir）
+            source (bytes): 來源內容（UTF-8）
+            source_hash (str): 來源雜湊，默認為內容的 Git blob SHA
+
+        Returns:
+            Dict: {'hash', 'source', 'minified', 'gzip', 'brotli'}（大小為位元組數，
+                沒有 brotli 時為 None）
+        """
+        source_hash = source_hash or git_blob_sha(source)
+        entry = self.cached(key, source_hash)
+        if entry is not None:
+            return entry
+
+        minified = minify_html(source.decode('utf-8')).encode('utf-8')
+        if len(minified) >= len(source):
+            # 已經壓縮過的文件原樣發布
+            minified = source
+        gzipped = gzip_bytes(minified)
+        compressed = brotli_bytes(minified)
+
+        path = os.path.join(self.out_dir, key)
+        _write_bytes(path, minified)
+        _write_bytes(path + '.gz', gzipped)
+        if compressed is not None:
+            _write_bytes(path + '.br', compressed)
+        elif os.path.exists(path + '.br'):
+            os.unlink(path + '.br')
+
+        entry = {'hash': source_hash, 'source': len(source), 'minified': len(minified),
+                 'gzip': len(gzipped), 'brotli': len(compressed) if compressed is not None else None}
+        with self._lock:
+            self.entries[key] = entry
+            self._seen.add(key)
+            self.built += 1
+        return entry
+
+    def keep(self, prefix: str) -> int:
+        """
+        保留 prefix 下上次的建置記錄與輸出（例如工具暫時無法下載時），save 不會移除
+
+        Args:
+            prefix (str): 輸出路徑前綴（如 'repo/'）
+
+        Returns:
+            int: 保留的檔案數
+        """
+        with self._lock:
+            kept = [key for key in self.entries if key.startswith(prefix)]
+            self._seen.update(kept)
+        return len(kept)
+
+    def save(self, prune: bool = True) -> int:
+        """
+        寫出建置清單
+
+        Args:
+            prune (bool): 移除本次沒有出現的檔案（工具已刪除或改名）及其輸出
+
+        Returns:
+            int: 移除的檔案數
+        """
+        stale = [key for key in self.entries if key not in self._seen] if prune else []
+        for key in stale:
+            for path in self._outputs(key, self.entries.pop(key)):
+                if os.path.exists(path):
+                    os.unlink(path)
+        data = json.dumps({'version': BUILD_VERSION, 'files': self.entries},
+                          ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        _write_bytes(os.path.join(self.out_dir, MANIFEST_NAME), data.encode('utf-8'))
+        return len(stale)
+
+
+def payload_sizes(entries: List[Dict]) -> Dict[str, Optional[int]]:
+    """
+    合計一個工具所有文件的大小
+
+    Args:
+        entries (List[Dict]): HtmlBuilder.build 的結果
+
+    Returns:
+        Dict[str, Optional[int]]: {'source', 'minified', 'gzip', 'brotli'}；
+            任一文件沒有 brotli 時 'brotli' 為 None
+    """
+    totals = {'source': 0, 'minified': 0, 'gzip': 0, 'brotli': 0}
+    for entry in entries:
+        for field in ('source', 'minified', 'gzip'):
+            totals[field] += entry[field]
+        if totals['brotli'] is not None:
+            totals['brotli'] = None if entry['brotli'] is None else totals['brotli'] + entry['brotli']
+    return totals
+
+
+def main(argv=None) -> int:
+    """命令列入口：建置本地的 HTML 文件"""
+    parser = argparse.ArgumentParser(description='壓縮 HTML 工具並預先產生 gzip/brotli 版本')
+    parser.add_argument('--out', default='dist', help='輸出目錄（默認 dist）')
+    parser.add_argument('files', nargs='+', help='HTML 文件')
+    args = parser.parse_args(argv)
+
+    builder = HtmlBuilder(args.out)
+    for path in args.files:
+        try:
+            with open(path, 'rb') as f:
+                source = f.read()
+            entry = builder.build(os.path.basename(path), source)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ {path}: {e}")
+            return 1
+        brotli_size = f" / br {format_size(entry['brotli'])}" if entry['brotli'] is not None else ''
+        print(f"📦 {path}: {format_size(entry['source'])} → {format_size(entry['minified'])}"
+              f"（gzip {format_size(entry['gzip'])}{brotli_size}）")
+    builder.save(prune=False)
+    print(f"✅ 建置 {builder.built} 個，略過 {builder.skipped} 個未變更的文件（{args.out}）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""
+條件請求 HTTP 快取
+==================
+以 URL 為鍵把 GET 回應（ETag / Last-Modified 與內容）存到磁碟，
+下次執行時送出 If-None-Match / If-Modified-Since 重新驗證。
+GitHub 對 304 回應不計入速率限制，因此未變更的資源幾乎零成本。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from dashboard.transport import default_retry, install_pygithub_transport, mount_adapter
+
+# 預設快取上限 64 MB
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 回應內容已由 requests 解碼，這些標頭不再適用於快取的內容
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class HttpCache:
+    """
+    磁碟上的回應快取
+
+    每個項目一個檔案：第一行是 JSON 中繼資料，其後是原始回應內容。
+    以檔案的修改時間作為最近使用時間，超過容量上限時淘汰最久未使用的項目。
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        初始化快取
+
+        Args:
+            directory (str): 快取目錄（不存在時自動建立）
+            max_bytes (int): 快取總大小上限（位元組）
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # 索引: key -> (大小, 最近使用時間)
+        self._index: Dict[str, Tuple[int, float]] = {}
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith('.cache'):
+                stat = entry.stat()
+                self._index[entry.name[:-6]] = (stat.st_size, stat.st_mtime)
+        self._total = sum(size for size, _ in self._index.values())
+
+    @staticmethod
+    def make_key(url: str, accept: str = '') -> str:
+        """以 URL 與 Accept 標頭計算快取鍵"""
+        return hashlib.sha256(f"{url}\n{accept}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def get(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        """
+        讀取快取項目
+
+        Returns:
+            (中繼資料, 內容)，不存在時返回 None
+        """
+        if key not in self._index:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                meta = json.loads(f.readline().decode('utf-8'))
+                body = f.read()
+        except (OSError, ValueError):
+            self._forget(key)
+            return None
+        return meta, body
+
+    def touch(self, key: str) -> None:
+        """標記項目為最近使用"""
+        now = time.time()
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            return
+        with self._lock:
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+
+    def put(self, key: str, meta: Dict, body: bytes) -> None:
+        """
+        寫入快取項目（先寫暫存檔再改名），必要時淘汰舊項目
+
+        Args:
+            key (str): 快取鍵
+            meta (Dict): 中繼資料（url、etag、last_modified、headers）
+            body (bytes): 回應內容
+        """
+        data = json.dumps(meta, ensure_ascii=False).encode('utf-8') + b'\n' + body
+        if len(data) > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        with self._lock:
+            old_size = self._index.get(key, (0, 0))[0]
+            self._index[key] = (len(data), time.time())
+            self._total += len(data) - old_size
+            self._evict()
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            size, _ = self._index.pop(key, (0, 0))
+            self._total -= size
+
+    def _evict(self) -> None:
+        # 呼叫端須持有 self._lock
+        if self._total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+            del self._index[key]
+            self._total -= size
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    為 GET 請求加上條件標頭的 requests adapter
+
+    收到 304 時以快取內容組出 200 回應，上層（PyGithub）看不出差別。
+    """
+
+    def __init__(self, cache: HttpCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        key = self.cache.make_key(request.url, request.headers.get('Accept', ''))
+        cached = self.cache.get(key)
+        if cached is not None:
+            meta, body = cached
+            if meta.get('etag') and 'If-None-Match' not in request.headers:
+                request.headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified') and 'If-Modified-Since' not in request.headers:
+                request.headers['If-Modified-Since'] = meta['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.hits += 1
+            self.cache.touch(key)
+            return self._from_cache(response, meta, body)
+
+        self.cache.misses += 1
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                headers = {k: v for k, v in response.headers.items()
+                           if k.lower() not in _DROPPED_HEADERS}
+                self.cache.put(key, {
+                    'url': request.url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'headers': headers,
+                }, response.content)
+        return response
+
+    @staticmethod
+    def _from_cache(response, meta: Dict, body: bytes):
+        # 保留 304 回應的最新標頭（速率限制、ETag），其餘沿用快取
+        headers = CaseInsensitiveDict(meta.get('headers', {}))
+        for name, value in response.headers.items():
+            if name.lower() not in _DROPPED_HEADERS:
+                headers[name] = value
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = headers
+        response._content = body
+        response.encoding = get_encoding_from_headers(headers) or 'utf-8'
+        # 讓遙測區分快取命中與實際傳輸
+        response.from_cache = True
+        return response
+
+
+def enable_http_cache(directory: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                      pool_size: int = 10) -> HttpCache:
+    """
+    啟用磁碟快取：掛載 CachingAdapter 並讓 PyGithub 走共用 session
+
+    需在建立 Github 物件前呼叫。
+
+    Args:
+        directory (str): 快取目錄
+        max_bytes (int): 快取總大小上限
+        pool_size (int): 連線池大小
+
+    Returns:
+        HttpCache: 快取實例（可讀取 hits / misses 統計）
+    """
+    cache = HttpCache(directory, max_bytes)
+    mount_adapter(CachingAdapter(
+        cache,
+        max_retries=default_retry(),
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    ))
+    install_pygithub_transport()
+    return cache
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+本地 Git 資料來源
+=================
+actions/checkout 以 fetch-depth: 0 檢出時，所有遠端分支的 HEAD 與提交都已在磁碟上。
+這裡以 git for-each-ref 逐行讀出每個分支的 HEAD SHA、提交標題、作者與日期，
+組出與 REST/GraphQL 引擎相同的分支資訊，不需要任何 API 請求或 token。
+
+優先讀取 refs/remotes/<remote>/（CI 檢出的遠端分支）；沒有遠端分支時
+（例如本地開發用的倉庫）改讀 refs/heads/。
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, Iterator, NamedTuple, Optional
+
+DEFAULT_REMOTE = 'origin'
+
+# 提交連結的網站網址（GitHub Actions 以 GITHUB_SERVER_URL 提供，Enterprise 不同）
+GITHUB_SERVER_URL = 'https://github.com'
+
+# 欄位以 NUL 分隔；提交標題只取訊息第一行，與 REST 引擎一致。
+# 日期以 TZ=UTC 的 -local 格式輸出，所有分支的時間字串可以直接比較先後
+_FIELDS = ('refname', 'symref', 'objecttype', 'objectname', 'contents:lines=1',
+           'authorname', 'authordate:iso-strict-local', 'committerdate:iso-strict-local')
+_FORMAT = '%00'.join(f"%({field})" for field in _FIELDS)
+
+
+class LocalGitError(Exception):
+    """無法讀取本地倉庫（不是 Git 倉庫、git 不存在等）"""
+
+
+class BranchRef(NamedTuple):
+    """
+    單一分支的 HEAD 提交
+
+    每個分支一個 tuple：大量分支時不為每個分支建立 dict 與 datetime，
+    日期保留為 UTC 的 ISO 8601 字串，只在組裝要顯示的分支時才解析。
+    """
+    name: str
+    sha: str
+    message: str
+    author: str
+    date: str
+    committed: str
+
+
+class LocalGitRepository:
+    """
+    本地檢出的倉庫
+
+    分支以 for-each-ref 的輸出逐行串流產生，不在記憶體中保留所有分支的提交資訊；
+    只有 branch_heads() 的名稱 -> SHA 對照會在第一次需要時讀取並沿用。
+    """
+
+    def __init__(self, path: str = '.', remote: str = DEFAULT_REMOTE):
+        """
+        初始化資料來源
+
+        Args:
+            path (str): 倉庫目錄
+            remote (str): 遠端名稱
+        """
+        self.path = path
+        self.remote = remote
+        self._heads: Optional[Dict[str, str]] = None
+        self._remote_head: Optional[str] = None
+
+    def _stream_refs(self, prefix: str) -> Iterator[BranchRef]:
+        """逐行讀取 prefix 下的分支；prefix 以外的部分即分支名稱"""
+        try:
+            process = subprocess.Popen(
+                ['git', '-C', self.path, 'for-each-ref', f"--format={_FORMAT}", prefix],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                encoding='utf-8', errors='replace', env={**os.environ, 'TZ': 'UTC'},
+            )
+        except FileNotFoundError:
+            raise LocalGitError("找不到 git 指令") from None
+
+        with process:
+            for line in process.stdout:
+                refname, symref, objecttype, sha, subject, author, authored, committed = \
+                    line.rstrip('\n').split('\0')
+                # origin/HEAD 之類的符號 ref 只記下其指向的預設分支；略過不指向提交的 ref
+                if symref:
+                    if refname == f"{prefix}HEAD" and symref.startswith(prefix):
+                        self._remote_head = symref[len(prefix):]
+                    continue
+                if objecttype != 'commit':
+                    continue
+                yield BranchRef(refname[len(prefix):], sha, subject, sys.intern(author), authored, committed)
+            error = process.stderr.read().strip()
+        if process.returncode:
+            raise LocalGitError(error or f"git for-each-ref 失敗（{process.returncode}）")
+
+    def iter_branch_refs(self) -> Iterator[BranchRef]:
+        """
+        逐一產生所有分支的 HEAD 提交資訊（依名稱排序，與 API 的分支順序相同）
+
+        優先讀取 refs/remotes/<remote>/，沒有遠端分支時改讀 refs/heads/。
+
+        Yields:
+            BranchRef: 日期為 UTC 的 ISO 8601 字串
+
+        Raises:
+            LocalGitError: 無法讀取倉庫
+        """
+        found = False
+        for ref in self._stream_refs(f"refs/remotes/{self.remote}/"):
+            found = True
+            yield ref
+        if not found:
+            yield from self._stream_refs('refs/heads/')
+
+    def default_branch(self) -> Optional[str]:
+        """
+        推測預設分支：<remote>/HEAD 指向的分支，否則為 main 或 master
+
+        Returns:
+            Optional[str]: 分支名稱，都不存在時為 None
+        """
+        heads = self.branch_heads()
+        if self._remote_head in heads:
+            return self._remote_head
+        return next((name for name in ('main', 'master') if name in heads), None)
+
+    def branch_heads(self) -> Dict[str, str]:
+        """
+        返回分支名稱 -> HEAD SHA
+
+        Returns:
+            Dict[str, str]: 依名稱排序的分支 HEAD
+        """
+        if self._heads is None:
+            self._heads = {ref.name: ref.sha for ref in self.iter_branch_refs()}
+        return self._heads
+
+    def refresh(self) -> None:
+        """捨棄快取的分支 HEAD（檢出中的 refs 已更新時呼叫，例如常駐模式）"""
+        self._heads = None
+
+    def fetch(self) -> None:
+        """
+        以 git fetch --prune 更新遠端分支，並捨棄快取的分支 HEAD
+
+        常駐模式在檢出之後持續執行，不抓取的話 refs/remotes/<remote>/ 不會反映新的推送。
+
+        Raises:
+            LocalGitError: git 不存在或抓取失敗
+        """
+        try:
+            completed = subprocess.run(
+                ['git', '-C', self.path, 'fetch', '--prune', '--quiet', self.remote],
+                capture_output=True, text=True, encoding='utf-8', errors='replace',
+            )
+        except FileNotFoundError:
+            raise LocalGitError("找不到 git 指令") from None
+        if completed.returncode:
+            raise LocalGitError(completed.stderr.strip() or f"git fetch 失敗（{completed.returncode}）")
+        self.refresh()
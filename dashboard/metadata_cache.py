@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""
+跨執行的倉庫中繼資料快取
+========================
+以倉庫 ID 與 pushed_at/updated_at 為鍵，保存上次逐倉庫探測的結果
+（根目錄工具文件、主要語言、主題；非工具倉庫記為 None）。
+時間戳記未變的倉庫直接沿用快取，不再發送任何逐倉庫請求；
+本次清單中沒有出現的倉庫（已刪除或改名）在保存時自動移除。
+
+星標、Fork、描述與 Pages 狀態每次都由倉庫清單本身提供，不放進快取。
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple, Union
+
+METADATA_CACHE_VERSION = 1
+
+Timestamp = Union[datetime, str, None]
+
+
+def _normalize(moment: Timestamp) -> str:
+    """把 PyGithub 的 datetime 與 API JSON 的字串統一為 'YYYY-MM-DDTHH:MM:SSZ'"""
+    if moment is None:
+        return ''
+    if isinstance(moment, datetime):
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc)
+        return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+    return moment
+
+
+def fingerprint(pushed_at: Timestamp, updated_at: Timestamp) -> str:
+    """
+    由 pushed_at 與 updated_at 組出倉庫版本指紋
+
+    推送會改變 pushed_at，主題與描述等設定會改變 updated_at。
+
+    Returns:
+        str: 指紋字串
+    """
+    return f"{_normalize(pushed_at)}|{_normalize(updated_at)}"
+
+
+class RepoMetadataCache:
+    """
+    {repo_id: (fingerprint, probe)} 快取
+
+    probe 為 {'files': [...], 'language': str 或 None, 'topics': [...]}，
+    非工具倉庫為 None（同樣值得快取，避免每次重新列出根目錄）。
+
+    Attributes:
+        hits (int): 本次執行的快取命中數
+        misses (int): 本次執行需要重新探測的倉庫數
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict]] = None):
+        self.entries = entries or {}
+        self.hits = 0
+        self.misses = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> 'RepoMetadataCache':
+        """
+        讀取快取；檔案不存在、損壞或版本不符時返回空快取
+
+        Args:
+            path (str): 快取檔案路徑
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('version') != METADATA_CACHE_VERSION:
+            return cls()
+        return cls(data.get('repos'))
+
+    def lookup(self, repo_id: int, version: str) -> Tuple[bool, Optional[Dict]]:
+        """
+        查詢倉庫的探測結果，並把倉庫標記為仍然存在
+
+        Args:
+            repo_id (int): 倉庫 ID（改名後不變）
+            version (str): fingerprint() 的結果
+
+        Returns:
+            (是否命中, 探測結果)
+        """
+        key = str(repo_id)
+        with self._lock:
+            self._seen.add(key)
+            entry = self.entries.get(key)
+            if entry is not None and entry['v'] == version:
+                self.hits += 1
+                return True, entry['probe']
+            self.misses += 1
+            return False, None
+
+    def store(self, repo_id: int, version: str, probe: Optional[Dict]) -> None:
+        """記錄倉庫的最新探測結果"""
+        key = str(repo_id)
+        with self._lock:
+            self._seen.add(key)
+            self.entries[key] = {'v': version, 'probe': probe}
+
+    def prune(self) -> int:
+        """
+        移除本次執行沒有出現的倉庫
+
+        只應在完整掃描過倉庫清單後呼叫。
+
+        Returns:
+            int: 移除的項目數
+        """
+        with self._lock:
+            stale = [key for key in self.entries if key not in self._seen]
+            for key in stale:
+                del self.entries[key]
+        return len(stale)
+
+    def save(self, path: str) -> None:
+        """
+        以緊湊 JSON 原子寫入快取（暫存檔 + 改名）
+
+        Args:
+            path (str): 快取檔案路徑
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': METADATA_CACHE_VERSION, 'repos': self.entries},
+                          f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
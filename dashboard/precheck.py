@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+觸發事件預檢
+============
+在安裝依賴、導入 PyGithub 之前，只用標準庫判斷這次觸發是否可能改變分支儀表板。
+標籤事件、被篩選掉的分支、已反映在快照中的推送、刪除未顯示的分支等情況
+直接略過，整個檢查只需讀取事件 JSON 與分支快照。
+
+用法（GitHub Actions 中以系統 Python 執行，不需要 setup-python）：
+    python3 -m dashboard.precheck --snapshot .cache/dashboard/branches.json
+
+結果寫入 $GITHUB_OUTPUT 的 skip=true|false 與 reason，退出碼永遠為 0。
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from dashboard.selection import name_filter, parse_patterns
+from dashboard.snapshot import BranchSnapshot
+
+_BRANCH_PREFIX = 'refs/heads/'
+
+
+def _load_event(path: Optional[str]) -> Dict:
+    if not path:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def decide(event_name: str, event: Dict, snapshot: Optional[BranchSnapshot], accept,
+           order: str = 'recent', limit: int = 15) -> Tuple[bool, str]:
+    """
+    判斷是否可以略過這次執行
+
+    無法確定時一律返回不略過，寧可多跑一次也不漏掉更新。
+
+    Args:
+        event_name (str): GITHUB_EVENT_NAME
+        event (Dict): 事件內容（GITHUB_EVENT_PATH 的 JSON）
+        snapshot (BranchSnapshot): 上次執行的分支快照，None 表示沒有快照
+        accept: 分支名稱篩選函數
+        order (str): 儀表板排序方式，'recent' 或 'name'
+        limit (int): 儀表板顯示的分支數量
+
+    Returns:
+        (是否略過, 原因)
+    """
+    if event_name in ('create', 'delete'):
+        if event.get('ref_type') != 'branch':
+            return True, f"{event_name} 事件針對的是 {event.get('ref_type')}，不影響分支"
+        branch = event.get('ref', '')
+    elif event_name == 'push':
+        ref = event.get('ref', '')
+        if not ref.startswith(_BRANCH_PREFIX):
+            return True, f"推送的不是分支: {ref}"
+        branch = ref[len(_BRANCH_PREFIX):]
+    else:
+        return False, f"{event_name or '未知'} 事件需要完整檢查"
+
+    if not branch:
+        return False, "事件中沒有分支名稱"
+    if not accept(branch):
+        return True, f"分支 {branch} 不在篩選範圍內"
+    if snapshot is None or not snapshot.heads:
+        return False, "沒有分支快照"
+
+    known = branch in snapshot.heads
+    shown = branch in snapshot.rows
+    deleted = event_name == 'delete' or event.get('deleted')
+
+    if deleted:
+        if not known:
+            return True, f"已刪除的分支 {branch} 不在快照中"
+        if not shown:
+            return True, f"已刪除的分支 {branch} 未顯示在儀表板上"
+        return False, f"顯示中的分支 {branch} 已刪除"
+
+    if event_name == 'push':
+        after = event.get('after')
+        if after and snapshot.heads.get(branch) == after:
+            return True, f"分支 {branch} 的 HEAD {after[:7]} 已反映在快照中"
+
+    if order == 'name' and not shown:
+        # 依名稱排序時，顯示的是名稱最前面的 limit 個分支
+        if known:
+            return True, f"分支 {branch} 未顯示在儀表板上（依名稱排序）"
+        names: List[str] = sorted(set(snapshot.heads) | {branch})
+        if branch not in names[:limit]:
+            return True, f"新分支 {branch} 排在前 {limit} 個之後（依名稱排序）"
+
+    return False, f"分支 {branch} 有變更"
+
+
+def write_output(skip: bool, reason: str, path: Optional[str]) -> None:
+    """把結果寫入 $GITHUB_OUTPUT（未設定時略過）"""
+    if not path:
+        return
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(f"skip={'true' if skip else 'false'}\n")
+        f.write(f"reason={reason}\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='判斷觸發事件是否可能改變分支儀表板')
+    parser.add_argument('--snapshot', default=os.getenv('DASHBOARD_SNAPSHOT'), help='分支快照路徑')
+    parser.add_argument('--event-name', default=os.getenv('GITHUB_EVENT_NAME', ''))
+    parser.add_argument('--event-path', default=os.getenv('GITHUB_EVENT_PATH'))
+    args = parser.parse_args(argv)
+
+    # 多倉庫模式的資料不只來自本倉庫，本倉庫的事件無法判斷
+    if os.getenv('DASHBOARD_REPOS') or os.getenv('DASHBOARD_OWNER'):
+        skip, reason = False, "多倉庫模式需要完整檢查"
+    else:
+        snapshot = BranchSnapshot.load(args.snapshot) if args.snapshot else None
+        accept = name_filter(parse_patterns(os.getenv('DASHBOARD_INCLUDE')),
+                             parse_patterns(os.getenv('DASHBOARD_EXCLUDE')))
+        skip, reason = decide(
+            args.event_name, _load_event(args.event_path), snapshot, accept,
+            order=os.getenv('DASHBOARD_ORDER', 'recent'),
+            limit=int(os.getenv('DASHBOARD_LIMIT', '15')),
+        )
+
+    print(f"{'⏭️  略過' if skip else '▶️  執行'}: {reason}")
+    write_output(skip, reason, os.getenv('GITHUB_OUTPUT'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
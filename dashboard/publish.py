@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+"""
+Git Data API 發布
+=================
+不需要檢出倉庫，直接透過 Git Data API 更新 README：
+
+1. 讀取分支 HEAD 與其中的 README（以及要一併提交的檔案的 blob SHA）
+2. 在記憶體中拼接區段（dashboard.readme_sections.splice_sections）
+3. 以 HEAD 的樹為基礎建立新樹與提交
+4. 以非強制的 ref 更新把分支移到新提交（compare-and-swap）：期間有其他提交時
+   GitHub 回應 422，重新讀取新的 HEAD、重新拼接後再試
+
+兩個工作（分支儀表板與工具列表）寫的是 README 的不同區段，衝突時在新的 HEAD 上
+重新拼接即可保留對方的變更，不會像 git push 那樣整次失敗。
+"""
+
+import base64
+import hashlib
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from dashboard.graphql import GITHUB_API_URL
+from dashboard.readme_sections import Section, splice_sections
+
+# ref 更新衝突時最多重試的次數
+DEFAULT_RETRIES = 5
+
+# 重試的退避基準（秒），每次加倍並加上隨機抖動
+BACKOFF_SECONDS = 0.5
+
+# ref 不是快轉更新（422）或同時有其他更新（409）
+_CONFLICT_STATUSES = (409, 422)
+
+_FILE_MODE = '100644'
+
+
+class PublishError(Exception):
+    """無法讀取目標分支，或重試用完仍無法更新 ref"""
+
+
+def git_blob_sha(data: bytes) -> str:
+    """
+    計算內容的 Git blob SHA，與遠端的 blob SHA 比對即可得知檔案是否變更
+
+    Args:
+        data (bytes): 檔案內容
+
+    Returns:
+        str: 40 字元的十六進位 SHA-1
+    """
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def join_section(content: Section) -> str:
+    """把區段內容（字串或片段迭代器）組成字串；衝突重試時需要重複使用"""
+    return content if isinstance(content, str) else ''.join(content)
+
+
+class GitDataPublisher:
+    """
+    透過 Git Data API 把 README 區段與附帶檔案提交到分支
+
+    Attributes:
+        repo_name (str): 倉庫名稱，格式為 'owner/repo'
+        branch (Optional[str]): 目標分支，None 表示倉庫的預設分支
+        retries (int): ref 更新衝突時的重試次數
+        attempts (int): 最近一次 publish 發出的 ref 更新次數
+    """
+
+    def __init__(self, token: str, repo_name: str, branch: Optional[str] = None,
+                 base_url: str = GITHUB_API_URL, retries: int = DEFAULT_RETRIES,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            token (str): 具有 contents: write 權限的 token
+            repo_name (str): 倉庫名稱，格式為 'owner/repo'
+            branch (str): 目標分支，None 表示倉庫的預設分支
+            base_url (str): GitHub API 基礎網址（Enterprise 或本地測試伺服器）
+            retries (int): ref 更新衝突時的重試次數
+            sleep (Callable): 退避等待函數
+        """
+        self.token = token
+        self.repo_name = repo_name
+        self.branch = branch
+        self.base_url = base_url
+        self.retries = max(0, retries)
+        self.attempts = 0
+        self._sleep = sleep
+        self._repo = None
+
+    @property
+    def repo(self):
+        """延遲建立的 PyGithub 倉庫物件（lazy，不發送請求）"""
+        if self._repo is None:
+            # PyGithub 在需要時才導入
+            from github import Github
+
+            github = Github(self.token, base_url=self.base_url, per_page=100, seconds_between_requests=None)
+            self._repo = github.get_repo(self.repo_name, lazy=True)
+        return self._repo
+
+    def _target_branch(self) -> str:
+        if self.branch is None:
+            self.branch = self.repo.default_branch
+        return self.branch
+
+    def _read(self, path: str, ref: str):
+        """
+        讀取 ref 上的檔案
+
+        Returns:
+            ContentFile 或 None（檔案不存在）
+        """
+        from github import GithubException
+
+        try:
+            return self.repo.get_contents(path, ref=ref)
+        except GithubException as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def _bytes(self, content) -> bytes:
+        """取出檔案內容；超過 1 MB 的檔案內容 API 不附內容，改讀 blob"""
+        if content.encoding == 'base64' and content.content is not None:
+            return content.decoded_content
+        return base64.b64decode(self.repo.get_git_blob(content.sha).content)
+
+    def read_file(self, path: str) -> Optional[bytes]:
+        """
+        讀取目標分支上的檔案（例如在沒有檢出的工作中取得上次提交的指標歷史）
+
+        Args:
+            path (str): 倉庫中的路徑
+
+        Returns:
+            Optional[bytes]: 檔案內容，不存在時返回 None
+
+        Raises:
+            PublishError: 讀取失敗
+        """
+        from github import GithubException
+
+        try:
+            content = self._read(path, self._target_branch())
+            return None if content is None else self._bytes(content)
+        except GithubException as e:
+            raise PublishError(f"{self.repo_name}@{self.branch}: 無法讀取 {path}（{e.status}）") from e
+
+    def download(self, path: str, dest: Optional[str] = None) -> bool:
+        """
+        把目標分支上的檔案原子寫入本地（暫存檔 + 改名）
+
+        Args:
+            path (str): 倉庫中的路徑
+            dest (str): 本地路徑，默認與 path 相同
+
+        Returns:
+            bool: 遠端有此檔案並已寫入返回 True
+
+        Raises:
+            PublishError: 讀取失敗
+        """
+        data = self.read_file(path)
+        if data is None:
+            return False
+        dest = dest or path
+        directory = os.path.dirname(os.path.abspath(dest))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return True
+
+    def _tree_elements(self, head: str, sections: Dict[str, Dict[str, str]],
+                       files: Dict[str, bytes], deletions: List[str], uploaded: Set[str]) -> List:
+        """
+        在 head 上拼接區段並比對附帶檔案，返回有變更的樹項目
+
+        blob 以內容定址，已上傳過的（uploaded，前一次嘗試）直接引用其 SHA。
+        要刪除的檔案在 head 中已不存在時略過（刪除不存在的路徑會被 API 拒絕）。
+        """
+        from github import InputGitTreeElement
+
+        elements = []
+        for path, updates in sections.items():
+            content = self._read(path, head)
+            if content is None:
+                raise PublishError(f"{self.repo_name}@{self.branch} 中找不到 {path}")
+            text = self._bytes(content).decode('utf-8')
+            updated = splice_sections(text, updates)
+            if updated != text:
+                elements.append(InputGitTreeElement(path, _FILE_MODE, 'blob', content=updated))
+        for path, data in files.items():
+            sha = git_blob_sha(data)
+            content = self._read(path, head)
+            if content is not None and content.sha == sha:
+                continue
+            if sha not in uploaded:
+                # 二進位檔案先以 base64 建立 blob，樹項目只引用其 SHA
+                sha = self.repo.create_git_blob(base64.b64encode(data).decode('ascii'), 'base64').sha
+                uploaded.add(sha)
+            elements.append(InputGitTreeElement(path, _FILE_MODE, 'blob', sha=sha))
+        for path in deletions:
+            if path not in files and self._read(path, head) is not None:
+                # sha 為 null 的樹項目即從基礎樹中刪除該路徑
+                elements.append(InputGitTreeElement(path, _FILE_MODE, 'blob', sha=None))
+        return elements
+
+    def publish(self, sections: Dict[str, Dict[str, Section]],
+                files: Optional[Dict[str, bytes]] = None,
+                message: str = 'Update README', deletions: Iterable[str] = ()) -> Optional[str]:
+        """
+        把區段與附帶檔案提交到目標分支
+
+        每次嘗試都在最新的 HEAD 上重新拼接；區段內容為片段迭代器時先組成字串。
+
+        Args:
+            sections (Dict[str, Dict[str, Section]]): 檔案路徑 -> {區段名稱: 新內容}
+            files (Dict[str, bytes]): 要一併提交的檔案（路徑 -> 內容），與遠端相同的略過
+            message (str): 提交訊息
+            deletions (Iterable[str]): 要從分支中刪除的檔案（例如不再引用的舊徽章），已不存在的略過
+
+        Returns:
+            Optional[str]: 新提交的 SHA；沒有任何變更時返回 None
+
+        Raises:
+            PublishError: 讀取失敗、README 不存在或重試用完
+            SectionError: README 中缺少區段標記
+        """
+        from github import GithubException
+
+        sections = {path: {name: join_section(value) for name, value in updates.items()}
+                    for path, updates in sections.items()}
+        files = files or {}
+        deletions = sorted(set(deletions))
+        uploaded: Set[str] = set()
+        self.attempts = 0
+        try:
+            branch = self._target_branch()
+            for attempt in range(self.retries + 1):
+                ref = self.repo.get_git_ref(f'heads/{branch}')
+                head = self.repo.get_git_commit(ref.object.sha)
+                elements = self._tree_elements(head.sha, sections, files, deletions, uploaded)
+                if not elements:
+                    return None
+                tree = self.repo.create_git_tree(elements, base_tree=head.tree)
+                commit = self.repo.create_git_commit(message, tree, [head])
+                self.attempts += 1
+                try:
+                    # 非強制更新：HEAD 已被其他提交移動時不是快轉，GitHub 拒絕
+                    ref.edit(commit.sha, force=False)
+                    return commit.sha
+                except GithubException as e:
+                    if e.status not in _CONFLICT_STATUSES or attempt == self.retries:
+                        raise
+                self._sleep(random.uniform(0, BACKOFF_SECONDS * (2 ** attempt)))
+        except GithubException as e:
+            detail = e.data.get('message', '') if isinstance(e.data, dict) else str(e.data)
+            raise PublishError(f"{self.repo_name}@{self.branch}: {e.status} {detail}"
+                               f"（ref 更新嘗試 {self.attempts} 次）") from e
+        raise PublishError(f"{self.repo_name}@{self.branch}: 重試用完")
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+"""
+README 區段引擎
+===============
+一次讀取 README、一次掃描所有標記、一次拼接所有區段，最後以暫存檔 + 改名原子寫入。
+帶有資料雜湊（dashboard.change_detect）的區段，資料未變時保留原內容。
+區段內容也可以是字串片段的迭代器（dashboard.render 的輸出），直接串流寫入暫存檔。
+
+支援兩種標記格式：
+    <!-- BRANCH_ACTIVITY:START --> ... <!-- BRANCH_ACTIVITY:END -->   （區塊，內容前後換行）
+    <!--TIMESTAMP_START-->...<!--TIMESTAMP_END-->                     （行內，內容直接嵌入）
+
+命令列用法：
+    python -m dashboard.readme_sections [--readme README.md] [--allow-missing] NAME=VALUE [NAME=@檔案] ...
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from dashboard.change_detect import extract_hash, same_data
+
+MARKER_PATTERN = re.compile(r'<!--\s*([A-Z][A-Z0-9_]*?)([:_])(START|END)\s*-->')
+
+# 區段內容：完整字串，或依序輸出的字串片段
+Section = Union[str, Iterable[str]]
+
+# 串流區段只保留結尾這麼多字元，用來取出資料雜湊
+_TAIL = 64
+
+
+class SectionError(Exception):
+    """README 中缺少區段標記或標記不成對"""
+
+
+def index_sections(text: str) -> Dict[str, Tuple[int, int, bool]]:
+    """
+    掃描一次文本，建立所有區段的位置索引
+
+    Args:
+        text (str): README 內容
+
+    Returns:
+        Dict[str, Tuple[int, int, bool]]: 區段名稱 -> (內容起點, 內容終點, 是否為行內格式)
+    """
+    sections = {}
+    open_markers = {}
+    for match in MARKER_PATTERN.finditer(text):
+        name, separator, kind = match.groups()
+        if kind == 'START':
+            open_markers.setdefault(name, match)
+        elif name in open_markers and name not in sections:
+            start = open_markers.pop(name)
+            sections[name] = (start.end(), match.start(), separator == '_')
+    return sections
+
+
+def splice_sections(text: str, sections: Dict[str, str]) -> str:
+    """
+    在記憶體中一次替換多個區段
+
+    Args:
+        text (str): README 內容
+        sections (Dict[str, str]): 區段名稱 -> 新內容
+
+    Returns:
+        str: 替換後的內容
+
+    Raises:
+        SectionError: 任一區段找不到成對的標記
+    """
+    index = index_sections(text)
+    missing = [name for name in sections if name not in index]
+    if missing:
+        raise SectionError(f"README 中找不到標記: {', '.join(missing)}")
+
+    parts = []
+    position = 0
+    for name in sorted(sections, key=lambda n: index[n][0]):
+        start, end, inline = index[name]
+        parts.append(text[position:start])
+        if same_data(text[start:end], sections[name]):
+            # 只有時間戳記不同：保留舊區段
+            parts.append(text[start:end])
+        else:
+            parts.append(sections[name] if inline else f'\n{sections[name]}\n')
+        position = end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+
+def _write_temp(path: str, chunks: Iterable[str]) -> str:
+    """把片段依序寫入與 path 同目錄的暫存檔，返回暫存檔路徑"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.readme-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def _commit(tmp_path: str, path: str) -> None:
+    """以暫存檔取代 path（保留原檔案的權限）"""
+    try:
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_atomic(path: str, content: Section) -> None:
+    """
+    以暫存檔 + 改名的方式寫入，讀者不會看到寫到一半的檔案
+
+    Args:
+        path (str): 目標檔案
+        content (Section): 檔案內容，或依序寫入的字串片段
+    """
+    _commit(_write_temp(path, (content,) if isinstance(content, str) else content), path)
+
+
+class _SpliceState:
+    """串流拼接的結果：是否有變更，以及資料未變、需要換回舊內容的區段位置"""
+
+    def __init__(self):
+        self.changed = False
+        self.offset = 0
+        self.restore: List[Tuple[int, int, str]] = []
+
+
+def _stream_section(old: str, chunks: Iterable[str], state: _SpliceState) -> Iterator[str]:
+    """輸出串流區段，同時逐段與舊內容比對並保留結尾以取出資料雜湊"""
+    begin = state.offset
+    position = 0
+    identical = True
+    tail = ''
+    for chunk in chunks:
+        if identical:
+            identical = old.startswith(chunk, position)
+        position += len(chunk)
+        tail = (tail + chunk)[-_TAIL:]
+        state.offset += len(chunk)
+        yield chunk
+    if identical and position == len(old):
+        return
+    new_hash = extract_hash(tail)
+    if new_hash is not None and new_hash == extract_hash(old):
+        # 只有時間戳記不同：若其他區段有變更，寫入後換回舊區段
+        state.restore.append((begin, state.offset, old))
+    else:
+        state.changed = True
+
+
+def _splice_chunks(text: str, sections: Dict[str, Section], state: _SpliceState) -> Iterator[str]:
+    """splice_sections 的串流版本，片段依序組成替換後的內容"""
+    index = index_sections(text)
+    missing = [name for name in sections if name not in index]
+    if missing:
+        raise SectionError(f"README 中找不到標記: {', '.join(missing)}")
+
+    def emit(piece: str) -> str:
+        state.offset += len(piece)
+        return piece
+
+    position = 0
+    for name in sorted(sections, key=lambda n: index[n][0]):
+        start, end, inline = index[name]
+        yield emit(text[position:start])
+        old, value = text[start:end], sections[name]
+        if isinstance(value, str):
+            if same_data(old, value):
+                new = old
+            else:
+                new = value if inline else f'\n{value}\n'
+                state.changed = state.changed or new != old
+            yield emit(new)
+        else:
+            chunks = value if inline else _framed(value)
+            yield from _stream_section(old, chunks, state)
+        position = end
+    yield emit(text[position:])
+
+
+def _framed(chunks: Iterable[str]) -> Iterator[str]:
+    # 區塊格式的內容前後各一個換行
+    yield '\n'
+    yield from chunks
+    yield '\n'
+
+
+def update_sections(readme_path: str, sections: Dict[str, Section]) -> bool:
+    """
+    讀取 README、替換所有指定區段並原子寫回
+
+    區段內容為片段迭代器時，邊渲染邊寫入暫存檔，不需先組出完整的區段字串；
+    寫完後才知道是否有變更，沒有變更時丟棄暫存檔。
+
+    Args:
+        readme_path (str): README 文件路徑
+        sections (Dict[str, Section]): 區段名稱 -> 新內容（字串或片段迭代器）
+
+    Returns:
+        bool: 內容有變更並已寫入時返回 True，沒有變更返回 False
+
+    Raises:
+        FileNotFoundError: README 不存在
+        SectionError: 缺少區段標記
+    """
+    with open(readme_path, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
+
+    if all(isinstance(value, str) for value in sections.values()):
+        updated = splice_sections(content, sections)
+        if updated == content:
+            return False
+        write_atomic(readme_path, updated)
+        return True
+
+    state = _SpliceState()
+    tmp_path = _write_temp(readme_path, _splice_chunks(content, sections, state))
+    if not state.changed:
+        os.unlink(tmp_path)
+        return False
+    if state.restore:
+        # 少見的情況：部分串流區段只有時間戳記不同，換回舊內容後重寫
+        with open(tmp_path, 'r', encoding='utf-8', newline='') as f:
+            updated = f.read()
+        for begin, end, old in reversed(state.restore):
+            updated = updated[:begin] + old + updated[end:]
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(updated)
+    _commit(tmp_path, readme_path)
+    return True
+
+
+def main(argv=None) -> int:
+    """命令列入口：一次更新多個區段"""
+    parser = argparse.ArgumentParser(description='一次更新 README 中的多個標記區段')
+    parser.add_argument('--readme', default='README.md', help='README 文件路徑')
+    parser.add_argument('sections', nargs='+', metavar='NAME=VALUE',
+                        help='區段名稱與內容；VALUE 以 @ 開頭時從該檔案讀取')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='README 中沒有標記的區段只顯示警告並略過，不視為錯誤')
+    args = parser.parse_args(argv)
+
+    sections = {}
+    for item in args.sections:
+        name, separator, value = item.partition('=')
+        if not separator:
+            parser.error(f"格式錯誤（應為 NAME=VALUE）: {item}")
+        if value.startswith('@'):
+            with open(value[1:], 'r', encoding='utf-8') as f:
+                value = f.read().rstrip('\n')
+        sections[name] = value
+
+    try:
+        if args.allow_missing:
+            with open(args.readme, 'r', encoding='utf-8', newline='') as f:
+                present = index_sections(f.read())
+            missing = [name for name in sections if name not in present]
+            if missing:
+                print(f"⚠️  警告: README 中找不到標記，略過: {', '.join(missing)}")
+                sections = {name: value for name, value in sections.items() if name in present}
+            if not sections:
+                return 0
+        changed = update_sections(args.readme, sections)
+    except (OSError, SectionError) as e:
+        print(f"❌ 錯誤: {e}")
+        return 1
+
+    if changed:
+        print(f"✅ {args.readme} 已更新: {', '.join(sections)}")
+    else:
+        print("ℹ️  內容沒有變更，無需更新")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
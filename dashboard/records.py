@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+精簡的分支資料列
+================
+每個分支一個 __slots__ 物件，取代每列七個字串鍵的 dict：
+沒有每個實例的 __dict__，重複出現的作者名稱與日期字串以 sys.intern 共用同一份。
+
+為了讓既有程式碼（快照、多倉庫模式、表格渲染）不需改寫，
+BranchRecord 也支援 dict 式的 record['name']、record.get()、'status' in record
+與 dict(record)；未設定的選填欄位（ahead/behind/status 等）視為不存在的鍵。
+"""
+
+import sys
+from typing import Dict, Iterator, Optional
+
+# 一定存在的欄位（與 _build_branch_info 過去返回的 dict 鍵相同）
+REQUIRED_FIELDS = ('name', 'title', 'author', 'date', 'url', 'sha', 'timestamp')
+
+# 之後才附加的欄位：annotate_branch_metrics 的結果與多倉庫模式的倉庫名稱
+OPTIONAL_FIELDS = ('ahead', 'behind', 'age_days', 'status', 'repo')
+
+_UNSET = object()
+
+
+class BranchRecord:
+    """
+    單一分支的顯示資料
+
+    Attributes:
+        name (str): 分支名稱
+        title (str): 已截斷的提交標題（渲染時依輸出格式轉義）
+        author (str): 已截斷的作者名稱（interned）
+        date (str): 作者日期 YYYY-MM-DD（interned）
+        url (str): 提交連結
+        sha (str): 7 位短 SHA
+        timestamp (str): UTC 提交時間 ISO 8601 字串，可直接以字串比較先後
+    """
+
+    __slots__ = REQUIRED_FIELDS + OPTIONAL_FIELDS
+
+    def __init__(self, name: str, title: str, author: str, date: str, url: str, sha: str,
+                 timestamp: str, **optional):
+        self.name = name
+        self.title = title
+        self.author = sys.intern(author)
+        self.date = sys.intern(date)
+        self.url = url
+        self.sha = sha
+        self.timestamp = timestamp
+        for field in OPTIONAL_FIELDS:
+            setattr(self, field, optional.pop(field, _UNSET))
+        if optional:
+            raise TypeError(f"未知的欄位: {', '.join(optional)}")
+
+    @classmethod
+    def from_dict(cls, row: Dict) -> 'BranchRecord':
+        """由快照中的 dict 還原（忽略不認識的鍵）"""
+        return cls(**{field: row[field] for field in REQUIRED_FIELDS + OPTIONAL_FIELDS if field in row})
+
+    # ---- dict 相容介面 ----
+
+    def keys(self) -> Iterator[str]:
+        """已設定的欄位名稱（讓 dict(record) 可用）"""
+        for field in self.__slots__:
+            if getattr(self, field) is not _UNSET:
+                yield field
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.__slots__ and getattr(self, field) is not _UNSET
+
+    def __getitem__(self, field: str):
+        value = getattr(self, field, _UNSET) if field in self.__slots__ else _UNSET
+        if value is _UNSET:
+            raise KeyError(field)
+        return value
+
+    def __setitem__(self, field: str, value) -> None:
+        if field not in self.__slots__:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def get(self, field: str, default: Optional[object] = None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def update(self, **fields) -> None:
+        for field, value in fields.items():
+            self[field] = value
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (BranchRecord, dict)):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BranchRecord({dict(self)!r})"
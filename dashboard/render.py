@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+
+"""
+表格渲染
+========
+分支儀表板與工具網格共用的渲染器：
+
+- 轉義以預先建好的 str.translate 對照表一次完成，不逐字元 replace。
+- 每一行/每個儲存格都是預先綁定的 str.format 模板，不在迴圈中重組字串。
+- 輸出為字串片段的迭代器，''.join() 即完整內容，也可以直接串流寫入 README
+  （見 dashboard.readme_sections.update_sections）。
+
+同一組資料可以輸出為 'markdown'（表格）、'html'（表格/網格）或 'json'。
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from dashboard.records import BranchRecord
+
+# 支援的輸出格式
+FORMATS = ('markdown', 'html', 'json')
+
+# 需要以反斜線轉義的 Markdown 字元
+MARKDOWN_SPECIAL = '\\`*_{}[]()#+-.!|'
+
+_MARKDOWN_ESCAPES = str.maketrans({char: '\\' + char for char in MARKDOWN_SPECIAL})
+_HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+_DISPLAY_NAME = str.maketrans('-_', '  ')
+
+
+def escape_markdown(text: str) -> str:
+    """
+    轉義 Markdown 特殊字符
+
+    Args:
+        text (str): 原始文本
+
+    Returns:
+        str: 轉義後的文本
+    """
+    return text.translate(_MARKDOWN_ESCAPES)
+
+
+def escape_html(text: str) -> str:
+    """轉義 HTML 特殊字符（含引號，可用於屬性值）"""
+    return text.translate(_HTML_ESCAPES)
+
+
+def check_format(fmt: str) -> str:
+    """
+    驗證輸出格式
+
+    Raises:
+        ValueError: 未知的格式
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"未知的輸出格式: {fmt}，可用: {', '.join(FORMATS)}")
+    return fmt
+
+
+def _json_array(items: Iterable[Dict]) -> Iterator[str]:
+    """逐項輸出 JSON 陣列（每項一行）"""
+    empty = True
+    for item in items:
+        yield ('[\n  ' if empty else ',\n  ') + json.dumps(item, ensure_ascii=False)
+        empty = False
+    yield '[]' if empty else '\n]'
+
+
+# ---- 分支表格 ----
+
+def format_ahead_behind(branch: BranchRecord) -> str:
+    """ahead/behind 欄位：'+3 / -12'，無法計算或預設分支本身為 '—'"""
+    if branch.get('ahead') is None or branch.get('status') == 'default':
+        return "—"
+    return f"+{branch['ahead']} / -{branch['behind']}"
+
+
+def format_status(branch: BranchRecord) -> str:
+    """狀態欄位"""
+    status = branch.get('status')
+    if status == 'default':
+        return "⭐ Default"
+    if status == 'merged':
+        return "✅ Merged"
+    if status == 'stale':
+        return f"💤 Stale ({branch['age_days']}d)"
+    return "🟢 Active"
+
+
+_BRANCH_COLUMNS = ('🌿 Branch', '📝 Latest Commit', '👤 Author', '⏰ Time')
+_METRIC_COLUMNS = ('↕️ Ahead / Behind', '🚦 Status')
+_REPO_COLUMN = ('📦 Repository',)
+_LINK_COLUMN = ('🔗 Link',)
+
+# Markdown 分隔行沿用原本的寬度
+_MD_RULES = {
+    '🌿 Branch': '-----------', '📝 Latest Commit': '------------------', '👤 Author': '-----------',
+    '⏰ Time': '---------', '↕️ Ahead / Behind': '------------------', '🚦 Status': '-----------',
+    '📦 Repository': '---------------', '🔗 Link': '---------',
+}
+
+_MD_BRANCH_ROW = "\n| {repo}`{name}` | {title} | {author} | {date} | {metrics}[`{sha}`]({url}) |".format
+_MD_METRICS = "{0} | {1} | ".format
+_HTML_BRANCH_ROW = ("\n<tr>{repo}<td><code>{name}</code></td><td>{title}</td><td>{author}</td>"
+                    "<td>{date}</td>{metrics}<td><a href=\"{url}\"><code>{sha}</code></a></td></tr>").format
+_HTML_METRICS = "<td>{0}</td><td>{1}</td>".format
+_HTML_REPO = "<td><a href=\"{1}\">{0}</a></td>".format
+
+
+def _columns(metrics: bool, repo: bool):
+    return (_REPO_COLUMN if repo else ()) + _BRANCH_COLUMNS + (_METRIC_COLUMNS if metrics else ()) + _LINK_COLUMN
+
+
+def _repo_cells(branches: Iterable[BranchRecord], grouped: bool):
+    """產生 (倉庫名稱或 None, 倉庫網址, 分支)；分組排列時同一倉庫只在第一行有名稱"""
+    previous = None
+    for branch in branches:
+        repo = branch['repo']
+        shown = None if grouped and repo == previous else repo
+        previous = repo
+        yield shown, branch['url'].split('/commit/')[0], branch
+
+
+def branch_table(branches: Iterable[BranchRecord], fmt: str = 'markdown', metrics: bool = False,
+                 repo_column: bool = False, grouped: bool = False) -> Iterator[str]:
+    """
+    逐段渲染分支表格
+
+    Args:
+        branches (Iterable[BranchRecord]): 分支資料列
+        fmt (str): 'markdown'、'html' 或 'json'
+        metrics (bool): 是否加上 ahead/behind 與狀態欄（annotate_branch_metrics 的結果）
+        repo_column (bool): 是否加上倉庫欄（多倉庫模式，資料列需有 repo）
+        grouped (bool): 倉庫欄是否只在每組第一行顯示名稱
+
+    Yields:
+        str: 輸出片段，''.join() 即完整表格
+    """
+    check_format(fmt)
+    if fmt == 'json':
+        yield from _json_array(dict(branch) for branch in branches)
+        return
+
+    columns = _columns(metrics, repo_column)
+    rows = _repo_cells(branches, grouped) if repo_column else ((None, None, branch) for branch in branches)
+
+    if fmt == 'html':
+        yield '<table>\n<tr>' + ''.join(f"<th>{column}</th>" for column in columns) + '</tr>'
+        for repo, repo_url, branch in rows:
+            yield _HTML_BRANCH_ROW(
+                repo='' if not repo_column else
+                _HTML_REPO(escape_html(repo), repo_url) if repo is not None else '<td></td>',
+                name=escape_html(branch['name']),
+                title=escape_html(branch['title']),
+                author=escape_html(branch['author']),
+                date=branch['date'],
+                metrics=_HTML_METRICS(format_ahead_behind(branch), format_status(branch)) if metrics else '',
+                url=escape_html(branch['url']),
+                sha=branch['sha'],
+            )
+        yield '\n</table>'
+        return
+
+    yield '| ' + ' | '.join(columns) + ' |\n|' + '|'.join(_MD_RULES[column] for column in columns) + '|'
+    for repo, repo_url, branch in rows:
+        yield _MD_BRANCH_ROW(
+            repo='' if not repo_column else f"[{repo}]({repo_url}) | " if repo is not None else ' | ',
+            name=branch['name'],
+            title=escape_markdown(branch['title']),
+            author=branch['author'],
+            date=branch['date'],
+            metrics=_MD_METRICS(format_ahead_behind(branch), format_status(branch)) if metrics else '',
+            sha=branch['sha'],
+            url=branch['url'],
+        )
+
+
+# ---- 工具網格 ----
+
+# 網格每行的工具數（儲存格寬度 33%）
+TOOLS_PER_ROW = 3
+
+# 儲存格與空列表提示中的圖片；dashboard.badges 可換成倉庫內以內容雜湊命名的 SVG
+TOOL_IMAGES = {
+    'icon': 'https://img.icons8.com/fluency/96/000000/code.png',
+    'use': 'https://img.shields.io/badge/🚀_立即使用-4CAF50?style=for-the-badge',
+    'source': 'https://img.shields.io/badge/📦_源碼-2196F3?style=for-the-badge',
+    'suggest': 'https://img.shields.io/badge/💡_提交建議-9C27B0?style=for-the-badge',
+}
+
+_TOOL_CELL = """
+<td align="center" width="33%">
+
+### 🔧 {name}
+
+<img src="{icon}" width="80px" />
+
+{description}{files}{topics}
+
+[![使用工具]({use})]({url})
+[![查看源碼]({source})]({repo_url})
+
+⭐ {stars} | 🍴 {forks} | 💻 {language}{payload}
+
+📅 更新: {updated}
+
+</td>
+""".format
+_EMPTY_CELL = '\n<td width="33%"></td>'
+
+_MD_TOOL_HEADER = ("| 🔧 Tool | 📝 Description | ⭐ Stars | 🍴 Forks | 💻 Language | 📅 Updated | 🔗 Links |\n"
+                   "|---------|----------------|----------|----------|-------------|------------|----------|")
+_MD_TOOL_ROW = ("\n| **{name}** | {description} | {stars} | {forks} | {language} | {updated} | "
+                "[🚀 使用]({url}) · [📦 源碼]({repo_url}) |").format
+
+_STATS = "\n\n**📊 統計**: {0} 個工具 | ⭐ {1} Stars | 🍴 {2} Forks".format
+
+_EMPTY_TOOLS = """
+<table>
+<tr>
+<td align="center">
+
+### 🔧 暫無工具
+
+目前還沒有可用的工具，敬請期待！
+
+[![提交建議]({suggest})](https://github.com/abc214315/abc214315/issues)
+
+</td>
+</tr>
+</table>
+""".format
+
+
+def empty_tools_html(images: Optional[Dict[str, str]] = None) -> str:
+    """沒有工具時的 HTML 提示（images 同 tools_grid）"""
+    return _EMPTY_TOOLS(**(images or TOOL_IMAGES))
+
+
+EMPTY_TOOLS_HTML = empty_tools_html()
+
+
+def format_size(size: int) -> str:
+    """位元組數轉為 '86.1 KB' 形式"""
+    if size < 1024:
+        return f"{size} B"
+    return f"{size / 1024:.1f} KB"
+
+
+def format_payload(payload: Optional[Dict]) -> str:
+    """
+    工具儲存格的載入量：' | 📦 84.1 KB → 9.7 KB'（原始大小 → 最小的預壓縮版本）
+
+    Args:
+        payload (Dict): dashboard.html_build.payload_sizes 的結果，沒有建置時為 None
+
+    Returns:
+        str: 接在語言之後的文字，沒有建置資料時為空字串
+    """
+    if not payload:
+        return ''
+    transfer = payload['brotli'] if payload.get('brotli') is not None else payload['gzip']
+    return f" | 📦 {format_size(payload['source'])} → {format_size(transfer)}"
+
+
+def tool_display_name(name: str) -> str:
+    """倉庫名稱轉為顯示名稱：'-'、'_' 換成空白並轉為標題大小寫"""
+    return name.translate(_DISPLAY_NAME).title()
+
+
+def _code_list(items) -> str:
+    # 最多顯示 3 個，每個以行內程式碼呈現
+    return '`' + '` `'.join(items[:3]) + '`'
+
+
+def tools_grid(tools: Iterable[Dict], fmt: str = 'html',
+               totals: Optional[Dict[str, int]] = None,
+               images: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """
+    逐段渲染工具列表（不含空列表提示與頁尾）
+
+    Args:
+        tools (Iterable[Dict]): update_tools 的工具資訊
+        fmt (str): 'html'（每行 TOOLS_PER_ROW 個的網格）、'markdown'（表格）或 'json'
+        totals (Dict[str, int]): 傳入時累加 count、stars、forks（供統計行使用）
+        images (Dict[str, str]): 網格中圖片的網址（鍵同 TOOL_IMAGES），默認為外部服務
+
+    Yields:
+        str: 輸出片段
+    """
+    check_format(fmt)
+    if totals is None:
+        totals = {}
+    totals.update(count=0, stars=0, forks=0)
+
+    def counted():
+        for tool in tools:
+            totals['count'] += 1
+            totals['stars'] += tool['stars']
+            totals['forks'] += tool['forks']
+            yield tool
+
+    if fmt == 'json':
+        yield from _json_array(counted())
+        return
+
+    if fmt == 'markdown':
+        yield _MD_TOOL_HEADER
+        for tool in counted():
+            yield _MD_TOOL_ROW(
+                name=escape_markdown(tool_display_name(tool['name'])),
+                description=escape_markdown(tool['description']),
+                stars=tool['stars'], forks=tool['forks'], language=tool['language'],
+                updated=tool['updated'], url=tool['url'], repo_url=tool['repo_url'],
+            )
+        return
+
+    images = images or TOOL_IMAGES
+    yield "\n<table>"
+    in_row = 0
+    for tool in counted():
+        if in_row == 0:
+            yield "\n<tr>"
+        yield '\n' + _TOOL_CELL(
+            icon=images['icon'], use=images['use'], source=images['source'],
+            name=tool_display_name(tool['name']),
+            description=tool['description'],
+            files=f"\n\n**📄 文件**: {_code_list(tool['files'])}" if tool['files'] else '',
+            topics=f"\n\n{_code_list(tool['topics'])}" if tool['topics'] else '',
+            url=tool['url'], repo_url=tool['repo_url'],
+            stars=tool['stars'], forks=tool['forks'], language=tool['language'], updated=tool['updated'],
+            payload=format_payload(tool.get('payload')),
+        )
+        in_row += 1
+        if in_row == TOOLS_PER_ROW:
+            yield "\n</tr>"
+            in_row = 0
+    if in_row:
+        # 該行不足 TOOLS_PER_ROW 個時填充空單元格
+        yield _EMPTY_CELL * (TOOLS_PER_ROW - in_row) + "\n</tr>"
+    yield "\n</table>\n"
+
+
+def tools_stats(totals: Dict[str, int]) -> str:
+    """工具統計行（tools_grid 輸出完畢後的 totals）"""
+    return _STATS(totals['count'], totals['stars'], totals['forks'])
+
+
+# ---- 趨勢 ----
+
+SPARK_TICKS = '▁▂▃▄▅▆▇█'
+
+# sparkline 最多顯示的點數
+SPARK_POINTS = 12
+
+
+def sparkline(values: List[int]) -> str:
+    """
+    以方塊字元畫出數值序列（全部相同時為一條平線）
+
+    Args:
+        values (List[int]): 由舊到新的數值
+
+    Returns:
+        str: 每個數值一個字元
+    """
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    span = high - low or 1
+    scale = len(SPARK_TICKS) - 1
+    return ''.join(SPARK_TICKS[(value - low) * scale // span] for value in values)
+
+
+def trend(label: str, values: List[int]) -> Optional[str]:
+    """
+    趨勢儲存格：'⭐ ▁▃▅█ (+12)'
+
+    Args:
+        label (str): 指標名稱
+        values (List[int]): 由舊到新的數值（MetricsHistory.values 的結果）
+
+    Returns:
+        Optional[str]: 少於兩個數值時為 None
+    """
+    if len(values) < 2:
+        return None
+    return f"{label} {sparkline(values)} ({values[-1] - values[0]:+d})"
+
+
+def trend_line(title: str, cells: Iterable[Optional[str]]) -> str:
+    """
+    組合趨勢行，沒有任何趨勢時為空字串
+
+    Args:
+        title (str): 行首標題
+        cells (Iterable[Optional[str]]): trend() 的結果
+    """
+    cells = [cell for cell in cells if cell]
+    return f"\n\n**📈 {title}**: " + ' | '.join(cells) if cells else ''
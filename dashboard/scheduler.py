@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+
+"""
+速率限制感知的請求排程器
+========================
+所有 GitHub 請求（共用 session 與非同步客戶端）在送出前向排程器取得名額，
+回應後回報狀態碼與標頭：
+
+- 並行視窗採 AIMD：每個成功回應把視窗加大 1/視窗（約每輪加 1），
+  遇到節流（429、次級速率限制的 403）時減半，最小為 min_concurrency。
+- 讀取 X-RateLimit-Remaining / X-RateLimit-Reset：額度見底時全體暫停到重置時間，
+  在途請求數也不超過剩餘額度。
+- 節流與暫時性錯誤（5xx、連線錯誤）以 Retry-After 或帶抖動的指數退避重試，
+  用完重試次數仍被節流時拋出 RateLimited，而不是讓呼叫端默默略過資料。
+- budget 為本次執行的硬性請求上限（含重試），用完拋出 BudgetExhausted。
+
+取代 PyGithub 固定每 0.25 秒一個請求的節流：沒有被限流時全速並行，
+被限流時才退讓。
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# 預設並行視窗上限
+DEFAULT_MAX_CONCURRENCY = 10
+
+# 預設重試次數（不含第一次請求）
+DEFAULT_MAX_RETRIES = 5
+
+# 視為暫時性錯誤、可以重試的狀態碼
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# 次級速率限制的 403 回應訊息特徵（與 PyGithub 的判斷一致）
+_SECONDARY_MARKERS = (b'secondary rate limit', b'retry your request again later', b'abuse detection')
+
+
+class SchedulerError(Exception):
+    """排程器無法完成請求"""
+
+
+class BudgetExhausted(SchedulerError):
+    """已達本次執行的請求預算上限"""
+
+
+class RateLimited(SchedulerError):
+    """重試次數用完仍被速率限制"""
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    value = headers.get(name) if headers is not None else None
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RequestScheduler:
+    """
+    AIMD 並行視窗 + 速率限制標頭 + 退避重試 + 請求預算
+
+    同時支援多執行緒（acquire/release）與 asyncio（acquire_async/release）
+    兩種呼叫端；狀態以同一把鎖保護。
+
+    Attributes:
+        window (float): 目前的並行視窗
+        attempts (int): 已發送的請求數（含重試）
+        retries (int): 重試次數
+        throttled (int): 被節流的回應數
+        failures (int): 重試用完仍失敗的請求數
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, min_concurrency: int = 1,
+                 budget: int = 0, max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = 1.0, max_delay: float = 60.0, reserve: int = 0,
+                 clock: Callable[[], float] = time.time):
+        """
+        初始化排程器
+
+        Args:
+            max_concurrency (int): 並行視窗上限
+            min_concurrency (int): 並行視窗下限
+            budget (int): 本次執行最多發送的請求數（含重試），0 表示不限制
+            max_retries (int): 單一請求的最多重試次數
+            base_delay (float): 指數退避的基礎秒數
+            max_delay (float): 單次等待的上限秒數
+            reserve (int): 保留給其他工作的速率限制額度，剩餘額度低於此值即暫停到重置
+            clock: 取得目前 epoch 秒數的函數（與 X-RateLimit-Reset 比較）
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.budget = budget
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reserve = reserve
+        self.clock = clock
+
+        self.window = float(self.max_concurrency)
+        self.in_flight = 0
+        self.attempts = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.waited = 0.0
+        self.min_window = self.window
+        self.rate_limits: Dict[str, Dict[str, int]] = {}
+
+        self._resume_at = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ---- 名額 ----
+
+    @property
+    def exhausted(self) -> bool:
+        """是否已用完請求預算"""
+        return bool(self.budget) and self.attempts >= self.budget
+
+    def _capacity(self) -> int:
+        """目前允許的在途請求數：並行視窗，且不超過剩餘額度"""
+        capacity = int(self.window)
+        for limit in self.rate_limits.values():
+            capacity = min(capacity, max(limit['remaining'] - self.reserve, 1))
+        return max(capacity, 1)
+
+    def _try_acquire(self) -> Optional[float]:
+        """
+        嘗試取得名額（需持有鎖）
+
+        Returns:
+            0 表示已取得；正數表示需要暫停的秒數；None 表示需等待其他請求完成
+        """
+        if self.exhausted:
+            raise BudgetExhausted(f"已達請求預算上限（{self.budget} 個請求）")
+        pause = self._resume_at - self.clock()
+        if pause > 0:
+            return pause
+        if self.in_flight >= self._capacity():
+            return None
+        self.in_flight += 1
+        self.attempts += 1
+        return 0
+
+    def acquire(self) -> None:
+        """取得名額（執行緒版本），視窗已滿或暫停中時阻塞"""
+        with self._released:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    return
+                self._released.wait(wait)
+
+    async def acquire_async(self) -> None:
+        """取得名額（asyncio 版本），視窗已滿或暫停中時讓出事件迴圈"""
+        while True:
+            with self._lock:
+                wait = self._try_acquire()
+                if wait == 0:
+                    return
+                if wait is None:
+                    if self._wakeup is None:
+                        self._wakeup = asyncio.Event()
+                    wakeup = self._wakeup
+            if wait is None:
+                await wakeup.wait()
+            else:
+                await asyncio.sleep(wait)
+
+    def release(self) -> None:
+        """歸還名額並喚醒等待中的請求"""
+        with self._released:
+            self.in_flight -= 1
+            self._released.notify_all()
+            wakeup, self._wakeup = self._wakeup, None
+        if wakeup is not None:
+            wakeup.set()
+
+    # ---- 回應 ----
+
+    def is_throttled(self, status: int, headers, body: bytes = b'') -> bool:
+        """判斷回應是否為速率限制（主要或次級）"""
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        if headers is not None and headers.get('Retry-After') is not None:
+            return True
+        if _header_int(headers, 'X-RateLimit-Remaining') == 0:
+            return True
+        lowered = (body or b'')[:512].lower()
+        return b'rate limit' in lowered or any(marker in lowered for marker in _SECONDARY_MARKERS)
+
+    def observe(self, status: int, headers, body: bytes = b'', attempt: int = 0) -> Optional[float]:
+        """
+        記錄一個回應並決定是否重試
+
+        Args:
+            status (int): HTTP 狀態碼
+            headers: 回應標頭（需支援不分大小寫的 get）
+            body (bytes): 回應內容開頭（判斷次級速率限制用）
+            attempt (int): 這是第幾次重試（第一次請求為 0）
+
+        Returns:
+            需要重試時返回等待秒數，否則返回 None
+
+        Raises:
+            RateLimited: 重試次數用完仍被節流
+        """
+        now = self.clock()
+        with self._lock:
+            self._observe_rate_limit(headers, now)
+            if self.is_throttled(status, headers, body):
+                self.throttled += 1
+                self._decrease(now)
+                delay = self._throttle_delay(headers, attempt, now)
+                # Retry-After 與重置時間適用於所有請求，全體一起暫停
+                self._resume_at = max(self._resume_at, now + delay)
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise RateLimited(f"重試 {attempt} 次後仍被速率限制（HTTP {status}）")
+            elif status in RETRY_STATUSES:
+                delay = self._backoff(attempt)
+            else:
+                if status < 400:
+                    self._increase()
+                return None
+            if attempt >= self.max_retries:
+                self.failures += 1
+                return None
+            self.retries += 1
+            self.waited += delay
+            return delay
+
+    def observe_error(self, attempt: int = 0) -> Optional[float]:
+        """
+        記錄一個連線錯誤或逾時，並決定是否重試
+
+        Returns:
+            需要重試時返回等待秒數，否則返回 None
+        """
+        with self._lock:
+            if attempt >= self.max_retries:
+                self.failures += 1
+                return None
+            delay = self._backoff(attempt)
+            self.retries += 1
+            self.waited += delay
+            return delay
+
+    def _observe_rate_limit(self, headers, now: float) -> None:
+        remaining = _header_int(headers, 'X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        reset = _header_int(headers, 'X-RateLimit-Reset') or 0
+        self.rate_limits[resource] = {'remaining': remaining, 'reset': reset}
+        if remaining <= self.reserve and reset > now:
+            # 額度見底：暫停到重置時間，但單次不超過 max_delay
+            self._resume_at = max(self._resume_at, min(float(reset), now + self.max_delay))
+
+    def _increase(self) -> None:
+        # 加性增加：每個成功回應 +1/視窗，約每一輪視窗 +1
+        self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+
+    def _decrease(self, now: float) -> None:
+        # 乘性減少：同一批在途請求一起被節流時只減半一次
+        if now - self._last_decrease < self.base_delay:
+            return
+        self._last_decrease = now
+        self.window = max(float(self.min_concurrency), self.window / 2)
+        self.min_window = min(self.min_window, self.window)
+
+    def _backoff(self, attempt: int) -> float:
+        # 全抖動指數退避：避免多個工作在同一時間一起重試
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _throttle_delay(self, headers, attempt: int, now: float) -> float:
+        retry_after = _header_int(headers, 'Retry-After')
+        if retry_after is not None:
+            return min(self.max_delay, max(retry_after, 0) + random.uniform(0, self.base_delay))
+        if _header_int(headers, 'X-RateLimit-Remaining') == 0:
+            reset = _header_int(headers, 'X-RateLimit-Reset') or 0
+            if reset > now:
+                return min(self.max_delay, reset - now + random.uniform(0, self.base_delay))
+        # 次級速率限制沒有給出等待時間時，至少等一分鐘（GitHub 文件建議）
+        return min(self.max_delay, max(60.0, self.base_delay * (2 ** attempt)))
+
+    # ---- 統計 ----
+
+    def stats(self) -> Dict:
+        """
+        返回排程統計
+
+        Returns:
+            Dict: attempts、retries、throttled、failures、waited_seconds、window、min_window
+        """
+        with self._lock:
+            return {
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'failures': self.failures,
+                'waited_seconds': round(self.waited, 3),
+                'window': round(self.window, 2),
+                'min_window': round(self.min_window, 2),
+                'budget': self.budget,
+            }
+
+
+_active: Optional[RequestScheduler] = None
+
+
+def active_scheduler() -> Optional[RequestScheduler]:
+    """返回目前安裝在共用 session 上的排程器（未安裝時為 None）"""
+    return _active
+
+
+def install_scheduler(scheduler: RequestScheduler) -> RequestScheduler:
+    """
+    讓共用 session 的所有請求經過排程器
+
+    需在建立 Github 物件前呼叫；之後建立的非同步客戶端默認也使用同一個排程器。
+    共用 session 的 adapter 不再自行重試，重試統一由排程器處理。
+
+    Args:
+        scheduler (RequestScheduler): 排程器
+
+    Returns:
+        RequestScheduler: 同一個排程器
+    """
+    global _active
+    from dashboard.transport import get_session, install_pygithub_transport, no_retry
+
+    _active = scheduler
+    session = get_session()
+    session.scheduler = scheduler
+    for adapter in session.adapters.values():
+        adapter.max_retries = no_retry()
+    install_pygithub_transport()
+    return scheduler
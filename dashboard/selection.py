@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+分支篩選與排序
+==============
+以名稱 glob 篩選分支，並以固定大小的堆積串流選出最近提交的 N 個分支，
+記憶體用量只與 N 有關，與分支總數無關
+"""
+
+import heapq
+from fnmatch import fnmatchcase
+from itertools import count
+from typing import Callable, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+
+# 支援的排序方式
+ORDERS = ('recent', 'name')
+
+
+def parse_patterns(value: Optional[str]) -> List[str]:
+    """
+    解析以逗號分隔的 glob 列表（例如環境變數 'feature/*,release/*'）
+
+    Args:
+        value (str): 原始字串，None 或空字串表示沒有設定
+
+    Returns:
+        List[str]: glob 列表
+    """
+    if not value:
+        return []
+    return [pattern.strip() for pattern in value.split(',') if pattern.strip()]
+
+
+def name_filter(include: Optional[Sequence[str]] = None,
+                exclude: Optional[Sequence[str]] = None) -> Callable[[str], bool]:
+    """
+    建立分支名稱篩選函數
+
+    Args:
+        include (Sequence[str]): 必須符合其中之一的 glob，空值表示全部接受
+        exclude (Sequence[str]): 符合其中之一即排除的 glob
+
+    Returns:
+        Callable[[str], bool]: 接受該名稱時返回 True
+    """
+    include = tuple(include or ())
+    exclude = tuple(exclude or ())
+
+    def accept(name: str) -> bool:
+        if include and not any(fnmatchcase(name, pattern) for pattern in include):
+            return False
+        return not any(fnmatchcase(name, pattern) for pattern in exclude)
+
+    return accept
+
+
+class TopRecent:
+    """
+    增量版的 top_recent：項目可以分批、從多個來源（例如多個倉庫）陸續推入
+
+    堆積大小固定為 n，記憶體用量與推入的項目總數無關。
+    """
+
+    def __init__(self, n: int, key: Callable[[T], object]):
+        self.n = n
+        self.key = key
+        self._heap = []
+        # 遞減的序號：key 相同時保留較早出現的項目，並避免比較項目本身
+        self._tiebreak = count(0, -1)
+
+    def push(self, item: T) -> None:
+        """推入一個項目；比目前第 n 名還舊時直接捨棄"""
+        if self.n <= 0:
+            return
+        entry = (self.key(item), next(self._tiebreak), item)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.push(item)
+
+    def items(self) -> List[T]:
+        """返回依 key 由新到舊排序的項目"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+def top_recent(items: Iterable[T], n: int, key: Callable[[T], object]) -> List[T]:
+    """
+    串流選出 key 最大（最近）的 n 個項目
+
+    以大小為 n 的最小堆積逐一消化 items，不需要先把全部項目載入記憶體。
+
+    Args:
+        items (Iterable[T]): 任意可迭代物件（可以是延遲分頁的 API 結果）
+        n (int): 保留的項目數量
+        key (Callable): 排序鍵，通常是提交時間
+
+    Returns:
+        List[T]: 依 key 由新到舊排序的項目
+    """
+    selector = TopRecent(n, key)
+    selector.extend(items)
+    return selector.items()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+分支狀態快照
+============
+記錄上次執行時每個分支的 HEAD SHA 與已渲染的分支資訊，
+下次執行只需比對 refs 清單即可判斷哪些分支需要重新獲取
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Tuple
+
+# 版本 3：資料列中的提交標題不再預先轉義 Markdown
+SNAPSHOT_VERSION = 3
+
+
+class BranchSnapshot:
+    """
+    {branch: head_sha} 快照
+
+    Attributes:
+        heads (Dict[str, str]): 分支名稱 -> HEAD SHA（依 refs 清單順序）
+        rows (Dict[str, Dict]): 分支名稱 -> 上次渲染的分支資訊
+        dates (Dict[str, str]): 分支名稱 -> HEAD 提交時間（依最近提交排序時使用）
+    """
+
+    def __init__(self, heads: Dict[str, str] = None, rows: Dict[str, Dict] = None,
+                 dates: Dict[str, str] = None):
+        self.heads = heads or {}
+        self.rows = rows or {}
+        self.dates = dates or {}
+
+    @classmethod
+    def load(cls, path: str) -> 'BranchSnapshot':
+        """
+        讀取快照；檔案不存在、損壞或版本不符時返回空快照
+
+        Args:
+            path (str): 快照檔案路徑
+
+        Returns:
+            BranchSnapshot: 快照實例
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('version') != SNAPSHOT_VERSION:
+            return cls()
+        return cls(data.get('heads'), data.get('rows'), data.get('dates'))
+
+    def save(self, path: str) -> None:
+        """
+        原子寫入快照（暫存檔 + 改名）
+
+        Args:
+            path (str): 快照檔案路徑
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': SNAPSHOT_VERSION,
+                    'heads': self.heads,
+                    'rows': self.rows,
+                    'dates': self.dates,
+                }, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def diff(self, heads: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """
+        比對新舊 refs
+
+        Returns:
+            (新增或移動的分支, 已刪除的分支)
+        """
+        moved = [name for name, sha in heads.items() if self.heads.get(name) != sha]
+        removed = [name for name in self.heads if name not in heads]
+        return moved, removed
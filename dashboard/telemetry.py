@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+"""
+執行遙測
+========
+記錄每個階段的耗時、各端點的請求數、傳輸位元組與速率限制剩餘額度，
+輸出為 JSON 報告與 GitHub Actions 步驟摘要，並可選擇輸出 cProfile 結果。
+
+所有 GitHub 請求都經過 dashboard.transport 的共用 session，
+因此只需在該 session 上掛一個 response hook 即可完整統計。
+"""
+
+import contextlib
+import json
+import re
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+# REST 路徑正規化規則：把具體的名稱換成佔位符，讓同類請求歸到同一端點
+_PATH_RULES = [
+    (re.compile(r'^/repos/[^/]+/[^/]+'), '/repos/{owner}/{repo}'),
+    (re.compile(r'^/users/[^/]+'), '/users/{user}'),
+    (re.compile(r'^/orgs/[^/]+'), '/orgs/{org}'),
+    (re.compile(r'/commits/[0-9a-f]{7,40}$'), '/commits/{sha}'),
+    (re.compile(r'/git/(commits|trees|blobs)/[0-9a-f]{40}$'), r'/git/\1/{sha}'),
+    (re.compile(r'/git/(matching-refs|refs)/.+$'), r'/git/\1/{ref}'),
+    (re.compile(r'/contents/.+$'), '/contents/{path}'),
+]
+_REPO_PATH = re.compile(r'^(?:/api/v3)?/repos/([^/]+/[^/]+)')
+_OPERATION = re.compile(r'(?:query|mutation)\s+(\w+)')
+
+# 目前接收請求紀錄的收集器；共用 session 上只掛一個 hook，轉交給它
+_active: Optional['Telemetry'] = None
+
+
+def active_telemetry() -> Optional['Telemetry']:
+    """返回目前接收請求紀錄的收集器（尚未安裝時為 None）"""
+    return _active
+
+
+def _response_hook(response, *args, **kwargs):
+    if _active is not None:
+        _active.record_response(response)
+    return response
+
+
+def endpoint_name(method: str, url: str, body=None) -> str:
+    """
+    把請求歸類為端點名稱，例如 'GET /repos/{owner}/{repo}/branches'
+    或 'POST /graphql BranchRefs'
+
+    Args:
+        method (str): HTTP 方法
+        url (str): 完整網址
+        body: 請求內容（用於取得 GraphQL 操作名稱）
+
+    Returns:
+        str: 端點名稱
+    """
+    path = urlparse(url).path
+    if path.endswith('/graphql'):
+        operation = None
+        if body:
+            text = body.decode('utf-8', 'replace') if isinstance(body, bytes) else str(body)
+            match = _OPERATION.search(text)
+            operation = match.group(1) if match else None
+        return f"{method} /graphql {operation or 'anonymous'}"
+
+    # GitHub Enterprise 的 /api/v3 前綴不影響歸類
+    if path.startswith('/api/v3'):
+        path = path[len('/api/v3'):]
+    for pattern, replacement in _PATH_RULES:
+        path = pattern.sub(replacement, path)
+    return f"{method} {path.rstrip('/') or '/'}"
+
+
+class Telemetry:
+    """
+    單次執行的遙測收集器
+
+    Attributes:
+        stages (List[Dict]): 依序記錄的階段（name、seconds、requests、bytes）
+        endpoints (Dict[str, Dict]): 端點 -> {requests, cached, bytes, errors}
+        repositories (Dict[str, int]): 'owner/repo' -> 實際傳輸（未命中快取）的 REST 請求數
+        rate_limits (Dict[str, Dict]): 資源 -> 觀察到的最低剩餘額度、上限與重置時間
+        scheduler: 本次執行的 RequestScheduler，設定後報告包含其重試與節流統計
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.stages: List[Dict] = []
+        self.endpoints: Dict[str, Dict] = {}
+        self.repositories: Dict[str, int] = {}
+        self.rate_limits: Dict[str, Dict] = {}
+        self.scheduler = None
+        self._current: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def install(self) -> 'Telemetry':
+        """
+        成為共用 session 的請求紀錄對象，並讓 PyGithub 走共用 session
+
+        需在建立 Github 物件前呼叫；之後建立的收集器會取代目前的收集器。
+        """
+        global _active
+        from dashboard.transport import get_session, install_pygithub_transport
+
+        hooks = get_session().hooks.setdefault('response', [])
+        if _response_hook not in hooks:
+            hooks.append(_response_hook)
+        _active = self
+        install_pygithub_transport()
+        return self
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """
+        量測一個階段；期間的所有請求都歸入此階段
+
+        Args:
+            name (str): 階段名稱
+        """
+        record = {'name': name, 'seconds': 0.0, 'requests': 0, 'cached': 0, 'bytes': 0}
+        previous = self._current
+        self._current = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            # 期間消耗的片段產生器（timed）另列為階段，不重複計入
+            nested = record.pop('_nested', 0.0)
+            record['seconds'] = round(time.perf_counter() - start - nested, 4)
+            self._current = previous
+            self.stages.append(record)
+
+    def timed(self, name: str, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        量測片段產生器本身的耗時，產生器結束時記錄為一個階段
+
+        串流寫入時渲染與寫入交錯進行，這裡只累計產生每個片段的時間；
+        在另一個階段（例如 update_readme）中消耗時，該階段的秒數會扣除這段時間。
+
+        Args:
+            name (str): 階段名稱
+            chunks (Iterable[str]): 片段產生器（例如 render_table 的輸出）
+
+        Yields:
+            str: 原樣轉交的片段
+        """
+        record = {'name': name, 'seconds': 0.0, 'requests': 0, 'cached': 0, 'bytes': 0}
+        iterator = iter(chunks)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                chunk = next(iterator, None)
+                elapsed += time.perf_counter() - start
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            record['seconds'] = round(elapsed, 4)
+            outer = self._current
+            if outer is not None:
+                outer['_nested'] = outer.get('_nested', 0.0) + elapsed
+            self.stages.append(record)
+
+    def record_response(self, response, *args, **kwargs):
+        """requests 的 response hook：記錄端點、位元組與速率限制標頭"""
+        request = response.request
+        cached = getattr(response, 'from_cache', False)
+        self.record(request.method, request.url, request.body, response.status_code,
+                    response.headers, 0 if cached else len(response.content or b''), cached)
+        return response
+
+    def record(self, method: str, url: str, body, status: int, headers, size: int,
+               cached: bool = False) -> None:
+        """
+        記錄一個已完成的請求（不經過共用 session 的客戶端，例如 aiohttp，直接呼叫）
+
+        Args:
+            method (str): HTTP 方法
+            url (str): 完整網址
+            body: 請求內容（用於取得 GraphQL 操作名稱）
+            status (int): HTTP 狀態碼
+            headers: 回應標頭（需支援不分大小寫的 get）
+            size (int): 實際傳輸的回應位元組數
+            cached (bool): 是否由本地快取提供
+        """
+        endpoint = endpoint_name(method, url, body)
+
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {'requests': 0, 'cached': 0, 'bytes': 0, 'errors': 0})
+            stats['requests'] += 1
+            stats['cached'] += int(cached)
+            stats['bytes'] += size
+            if status >= 400:
+                stats['errors'] += 1
+
+            repo = _REPO_PATH.match(urlparse(url).path)
+            if repo and not cached:
+                self.repositories[repo.group(1)] = self.repositories.get(repo.group(1), 0) + 1
+
+            if self._current is not None:
+                self._current['requests'] += 1
+                self._current['cached'] += int(cached)
+                self._current['bytes'] += size
+
+            remaining = headers.get('X-RateLimit-Remaining')
+            if remaining is not None:
+                resource = headers.get('X-RateLimit-Resource', 'core')
+                limit = self.rate_limits.setdefault(resource, {'remaining': int(remaining)})
+                limit['remaining'] = min(limit['remaining'], int(remaining))
+                limit['limit'] = int(headers.get('X-RateLimit-Limit', 0))
+                limit['reset'] = int(headers.get('X-RateLimit-Reset', 0))
+
+    def report(self) -> Dict:
+        """
+        組裝機器可讀的報告
+
+        Returns:
+            Dict: 包含 stages、endpoints、rate_limits 與總計
+        """
+        with self._lock:
+            endpoints = {name: dict(stats) for name, stats in sorted(self.endpoints.items())}
+            rate_limits = {name: dict(limit) for name, limit in self.rate_limits.items()}
+            repositories = dict(sorted(self.repositories.items(), key=lambda item: (-item[1], item[0])))
+        return {
+            'name': self.name,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started)),
+            'total_seconds': round(sum(stage['seconds'] for stage in self.stages), 4),
+            'total_requests': sum(stats['requests'] for stats in endpoints.values()),
+            'total_cached': sum(stats['cached'] for stats in endpoints.values()),
+            'total_bytes': sum(stats['bytes'] for stats in endpoints.values()),
+            'stages': list(self.stages),
+            'endpoints': endpoints,
+            'repositories': repositories,
+            'rate_limits': rate_limits,
+            'scheduler': self.scheduler.stats() if self.scheduler is not None else None,
+        }
+
+    def write_json(self, path: str) -> None:
+        """把報告寫成 JSON 檔"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def summary_markdown(self) -> str:
+        """把報告渲染成 Markdown（GitHub Actions 步驟摘要用）"""
+        report = self.report()
+        lines = [
+            f"### 📈 {self.name}",
+            "",
+            f"⏱️ {report['total_seconds']:.2f}s | 🌐 {report['total_requests']} 個請求"
+            f"（💾 {report['total_cached']} 個快取命中） | 📦 {report['total_bytes'] / 1024:.1f} KiB",
+            "",
+            "| 階段 | 秒數 | 請求 | 快取 | KiB |",
+            "|------|-----:|-----:|-----:|----:|",
+        ]
+        for stage in report['stages']:
+            lines.append(f"| {stage['name']} | {stage['seconds']:.3f} | {stage['requests']} "
+                         f"| {stage['cached']} | {stage['bytes'] / 1024:.1f} |")
+
+        if report['endpoints']:
+            lines += ["", "| 端點 | 請求 | 快取 | 錯誤 | KiB |", "|------|-----:|-----:|-----:|----:|"]
+            for name, stats in report['endpoints'].items():
+                lines.append(f"| `{name}` | {stats['requests']} | {stats['cached']} "
+                             f"| {stats['errors']} | {stats['bytes'] / 1024:.1f} |")
+
+        if report['repositories']:
+            # 只列出最耗額度的倉庫，完整清單在 JSON 報告中
+            lines += ["", "| 倉庫 | 請求 |", "|------|-----:|"]
+            for name, count in list(report['repositories'].items())[:10]:
+                lines.append(f"| {name} | {count} |")
+
+        if report['rate_limits']:
+            lines += ["", "| 速率限制資源 | 最低剩餘 | 上限 | 重置時間 (UTC) |", "|------|-----:|-----:|------|"]
+            for name, limit in report['rate_limits'].items():
+                reset = time.strftime('%H:%M:%S', time.gmtime(limit.get('reset', 0)))
+                lines.append(f"| {name} | {limit['remaining']} | {limit.get('limit', '-')} | {reset} |")
+
+        if report['scheduler']:
+            stats = report['scheduler']
+            lines += ["", f"🚦 排程器: {stats['attempts']} 次嘗試，重試 {stats['retries']} 次，"
+                          f"節流 {stats['throttled']} 次，等待 {stats['waited_seconds']:.1f}s，"
+                          f"並行視窗 {stats['window']:g}（最小 {stats['min_window']:g}）"]
+        return '\n'.join(lines) + '\n'
+
+    def write_step_summary(self, path: str) -> None:
+        """附加到 GitHub Actions 步驟摘要檔（$GITHUB_STEP_SUMMARY）"""
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(self.summary_markdown())
+
+    def emit(self, json_path: Optional[str] = None, summary_path: Optional[str] = None) -> None:
+        """
+        依設定輸出報告；兩個路徑都可以是 None
+
+        Args:
+            json_path (str): JSON 報告路徑（例如 DASHBOARD_METRICS 環境變數）
+            summary_path (str): 步驟摘要路徑（例如 GITHUB_STEP_SUMMARY 環境變數）
+        """
+        if json_path:
+            self.write_json(json_path)
+        if summary_path:
+            self.write_step_summary(summary_path)
+
+
+@contextlib.contextmanager
+def profiled(path: Optional[str]):
+    """
+    可選的 cProfile 包裝；path 為 None 時不做任何事
+
+    Args:
+        path (str): 輸出的 .prof 檔案路徑（可用 snakeviz 或 pstats 檢視）
+    """
+    if not path:
+        yield
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+共用 HTTP 傳輸層
+================
+所有 GitHub 請求（PyGithub 與 GraphQL）共用同一個 requests.Session，
+讓連線池、快取等 adapter 只需掛載一次；安裝請求排程器後，
+每個請求（含重試）都先經過排程器（見 dashboard.scheduler）
+"""
+
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session: Optional['ScheduledSession'] = None
+_session_lock = threading.Lock()
+
+
+class ScheduledSession(requests.Session):
+    """
+    可掛上 RequestScheduler 的 Session
+
+    scheduler 為 None 時行為與 requests.Session 相同；設定後每次送出前取得名額，
+    節流、5xx 與連線錯誤依排程器的決定等待後重試。
+    """
+
+    scheduler = None
+
+    def send(self, request, **kwargs):
+        scheduler = self.scheduler
+        if scheduler is None:
+            return super().send(request, **kwargs)
+
+        attempt = 0
+        while True:
+            scheduler.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                scheduler.release()
+                delay = scheduler.observe_error(attempt)
+                if delay is None:
+                    raise
+            else:
+                scheduler.release()
+                body = response.content if response.status_code == 403 else b''
+                delay = scheduler.observe(response.status_code, response.headers, body, attempt)
+                if delay is None:
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+
+def no_retry() -> Retry:
+    """adapter 不自行重試（重試交給排程器），也不因狀態碼拋出例外"""
+    return Retry(total=0, read=False, redirect=False, raise_on_status=False)
+
+
+def default_retry():
+    """
+    返回預設的重試設定
+
+    已安裝排程器時不在 adapter 層重試；否則 PyGithub 可用時沿用其 GithubRetry
+    （會處理次級速率限制），再否則使用 requests 預設值
+    """
+    if _session is not None and _session.scheduler is not None:
+        return no_retry()
+    try:
+        from github.GithubRetry import GithubRetry
+        return GithubRetry()
+    except ImportError:
+        return requests.adapters.DEFAULT_RETRIES
+
+
+def get_session() -> ScheduledSession:
+    """
+    獲取共用的 HTTP session（首次呼叫時建立）
+
+    Returns:
+        ScheduledSession: 共用 session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = ScheduledSession()
+                adapter = HTTPAdapter(max_retries=default_retry())
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def mount_adapter(adapter: HTTPAdapter) -> None:
+    """
+    在共用 session 上掛載 adapter（同時套用到 http 與 https）
+
+    Args:
+        adapter (HTTPAdapter): 要掛載的 adapter
+    """
+    session = get_session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+class _SharedSessionConnection:
+    """
+    PyGithub 連線類別的替代品
+
+    介面與 github.Requester 的 HTTP(S)RequestsConnectionClass 相同，
+    但所有請求都經過共用 session，而非每個連線各自建立 session。
+    """
+
+    protocol = 'https'
+    default_port = 443
+
+    def __init__(self, host: str, port: Optional[int] = None, strict: bool = False,
+                 timeout: Optional[int] = None, retry=None, pool_size: Optional[int] = None,
+                 **kwargs):
+        self.host = host
+        self.port = port if port else self.default_port
+        self.timeout = timeout
+        self.verify = kwargs.get('verify', True)
+        self.session = get_session()
+
+    def request(self, verb: str, url: str, input, headers) -> None:
+        self.verb = verb
+        self.url = url
+        self.input = input
+        self.headers = headers
+
+    def getresponse(self):
+        from github.Requester import RequestsResponse
+
+        verb = getattr(self.session, self.verb.lower())
+        url = f"{self.protocol}://{self.host}:{self.port}{self.url}"
+        r = verb(
+            url,
+            headers=self.headers,
+            data=self.input,
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+        )
+        return RequestsResponse(r)
+
+    def close(self) -> None:
+        # 共用 session 由本模組管理，不隨單一連線關閉
+        pass
+
+
+class _SharedSessionHTTPConnection(_SharedSessionConnection):
+    protocol = 'http'
+    default_port = 80
+
+
+def install_pygithub_transport() -> None:
+    """
+    讓 PyGithub 的所有請求改走共用 session
+
+    透過 Requester.injectConnectionClasses 注入連線類別，需在建立 Github 物件前呼叫。
+    """
+    from github.Requester import Requester
+
+    Requester.injectConnectionClasses(_SharedSessionHTTPConnection, _SharedSessionConnection)
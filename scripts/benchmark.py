@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+儀表板腳本基準測試
+對本地 GitHub API 替身（dashboard.fake_github）執行分支儀表板與工具掃描，
+逐階段回報耗時、請求數與峰值記憶體（tracemalloc 追蹤的 Python 配置，
+以階段開始時為基準，不受先前場景影響），並列出峰值記憶體隨分支數的變化
+
+用法：
+    python scripts/benchmark.py                     # 完整場景（10 / 1,000 / 50,000 分支、500 倉庫）
+    python scripts/benchmark.py --quick             # CI 用的小型場景
+    python scripts/benchmark.py --quick --baseline scripts/benchmark_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+# 讓 scripts/ 下的腳本可以導入倉庫根目錄的 dashboard 套件與 update_dashboard
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.fake_github import FakeGitHub, make_local_repo
+
+README_TEMPLATE = """# Benchmark
+
+<!-- BRANCH_ACTIVITY:START -->
+<!-- BRANCH_ACTIVITY:END -->
+
+<!-- TOOLS_LIST:START -->
+<!-- TOOLS_LIST:END -->
+"""
+
+
+class StageRecorder:
+    """記錄每個階段的耗時、請求數與峰值記憶體"""
+
+    def __init__(self, server: FakeGitHub, scenario: str, track_memory: bool = True):
+        self.server = server
+        self.scenario = scenario
+        self.track_memory = track_memory
+        self.results: List[Dict] = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        before = self.server.stats()
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            # 峰值以階段開始時的用量為基準，只計算該階段新增的記憶體
+            peak = tracemalloc.get_traced_memory()[1] - baseline if self.track_memory else None
+            after = self.server.stats()
+            self.results.append({
+                'scenario': self.scenario,
+                'stage': name,
+                'seconds': round(elapsed, 4),
+                'requests': after['total'] - before['total'],
+                'bytes': after['bytes_sent'] - before['bytes_sent'],
+                'peak_kib': round(peak / 1024, 1) if peak is not None else None,
+            })
+
+
+def bench_dashboard(engine: str, branches: int, limit: int, latency: float,
+                    track_memory: bool) -> List[Dict]:
+    """
+    分支儀表板：connect → fetch_branches → generate_table → update_readme
+
+    engine 加上 '-async' 後綴（例如 'rest-async'）時以非同步客戶端獲取分支；
+    'local' 從以相同資料建立的本地倉庫讀取 refs（不發送請求）
+    """
+    import asyncio
+
+    from update_dashboard import BranchDashboardUpdater
+
+    scenario = f"dashboard:{engine}:{branches}"
+    with FakeGitHub(branches=branches, latency=latency) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        readme_path = os.path.join(workdir, 'README.md')
+        with open(readme_path, 'w', encoding='utf-8') as f:
+            f.write(README_TEMPLATE)
+
+        checkout_path = os.path.join(workdir, 'checkout')
+        if engine == 'local':
+            make_local_repo(checkout_path, branches)
+
+        recorder = StageRecorder(server, scenario, track_memory)
+        use_async = engine.endswith('-async')
+        updater = BranchDashboardUpdater('benchmark-token', server.repo_name,
+                                         engine=engine[:-len('-async')] if use_async else engine,
+                                         order='recent', base_url=server.base_url,
+                                         checkout_path=checkout_path)
+        with recorder.stage('connect'):
+            updater.connect()
+        with recorder.stage('fetch_branches'):
+            rows = asyncio.run(updater.fetch_branches_async(limit)) if use_async else updater.fetch_branches(limit)
+        with recorder.stage('generate_table'):
+            table = updater.generate_table(rows)
+        with recorder.stage('update_readme'):
+            updater.update_readme(table, readme_path)
+        return recorder.results
+
+
+def bench_tools(repos: int, workers: int, latency: float, track_memory: bool,
+                engine: str = 'rest') -> List[Dict]:
+    """
+    工具掃描：get_tools_list → generate_tools_markdown → update_readme
+
+    engine 為 'rest-async' 時以非同步客戶端掃描，workers 即並行請求上限
+    """
+    import asyncio
+
+    import update_tools
+
+    # GraphQL 清單不使用執行緒池，場景名稱不含並行數
+    scenario = f"tools:w{workers}:{repos}" if engine == 'rest' else f"tools:{engine}:{repos}"
+    with FakeGitHub(branches=1, repos=repos, latency=latency) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        readme_path = os.path.join(workdir, 'README.md')
+        with open(readme_path, 'w', encoding='utf-8') as f:
+            f.write(README_TEMPLATE)
+
+        recorder = StageRecorder(server, scenario, track_memory)
+        # 工具掃描會逐倉庫輸出日誌，基準測試時隱藏
+        with contextlib.redirect_stdout(io.StringIO()):
+            with recorder.stage('get_tools_list'):
+                if engine == 'rest-async':
+                    tools = asyncio.run(update_tools.get_tools_list_async(
+                        'benchmark-token', server.owner, concurrency=workers, base_url=server.base_url))
+                else:
+                    tools = update_tools.get_tools_list('benchmark-token', server.owner,
+                                                        max_workers=workers, base_url=server.base_url,
+                                                        engine=engine)
+            with recorder.stage('generate_tools_markdown'):
+                content = update_tools.generate_tools_markdown(tools)
+            with recorder.stage('update_readme'):
+                update_tools.update_readme(content, readme_path)
+        return recorder.results
+
+
+def print_report(results: List[Dict]) -> None:
+    """以表格輸出結果"""
+    header = f"{'scenario':<28} {'stage':<24} {'seconds':>9} {'requests':>9} {'KiB sent':>10} {'peak KiB':>10}"
+    print(header)
+    print('-' * len(header))
+    for row in results:
+        peak = f"{row['peak_kib']:.1f}" if row['peak_kib'] is not None else '-'
+        print(f"{row['scenario']:<28} {row['stage']:<24} {row['seconds']:>9.3f} "
+              f"{row['requests']:>9} {row['bytes'] / 1024:>10.1f} {peak:>10}")
+
+
+def print_memory_scaling(results: List[Dict]) -> None:
+    """
+    輸出 fetch_branches 與 generate_table 的峰值記憶體隨分支數的變化
+
+    每個引擎列出各分支數的峰值，以及每多 1,000 個分支增加的 KiB：
+    只保留要顯示的分支時，這個斜率應接近 0（記憶體不隨分支總數成長）。
+    """
+    series: Dict[tuple, List[tuple]] = {}
+    for row in results:
+        kind, _, rest = row['scenario'].partition(':')
+        if kind != 'dashboard' or row['peak_kib'] is None or row['stage'] not in ('fetch_branches', 'generate_table'):
+            continue
+        engine, _, count = rest.rpartition(':')
+        series.setdefault((engine, row['stage']), []).append((int(count), row['peak_kib']))
+
+    rows = [(key, points) for key, points in series.items() if len(points) > 1]
+    if not rows:
+        return
+    print("\n📈 峰值記憶體隨分支數的變化")
+    for (engine, stage), points in rows:
+        points.sort()
+        (first_count, first_peak), (last_count, last_peak) = points[0], points[-1]
+        slope = (last_peak - first_peak) / (last_count - first_count) * 1000
+        peaks = ', '.join(f"{count}: {peak:.1f}" for count, peak in points)
+        print(f"   {engine:<12} {stage:<16} {peaks} KiB（每 1,000 個分支 {slope:+.1f} KiB）")
+
+
+def compare_baseline(results: List[Dict], baseline_path: str) -> List[str]:
+    """
+    與基準檔比較請求數（請求數是確定性的，適合在 CI 中把關）
+
+    Returns:
+        List[str]: 超出基準的項目說明，空列表表示通過
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(row['scenario'], row['stage']): row for row in json.load(f)}
+
+    regressions = []
+    for row in results:
+        expected = baseline.get((row['scenario'], row['stage']))
+        if expected is not None and row['requests'] > expected['requests']:
+            regressions.append(
+                f"{row['scenario']} / {row['stage']}: {row['requests']} 個請求（基準 {expected['requests']}）"
+            )
+    return regressions
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='儀表板腳本離線基準測試')
+    parser.add_argument('--quick', action='store_true', help='只執行 CI 用的小型場景')
+    parser.add_argument('--branches', type=parse_ints, default=None, help='分支數量列表，例如 10,1000,50000')
+    parser.add_argument('--engines', default='rest,graphql,rest-async,local',
+                        help='分支資料來源列表（加上 -async 後綴使用非同步客戶端）')
+    parser.add_argument('--rest-max', type=int, default=None,
+                        help='REST 引擎每個分支一個請求，超過此分支數的 REST 場景會略過；'
+                             '默認完整模式 1000、快速模式 100')
+    parser.add_argument('--repos', type=parse_ints, default=None, help='倉庫數量列表')
+    parser.add_argument('--workers', type=parse_ints, default=[1, 8], help='工具掃描的並行數列表（REST）')
+    parser.add_argument('--tools-engines', default='rest,graphql,rest-async', help='工具掃描的倉庫清單來源列表')
+    parser.add_argument('--limit', type=int, default=15, help='儀表板顯示的分支數量')
+    parser.add_argument('--latency', type=float, default=0.0, help='每個請求的模擬延遲（秒）')
+    parser.add_argument('--no-memory', action='store_true', help='不追蹤記憶體（tracemalloc 會拖慢執行）')
+    parser.add_argument('--json', dest='json_path', help='把結果寫入 JSON 檔')
+    parser.add_argument('--baseline', help='與基準 JSON 比較請求數，超出時返回非零退出碼')
+    args = parser.parse_args(argv)
+
+    branches = args.branches or ([10, 1000] if args.quick else [10, 1000, 50000])
+    repos = args.repos or ([20] if args.quick else [500])
+    rest_max = args.rest_max if args.rest_max is not None else (100 if args.quick else 1000)
+    engines = [engine for engine in args.engines.split(',') if engine]
+    track_memory = not args.no_memory
+
+    logging.disable(logging.INFO)
+    if track_memory:
+        tracemalloc.start()
+
+    results = []
+    for engine in engines:
+        for count in branches:
+            if engine == 'rest' and count > rest_max:
+                continue
+            results.extend(bench_dashboard(engine, count, args.limit, args.latency, track_memory))
+    tools_engines = [engine for engine in args.tools_engines.split(',') if engine]
+    for count in repos:
+        if 'rest' in tools_engines:
+            for workers in args.workers:
+                results.extend(bench_tools(count, workers, args.latency, track_memory))
+        if 'graphql' in tools_engines:
+            results.extend(bench_tools(count, 1, args.latency, track_memory, engine='graphql'))
+        if 'rest-async' in tools_engines:
+            results.extend(bench_tools(count, max(args.workers), args.latency, track_memory,
+                                       engine='rest-async'))
+
+    print_report(results)
+    if track_memory:
+        print_memory_scaling(results)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 結果已寫入 {args.json_path}")
+
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline)
+        if regressions:
+            print("\n❌ 請求數超出基準:")
+            for line in regressions:
+                print(f"   - {line}")
+            return 1
+        print("\n✅ 請求數未超出基準")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
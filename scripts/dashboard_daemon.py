@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分支儀表板常駐模式
+==================
+以本地 HTTP 端點接收 GitHub 的 push / create / delete webhook，
+在記憶體中維護所有分支的索引並直接依 payload 修補，不再為每個事件
+重新啟動程序、檢出倉庫與重跑整個 BranchDashboardUpdater.run：
+
+- 啟動時以設定的資料來源載入一次所有分支（之後不再列出分支）。
+- push 事件的 head_commit 已包含提交標題、作者與時間，直接組成分支資訊；
+  缺少 head_commit 時才在寫入前批次補抓該分支的提交。
+- delete 事件直接移除分支；create 事件沒有 SHA，通常隨後會有同一分支的 push，
+  去抖動視窗結束時仍未出現 push 才列出一次 refs 補齊。
+- 本地引擎（DASHBOARD_ENGINE=local）在需要補抓時先 git fetch --prune，
+  讀到的是最新的遠端分支而不是啟動時的檢出。
+- 補抓失敗（限流、API 錯誤或查無結果）的分支放回佇列，下一個去抖動視窗重試，
+  事件不會因一次失敗而遺失。
+- 連續的事件在去抖動視窗（最後一個事件後 debounce 秒，最長 max_delay 秒）內
+  合併成一次寫入；渲染結果的資料雜湊未變時不改動 README。
+
+每個事件只修補一個分支（有序索引中 O(log N) 次比較），每次寫入只讀取索引的一端選出顯示的分支。
+
+用法：
+    python scripts/dashboard_daemon.py --port 8787                 # 常駐並接收 webhook
+    python scripts/dashboard_daemon.py --replay events.jsonl       # 重播錄下的事件後寫入一次
+
+設定沿用 update_dashboard.py 的環境變數（GITHUB_REPOSITORY、DASHBOARD_ENGINE 等）；
+設置 DASHBOARD_WEBHOOK_SECRET 時驗證 X-Hub-Signature-256。
+錄下的事件檔每行一個 {"event": "push", "payload": {...}}。
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 讓 scripts/ 下的腳本可以導入倉庫根目錄的 dashboard 套件與 update_dashboard
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.local_git import LocalGitError
+from dashboard.records import BranchRecord
+from update_dashboard import BranchDashboardUpdater, MultiRepoDashboardUpdater, updater_from_env
+
+logger = logging.getLogger(__name__)
+
+_BRANCH_PREFIX = 'refs/heads/'
+_NULL_SHA = '0' * 40
+
+# 啟動時載入所有分支
+_ALL_BRANCHES = sys.maxsize
+
+# 補抓失敗的分支最多重試幾次（每次間隔一個去抖動視窗）
+_MAX_RETRIES = 5
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    驗證 X-Hub-Signature-256
+
+    Args:
+        secret (str): webhook 密鑰
+        body (bytes): 原始請求內容
+        signature (str): 標頭值，格式為 'sha256=<hex>'
+
+    Returns:
+        bool: 簽章正確時返回 True
+    """
+    if not signature or not signature.startswith('sha256='):
+        return False
+    expected = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len('sha256='):])
+
+
+class BranchIndex:
+    """
+    分支名稱 -> BranchRecord 的記憶體索引，同時維持顯示順序
+
+    排序鍵以 bisect 保持有序：修補一個分支只需 O(log N) 次比較，
+    選出顯示的分支只讀取有序列表的一端，不必每次寫入都重新排序所有分支。
+
+    Attributes:
+        records (Dict[str, BranchRecord]): 所有符合篩選條件的分支
+        order (str): 排序方式，'recent' 或 'name'
+    """
+
+    def __init__(self, records: Iterable[BranchRecord] = (), order: str = 'recent'):
+        self.order = order
+        self.records = {record['name']: record for record in records}
+        self._keys = sorted(self._key(record) for record in self.records.values())
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.records
+
+    def _key(self, record: BranchRecord) -> Tuple[str, ...]:
+        """有序列表中的排序鍵：'recent' 依 (提交時間, 名稱)，'name' 依名稱"""
+        if self.order == 'recent':
+            return record['timestamp'], record['name']
+        return (record['name'],)
+
+    def _discard_key(self, record: BranchRecord) -> None:
+        key = self._key(record)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def put(self, record: BranchRecord) -> None:
+        current = self.records.get(record['name'])
+        if current is not None:
+            self._discard_key(current)
+        self.records[record['name']] = record
+        insort(self._keys, self._key(record))
+
+    def remove(self, name: str) -> bool:
+        record = self.records.pop(name, None)
+        if record is None:
+            return False
+        self._discard_key(record)
+        return True
+
+    def select(self, limit: int) -> List[BranchRecord]:
+        """
+        依排序方式選出要顯示的分支（與 BranchDashboardUpdater._select 相同的規則）
+
+        'recent' 時提交時間相同的分支依名稱順序，與完整執行的結果一致。
+        """
+        if limit <= 0:
+            return []
+        if self.order != 'recent':
+            return [self.records[name] for name, in self._keys[:limit]]
+        # 從最新的一端取出 limit 個，並補齊與第 limit 個時間相同的分支，
+        # 再在這一小段中依 (時間由新到舊, 名稱) 排序
+        end = len(self._keys)
+        start = max(0, end - limit)
+        while start > 0 and self._keys[start - 1][0] == self._keys[start][0]:
+            start -= 1
+        tail = sorted(self._keys[start:end], key=lambda key: key[1])
+        tail.sort(key=lambda key: key[0], reverse=True)
+        return [self.records[name] for _, name in tail[:limit]]
+
+
+class DashboardDaemon:
+    """
+    webhook 驅動的分支儀表板
+
+    Attributes:
+        updater (BranchDashboardUpdater): 提供資料來源、渲染與 README 寫入
+        index (BranchIndex): 記憶體中的分支索引
+        stats (Dict[str, int]): 收到的事件、合併後的寫入次數等計數
+    """
+
+    def __init__(self, updater: BranchDashboardUpdater, limit: int = 15, readme_path: str = 'README.md',
+                 debounce: float = 5.0, max_delay: float = 60.0, secret: Optional[str] = None):
+        """
+        Args:
+            updater (BranchDashboardUpdater): 單一倉庫模式的更新器
+            limit (int): 顯示的分支數量
+            readme_path (str): README 文件路徑
+            debounce (float): 最後一個事件之後等待的秒數
+            max_delay (float): 持續有事件時，距第一個未寫入事件最多等待的秒數
+            secret (str): webhook 密鑰，None 表示不驗證簽章
+
+        Raises:
+            ValueError: 多倉庫模式（事件只來自單一倉庫）
+        """
+        if isinstance(updater, MultiRepoDashboardUpdater):
+            raise ValueError("常駐模式只支援單一倉庫")
+        self.updater = updater
+        self.limit = limit
+        self.readme_path = readme_path
+        self.debounce = debounce
+        self.max_delay = max(max_delay, debounce)
+        self.secret = secret
+        self.index = BranchIndex(order=updater.order)
+        self.stats = {'events': 0, 'applied': 0, 'ignored': 0, 'flushes': 0, 'writes': 0, 'hydrated': 0}
+        # 沒有 head_commit 的推送：分支 -> SHA，寫入前批次補抓
+        self._pending: Dict[str, str] = {}
+        # 只有 create 事件、還不知道 SHA 的分支
+        self._unresolved: Set[str] = set()
+        # 每個分支套用過的事件數，補抓期間分支又有事件時捨棄補抓結果
+        self._versions: Dict[str, int] = {}
+        # 補抓失敗後已重試的次數
+        self._retries: Dict[str, int] = {}
+        # seed() 成功之前不寫入 README
+        self._seeded = False
+        self._dirty = False
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._stopping = False
+        self._cond = threading.Condition()
+
+    # ---- 索引 ----
+
+    def seed(self) -> int:
+        """
+        以設定的資料來源載入所有分支（常駐期間只執行一次）
+
+        fetch_branches() 出錯時只記錄並返回空列表，因此沒有載入任何分支也視為失敗：
+        以空索引啟動時，第一個事件就會讓 README 只剩事件中的分支。
+
+        Returns:
+            int: 載入的分支數
+
+        Raises:
+            RuntimeError: 無法連接資料來源，或沒有載入任何分支
+        """
+        if not self.updater.connect():
+            raise RuntimeError("無法連接到 GitHub")
+        records = self.updater.fetch_branches(_ALL_BRANCHES)
+        if not records:
+            raise RuntimeError("無法載入分支（資料來源出錯或沒有符合條件的分支），不啟動常駐模式")
+        with self._cond:
+            self.index = BranchIndex(records, self.updater.order)
+            self._seeded = True
+        logger.info(f"📚 已載入 {len(self.index)} 個分支")
+        return len(self.index)
+
+    def _record_from_push(self, branch: str, payload: Dict) -> Optional[BranchRecord]:
+        """由 push payload 的 head_commit 組出分支資訊，缺少時返回 None"""
+        commit = payload.get('head_commit')
+        if not commit or commit.get('id') != payload.get('after'):
+            return None
+        return self.updater._branch_info_from_push(branch, commit)
+
+    def apply(self, event_name: str, payload: Dict) -> str:
+        """
+        依單一事件修補索引，並排定一次寫入
+
+        Args:
+            event_name (str): X-GitHub-Event（push、create、delete）
+            payload (Dict): 事件內容
+
+        Returns:
+            str: 處理結果說明
+        """
+        with self._cond:
+            self.stats['events'] += 1
+            result = self._apply(event_name, payload)
+            if result is None:
+                self.stats['applied'] += 1
+                self._schedule()
+                return "已排入更新"
+            self.stats['ignored'] += 1
+            return result
+
+    def _apply(self, event_name: str, payload: Dict) -> Optional[str]:
+        """修補索引；不影響儀表板時返回略過的原因"""
+        repository = (payload.get('repository') or {}).get('full_name')
+        if repository and repository.lower() != self.updater.repo_name.lower():
+            return f"其他倉庫的事件: {repository}"
+
+        if event_name in ('create', 'delete'):
+            if payload.get('ref_type') != 'branch':
+                return f"{event_name} 事件針對的是 {payload.get('ref_type')}"
+            branch = payload.get('ref', '')
+        elif event_name == 'push':
+            ref = payload.get('ref', '')
+            if not ref.startswith(_BRANCH_PREFIX):
+                return f"推送的不是分支: {ref}"
+            branch = ref[len(_BRANCH_PREFIX):]
+        else:
+            return f"不處理的事件: {event_name or '未知'}"
+
+        if not branch or not self.updater.accept_branch(branch):
+            return f"分支 {branch} 不在篩選範圍內"
+        result = self._patch(event_name, branch, payload)
+        if result is None:
+            self._versions[branch] = self._versions.get(branch, 0) + 1
+            self._retries.pop(branch, None)
+        return result
+
+    def _patch(self, event_name: str, branch: str, payload: Dict) -> Optional[str]:
+        """依事件修補單一分支"""
+        if event_name == 'delete' or payload.get('deleted') or payload.get('after') == _NULL_SHA:
+            self._pending.pop(branch, None)
+            self._unresolved.discard(branch)
+            if not self.index.remove(branch):
+                return f"已刪除的分支 {branch} 不在索引中"
+            return None
+
+        if event_name == 'create':
+            if branch in self.index or branch in self._pending:
+                return f"分支 {branch} 已在索引中"
+            self._unresolved.add(branch)
+            return None
+
+        after = payload.get('after')
+        current = self.index.records.get(branch)
+        if current is not None and after and after.startswith(current['sha']):
+            return f"分支 {branch} 的 HEAD {after[:7]} 已在索引中"
+        self._unresolved.discard(branch)
+        record = self._record_from_push(branch, payload)
+        if record is not None:
+            self._pending.pop(branch, None)
+            self.index.put(record)
+        elif after:
+            self._pending[branch] = after
+        else:
+            return "推送事件中沒有 HEAD SHA"
+        return None
+
+    # ---- 寫入 ----
+
+    def flush(self) -> bool:
+        """
+        補抓缺少資料的分支、選出顯示的分支並寫入 README
+
+        補抓失敗或沒有取得結果的分支會放回待處理佇列，下一個去抖動視窗後重試。
+
+        Returns:
+            bool: README 有變更時返回 True
+        """
+        with self._cond:
+            self._dirty = False
+            pending, self._pending = self._pending, {}
+            unresolved, self._unresolved = self._unresolved, set()
+            versions = {name: self._versions.get(name) for name in (*pending, *unresolved)}
+        self.stats['flushes'] += 1
+
+        if self.updater.local is not None and (pending or unresolved):
+            # 本地引擎讀的是檢出中的 refs：先抓取，新分支與推送的提交才會出現
+            try:
+                self.updater.local.fetch()
+            except LocalGitError as e:
+                logger.warning(f"⚠️  git fetch 失敗，沿用檢出中的 refs: {e}")
+        records: Dict[str, BranchRecord] = {}
+        listed = False
+        try:
+            if unresolved:
+                # create 之後沒有等到 push：列出一次 refs 取得 SHA
+                heads = self.updater.list_branch_heads()
+                listed = True
+                pending.update((name, heads[name]) for name in unresolved if name in heads)
+            if pending:
+                records = self.updater.hydrate_branches(pending)
+        except Exception as e:
+            logger.error(f"❌ 補抓分支時出錯，稍後重試: {str(e)}")
+        self.stats['hydrated'] += len(records)
+
+        with self._cond:
+            for name, record in records.items():
+                # 補抓期間又收到新的推送或刪除時，以較新的事件為準
+                if self._versions.get(name) == versions[name]:
+                    self.index.put(record)
+                    self._retries.pop(name, None)
+            missing = {name: sha for name, sha in pending.items() if name not in records}
+            retry = unresolved - set(pending)
+            if listed:
+                # 成功列出 refs 卻找不到的分支已不存在，不再重試
+                for name in sorted(retry):
+                    logger.info(f"   分支 '{name}' 已不存在，略過")
+                retry = set()
+            self._requeue(missing, retry, versions)
+
+        with self._cond:
+            if not self._seeded:
+                logger.warning("⚠️  尚未載入分支索引，略過寫入")
+                return False
+            rows = self.index.select(self.limit)
+        if not rows:
+            logger.warning("⚠️  索引中沒有分支，略過寫入")
+            return False
+        if self.updater.branch_metrics:
+            self.updater.annotate_branch_metrics(rows)
+        changed = self.updater.update_readme(self.updater.render_table(rows), self.readme_path)
+        if changed:
+            self.stats['writes'] += 1
+        return changed
+
+    def _requeue(self, pending: Dict[str, str], unresolved: Set[str], versions: Dict[str, Optional[int]]) -> None:
+        """
+        把補抓失敗的分支放回待處理佇列，下一個去抖動視窗後重試（需持有 self._cond）
+
+        補抓期間已有新事件的分支以新事件為準；重試超過 _MAX_RETRIES 次時放棄。
+        """
+        requeued = 0
+        for name in (*pending, *unresolved):
+            if self._versions.get(name) != versions[name]:
+                continue
+            attempts = self._retries.get(name, 0) + 1
+            if attempts > _MAX_RETRIES:
+                self._retries.pop(name, None)
+                logger.warning(f"⚠️  分支 '{name}' 補抓失敗 {_MAX_RETRIES} 次，放棄重試")
+                continue
+            self._retries[name] = attempts
+            if name in pending:
+                self._pending[name] = pending[name]
+            else:
+                self._unresolved.add(name)
+            requeued += 1
+        if requeued:
+            logger.warning(f"🔁 {requeued} 個分支補抓失敗，{self.debounce:g}s 後重試")
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """排定一次寫入：從現在起等待一個去抖動視窗（需持有 self._cond）"""
+        now = time.monotonic()
+        if not self._dirty:
+            self._first_event = now
+        self._dirty = True
+        self._last_event = now
+        self._cond.notify_all()
+
+    def _due(self) -> Optional[float]:
+        """距離下次寫入的秒數，沒有待寫入的事件時為 None"""
+        if not self._dirty:
+            return None
+        deadline = min(self._last_event + self.debounce, self._first_event + self.max_delay)
+        return max(0.0, deadline - time.monotonic())
+
+    def run_flusher(self) -> None:
+        """去抖動迴圈：事件停止 debounce 秒（或累積 max_delay 秒）後寫入一次"""
+        while True:
+            with self._cond:
+                while not self._stopping and (self._due() is None or self._due() > 0):
+                    self._cond.wait(self._due())
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ 寫入儀表板時出錯，{self.debounce:g}s 後重試: {str(e)}")
+                with self._cond:
+                    self._schedule()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    # ---- HTTP ----
+
+    def handle(self, event_name: str, body: bytes, signature: Optional[str]) -> Tuple[int, Dict]:
+        """
+        處理一個 webhook 請求
+
+        Returns:
+            (HTTP 狀態碼, 回應 JSON)
+        """
+        if self.secret is not None and not verify_signature(self.secret, body, signature):
+            return 401, {'error': '簽章不符'}
+        if event_name == 'ping':
+            return 200, {'result': 'pong'}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {'error': '無法解析 JSON'}
+        return 202, {'result': self.apply(event_name, payload)}
+
+    def serve(self, host: str = '127.0.0.1', port: int = 8787) -> None:
+        """
+        啟動 HTTP 端點與去抖動執行緒，直到中斷為止
+
+        POST /webhook 接收事件，GET /healthz 返回索引大小與計數。
+        """
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def _reply(self, status: int, body: Dict) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path != '/healthz':
+                    return self._reply(404, {'error': 'not found'})
+                self._reply(200, dict(daemon.stats, branches=len(daemon.index)))
+
+            def do_POST(self):
+                if self.path != '/webhook':
+                    return self._reply(404, {'error': 'not found'})
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status, reply = daemon.handle(self.headers.get('X-GitHub-Event', ''), body,
+                                              self.headers.get('X-Hub-Signature-256'))
+                self._reply(status, reply)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        flusher = threading.Thread(target=self.run_flusher, name='dashboard-flusher', daemon=True)
+        flusher.start()
+        logger.info(f"👂 正在監聽 http://{host}:{server.server_port}/webhook"
+                    f"（去抖動 {self.debounce:g}s，最長 {self.max_delay:g}s）")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.stop()
+            flusher.join()
+
+    def replay(self, path: str) -> int:
+        """
+        依序套用錄下的事件，最後寫入一次（與一個去抖動視窗內收到全部事件相同）
+
+        Args:
+            path (str): 每行一個 {"event": ..., "payload": ...} 的 JSONL 檔
+
+        Returns:
+            int: 套用的事件數
+        """
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                result = self.apply(entry['event'], entry['payload'])
+                logger.info(f"   {entry['event']}: {result}")
+                count += 1
+        self.flush()
+        return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    parser = argparse.ArgumentParser(description='webhook 驅動的分支儀表板常駐模式')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.getenv('DASHBOARD_DAEMON_PORT', '8787')))
+    parser.add_argument('--debounce', type=float, default=5.0, help='最後一個事件後等待的秒數')
+    parser.add_argument('--max-delay', type=float, default=60.0, help='持續有事件時最多等待的秒數')
+    parser.add_argument('--readme', default='README.md')
+    parser.add_argument('--replay', help='重播錄下的事件（JSONL）後寫入一次並結束')
+    args = parser.parse_args(argv)
+
+    updater = updater_from_env()
+    try:
+        daemon = DashboardDaemon(updater, limit=int(os.getenv('DASHBOARD_LIMIT', '15')),
+                                 readme_path=args.readme, debounce=args.debounce,
+                                 max_delay=args.max_delay,
+                                 secret=os.getenv('DASHBOARD_WEBHOOK_SECRET'))
+        daemon.seed()
+    except (ValueError, RuntimeError) as e:
+        logger.error(f"❌ {str(e)}")
+        return 1
+
+    if args.replay:
+        count = daemon.replay(args.replay)
+        logger.info(f"✅ 已重播 {count} 個事件: {daemon.stats}")
+        return 0
+    try:
+        daemon.serve(args.host, args.port)
+    except KeyboardInterrupt:
+        logger.info("👋 已停止")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
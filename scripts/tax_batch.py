@@ -0,0 +1,757 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+稅務計算機批次引擎
+==================
+把「稅務計算機.HTML」的計算邏輯（calculateProgressiveTax、calculateDeductions、
+calculateCorporateTax、getMarginalTaxRate 與 performCalculation）移植為 NumPy 向量運算，
+一次計算整欄資料（薪資檔、上百萬列的試算網格），而不是在瀏覽器中逐筆試算。
+
+- 級距、免稅額與扣除額沿用網頁的 TAX_CONSTANTS_2024；級距預先展開為陣列
+  （上限、稅率、速算扣除額與各級距下限的累計稅額），以 searchsorted 一次找出整欄的級距。
+- CSV 以固定列數分塊串流讀寫，記憶體用量與檔案大小無關。
+- 欄位名稱與網頁表單的元素 id 相同；空白或無法解析的值與表單一樣視為 0 或默認值
+  （parseFloat(...) || 默認值，因此股權占比與盈餘分配比例填 0 也會變成 100）。
+- --self-check 以 node 執行網頁中的原始函數，對樣本輸入逐項比對結果。
+
+依輸入欄位自動選擇模式（也可用 --mode 指定）：
+    scenario  revenue, profitRate, incomeStandard, netProfitRate, shareholdingRatio,
+              profitSource, distributionRatio, maritalStatus, salary, children
+              → 公司制與行號制的完整比較（與網頁的「開始計算」相同）
+    salary    salary, maritalStatus, children → 薪資所得的綜所稅
+    income    income（綜合所得淨額）→ 累進稅額與邊際稅率
+
+用法：
+    python scripts/tax_batch.py payroll.csv -o result.csv
+    python scripts/tax_batch.py grid.csv -o - --chunk-size 200000 --decimals 0
+    python scripts/tax_batch.py --self-check
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 沒有 NumPy 時導入本模組不會失敗，執行時才報錯
+    np = None
+
+TAX_CALCULATOR_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '稅務計算機.HTML')
+
+# 與網頁的 TAX_CONSTANTS_2024 相同
+EXEMPTION = 97000
+STANDARD_DEDUCTION = {'single': 131000, 'married': 262000}
+SALARY_DEDUCTION = 218000
+CORPORATE_TAX_RATE = 0.20
+CORPORATE_TAX_THRESHOLD = 120000
+DIVIDEND_CREDIT_RATE = 0.085
+DIVIDEND_CREDIT_LIMIT = 80000
+DIVIDEND_SEPARATE_RATE = 0.28
+HEALTH_INSURANCE_RATE = 0.0211
+HEALTH_INSURANCE_THRESHOLD = 20000
+LEGAL_RESERVE_RATE = 0.10
+RETAINED_EARNINGS_TAX_RATE = 0.05
+
+# 擴大書審的營收上限
+BOOK_AUDIT_REVENUE_LIMIT = 30000000
+
+# (上限, 稅率, 速算扣除額)
+TAX_BRACKETS: List[Tuple[float, float, float]] = [
+    (590000, 0.05, 0),
+    (1330000, 0.12, 41300),
+    (2660000, 0.20, 147700),
+    (4980000, 0.30, 413700),
+    (float('inf'), 0.40, 911700),
+]
+
+# 網頁的盈餘分配來源與計算方式；代碼即陣列索引
+PROFIT_SOURCES = ('bookAudit', 'standard', 'netProfit')
+TAX_METHODS = ('combined', 'separate')
+RECOMMENDATIONS = ('company', 'sole')
+
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_DECIMALS = 2
+
+# 與網頁 performCalculation 相同的驗證訊息
+ERROR_REVENUE = '請填寫預估總營業收入！'
+ERROR_RATES = '請填寫完整的稅率資料（所得額標準、淨利率）！'
+ERROR_SHAREHOLDING = '股權占比必須在0-100%之間！'
+ERROR_DISTRIBUTION = '盈餘分配比例必須在0-100%之間！'
+
+_JS_FLOAT = re.compile(r'\s*([+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))')
+_JS_INT = re.compile(r'\s*([+-]?\d+)')
+
+# 各模式的輸入欄位：(欄位, 類型, 默認值)；類型 money 會先去掉千分位逗號
+MODE_INPUTS = {
+    'scenario': [
+        ('revenue', 'money', 0), ('profitRate', 'float', 0), ('incomeStandard', 'float', 0),
+        ('netProfitRate', 'float', 0), ('shareholdingRatio', 'float', 100), ('profitSource', 'text', 'optimal'),
+        ('distributionRatio', 'float', 100), ('maritalStatus', 'text', 'single'), ('salary', 'money', 0),
+        ('children', 'int', 0),
+    ],
+    'salary': [('salary', 'money', 0), ('maritalStatus', 'text', 'single'), ('children', 'int', 0)],
+    'income': [('income', 'money', 0)],
+}
+
+# 各模式的輸出欄位（依序附加在輸入欄位之後）
+MODE_OUTPUTS = {
+    'scenario': [
+        'taxableIncome1', 'taxableIncome2', 'taxableIncome3', 'corporateTax1', 'corporateTax2', 'corporateTax3',
+        'selectedMethod', 'distributionSource', 'actualDistributedProfit', 'retainedEarningsTax',
+        'personalDividend', 'healthInsurance', 'taxMethod', 'finalTaxA', 'marginalRateA', 'personalTaxB',
+        'marginalRateB', 'totalTaxCompany', 'totalTaxSole', 'recommended', 'taxDifference',
+        'netIncomeCompany', 'netIncomeSole', 'error',
+    ],
+    'salary': ['deductions', 'netSalary', 'taxableIncome', 'tax', 'marginalRate'],
+    'income': ['tax', 'marginalRate'],
+}
+
+# 以整數輸出的欄位（百分比）
+_INTEGER_OUTPUTS = {'marginalRate', 'marginalRateA', 'marginalRateB'}
+
+# 以代碼表示的文字輸出欄位
+_LABELS = {
+    'selectedMethod': PROFIT_SOURCES,
+    'distributionSource': PROFIT_SOURCES,
+    'taxMethod': TAX_METHODS,
+    'recommended': RECOMMENDATIONS,
+}
+
+_brackets = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("批次引擎需要 NumPy，請執行: pip install numpy")
+
+
+def bracket_arrays() -> Dict[str, 'np.ndarray']:
+    """
+    預先展開的級距陣列
+
+    Returns:
+        Dict[str, np.ndarray]: limits（上限）、rates（稅率）、deductions（速算扣除額）、
+            floors（級距下限）與 base（下限處的累計稅額）；速算扣除額即 floors * rates - base
+    """
+    global _brackets
+    if _brackets is None:
+        _require_numpy()
+        limits = np.array([limit for limit, _, _ in TAX_BRACKETS], dtype=np.float64)
+        rates = np.array([rate for _, rate, _ in TAX_BRACKETS], dtype=np.float64)
+        floors = np.concatenate(([0.0], limits[:-1]))
+        base = np.concatenate(([0.0], np.cumsum((limits[:-1] - floors[:-1]) * rates[:-1])))
+        _brackets = {
+            'limits': limits,
+            'rates': rates,
+            'deductions': np.array([deduction for _, _, deduction in TAX_BRACKETS], dtype=np.float64),
+            'floors': floors,
+            'base': base,
+        }
+    return _brackets
+
+
+def bracket_index(income) -> 'np.ndarray':
+    """每個所得所在的級距索引（第一個上限 >= 所得的級距，與網頁的 income <= bracket.limit 相同）"""
+    return np.searchsorted(bracket_arrays()['limits'], income, side='left')
+
+
+def progressive_tax(income) -> 'np.ndarray':
+    """
+    累進稅額（calculateProgressiveTax）
+
+    Args:
+        income (array_like): 綜合所得淨額
+
+    Returns:
+        np.ndarray: 稅額，不低於 0
+    """
+    brackets = bracket_arrays()
+    income = np.asarray(income, dtype=np.float64)
+    index = bracket_index(income)
+    # 與網頁相同以「所得 × 稅率 - 速算扣除額」計算，浮點結果逐位一致
+    return np.maximum(0.0, income * brackets['rates'][index] - brackets['deductions'][index])
+
+
+def marginal_rate(income) -> 'np.ndarray':
+    """邊際稅率（getMarginalTaxRate），以百分比整數表示"""
+    rates = np.rint(bracket_arrays()['rates'] * 100).astype(np.int64)
+    return rates[bracket_index(np.asarray(income, dtype=np.float64))]
+
+
+def corporate_tax(taxable_income) -> 'np.ndarray':
+    """營所稅（calculateCorporateTax）：課稅所得額不超過起徵額時免稅"""
+    taxable_income = np.asarray(taxable_income, dtype=np.float64)
+    return np.where(taxable_income <= CORPORATE_TAX_THRESHOLD, 0.0, taxable_income * CORPORATE_TAX_RATE)
+
+
+def deductions(married, children) -> 'np.ndarray':
+    """
+    免稅額與標準扣除額合計（calculateDeductions 的 total）
+
+    Args:
+        married (array_like): 是否已婚（網頁中 maritalStatus 不是 'single' 即視為夫妻）
+        children (array_like): 子女人數，不大於 0 時不計
+
+    Returns:
+        np.ndarray: 免稅額 + 標準扣除額
+    """
+    married = np.asarray(married, dtype=bool)
+    children = np.asarray(children, dtype=np.float64)
+    exemption = np.where(married, EXEMPTION * 2, EXEMPTION) + np.where(children > 0, EXEMPTION * children, 0)
+    return exemption + np.where(married, STANDARD_DEDUCTION['married'], STANDARD_DEDUCTION['single'])
+
+
+def net_salary(salary) -> 'np.ndarray':
+    """扣除薪資特別扣除額後的薪資所得"""
+    salary = np.asarray(salary, dtype=np.float64)
+    return np.maximum(0.0, salary - np.minimum(salary, SALARY_DEDUCTION))
+
+
+def evaluate_income(columns: Dict[str, 'np.ndarray']) -> Dict[str, 'np.ndarray']:
+    """income 模式：所得淨額 → 稅額與邊際稅率"""
+    income = columns['income']
+    return {'tax': progressive_tax(income), 'marginalRate': marginal_rate(income)}
+
+
+def evaluate_salary(columns: Dict[str, 'np.ndarray']) -> Dict[str, 'np.ndarray']:
+    """salary 模式：薪資、婚姻狀況與子女 → 綜所稅"""
+    total = deductions(columns['maritalStatus'] != 'single', columns['children'])
+    salary = net_salary(columns['salary'])
+    taxable = np.maximum(0.0, salary - total)
+    return {
+        'deductions': total,
+        'netSalary': salary,
+        'taxableIncome': taxable,
+        'tax': progressive_tax(taxable),
+        'marginalRate': marginal_rate(taxable),
+    }
+
+
+def evaluate_scenarios(columns: Dict[str, 'np.ndarray']) -> Dict[str, 'np.ndarray']:
+    """
+    scenario 模式：與網頁 performCalculation 相同的公司制 / 行號制比較
+
+    方式一（擴大書審）不適用時，其課稅所得額與營所稅為 inf；文字欄位以代碼表示
+    （索引對應 PROFIT_SOURCES、TAX_METHODS、RECOMMENDATIONS）。
+    驗證失敗的列在 error 欄位帶有與網頁相同的訊息，其餘結果為 nan。
+
+    Args:
+        columns (Dict[str, np.ndarray]): MODE_INPUTS['scenario'] 的各欄
+
+    Returns:
+        Dict[str, np.ndarray]: MODE_OUTPUTS['scenario'] 的各欄
+    """
+    revenue = columns['revenue']
+    profit_rate = columns['profitRate']
+    income_standard = columns['incomeStandard']
+    net_profit_rate = columns['netProfitRate']
+    shareholding = columns['shareholdingRatio']
+    distribution = columns['distributionRatio']
+    source = columns['profitSource']
+
+    # 驗證順序與網頁相同，每列只報告第一個錯誤（由後往前寫入，前面的檢查覆蓋後面的）
+    error = np.full(len(revenue), '', dtype=object)
+    checks = [
+        (revenue == 0, ERROR_REVENUE),
+        ((income_standard == 0) | (net_profit_rate == 0), ERROR_RATES),
+        ((shareholding <= 0) | (shareholding > 100), ERROR_SHAREHOLDING),
+        ((distribution < 0) | (distribution > 100), ERROR_DISTRIBUTION),
+    ]
+    for failed, message in reversed(checks):
+        error[failed] = message
+    invalid = error != ''
+
+    # 1. 三種方式的課稅所得額與營所稅；方式一不適用時為 inf，不會被選為最低
+    book_audit = (revenue <= BOOK_AUDIT_REVENUE_LIMIT) & (profit_rate > 0)
+    taxable = np.stack([
+        np.where(book_audit, revenue * (profit_rate / 100), np.inf),
+        revenue * (income_standard / 100),
+        revenue * (net_profit_rate / 100),
+    ])
+    corporate = np.stack([np.where(book_audit, corporate_tax(taxable[0]), np.inf),
+                          corporate_tax(taxable[1]), corporate_tax(taxable[2])])
+    after_tax = np.stack([np.where(book_audit, taxable[0] - corporate[0], 0.0),
+                          taxable[1] - corporate[1], taxable[2] - corporate[2]])
+
+    # 2. 營所稅最低的方式；同額時依方式一、二、三的順序
+    selected = np.argmin(corporate, axis=0)
+    rows = np.arange(len(revenue))
+
+    # 3. 盈餘分配來源：擴大書審不適用時改用最優方式，未知的來源也視為最優
+    distribution_source = selected.copy()
+    distribution_source[(source == 'bookAudit') & book_audit] = 0
+    distribution_source[source == 'standard'] = 1
+    distribution_source[source == 'netProfit'] = 2
+    distributed_after_tax = after_tax[distribution_source, rows]
+    distributed_corporate = corporate[distribution_source, rows]
+
+    distributable = distributed_after_tax - distributed_after_tax * LEGAL_RESERVE_RATE
+    actual_distributed = distributable * (distribution / 100)
+    retained = distributable - actual_distributed
+    retained_tax = np.where(retained > 0, retained * RETAINED_EARNINGS_TAX_RATE, 0.0)
+
+    # 4. 個人綜所稅
+    total_deductions = deductions(columns['maritalStatus'] != 'single', columns['children'])
+    salary = net_salary(columns['salary'])
+
+    # 情境 A：公司制，股利合併計稅與分開計稅取較低者
+    dividend = actual_distributed * (shareholding / 100)
+    health = np.where(dividend >= HEALTH_INSURANCE_THRESHOLD, dividend * HEALTH_INSURANCE_RATE, 0.0)
+    taxable_a1 = np.maximum(0.0, dividend + salary - total_deductions)
+    tax_a1 = progressive_tax(taxable_a1)
+    credit = np.minimum(np.minimum(dividend * DIVIDEND_CREDIT_RATE, DIVIDEND_CREDIT_LIMIT), tax_a1)
+    final_a1 = np.maximum(0.0, tax_a1 - credit)
+    final_a2 = dividend * DIVIDEND_SEPARATE_RATE + progressive_tax(np.maximum(0.0, salary - total_deductions))
+    combined = final_a1 <= final_a2
+    final_a = np.where(combined, final_a1, final_a2)
+
+    # 情境 B：行號制，以營所稅最優方式的課稅所得額併入綜所稅
+    selected_taxable = taxable[selected, rows]
+    taxable_b = np.maximum(0.0, selected_taxable + salary - total_deductions)
+    tax_b = progressive_tax(taxable_b)
+
+    total_company = distributed_corporate + retained_tax + final_a + health
+    results = {
+        'taxableIncome1': taxable[0], 'taxableIncome2': taxable[1], 'taxableIncome3': taxable[2],
+        'corporateTax1': corporate[0], 'corporateTax2': corporate[1], 'corporateTax3': corporate[2],
+        'selectedMethod': selected,
+        'distributionSource': distribution_source,
+        'actualDistributedProfit': actual_distributed,
+        'retainedEarningsTax': retained_tax,
+        'personalDividend': dividend,
+        'healthInsurance': health,
+        'taxMethod': np.where(combined, 0, 1),
+        'finalTaxA': final_a,
+        'marginalRateA': marginal_rate(taxable_a1),
+        'personalTaxB': tax_b,
+        'marginalRateB': marginal_rate(taxable_b),
+        'totalTaxCompany': total_company,
+        'totalTaxSole': tax_b,
+        'recommended': np.where(total_company < tax_b, 0, 1),
+        'taxDifference': np.abs(total_company - tax_b),
+        'netIncomeCompany': dividend - final_a - health,
+        'netIncomeSole': selected_taxable - tax_b,
+    }
+    if invalid.any():
+        for name, values in results.items():
+            values = values.astype(np.float64)
+            values[invalid] = np.nan
+            results[name] = values
+    results['error'] = error
+    return results
+
+
+EVALUATORS = {
+    'scenario': evaluate_scenarios,
+    'salary': evaluate_salary,
+    'income': evaluate_income,
+}
+
+
+def _js_parse(text: str, pattern, cast) -> float:
+    match = pattern.match(text)
+    return cast(match.group(1)) if match else 0.0
+
+
+def parse_column(values: Sequence[str], kind: str, default):
+    """
+    以網頁表單的規則解析一欄文字
+
+    數值欄位與 parseFloat(...) || 默認值 相同：無法解析、nan 或 0 都換成默認值；
+    int 與 parseInt 相同捨去小數。整欄能直接轉換時以 NumPy 一次轉換，否則逐格解析前綴。
+
+    Args:
+        values (Sequence[str]): 欄位文字
+        kind (str): 'money'、'float'、'int' 或 'text'
+        default: 默認值
+
+    Returns:
+        np.ndarray: 數值欄位為 float64，text 為物件陣列
+    """
+    if kind == 'text':
+        column = np.array(values, dtype=object)
+        column[column == ''] = default
+        return column
+    text = np.array(values, dtype=np.str_)
+    if kind == 'money':
+        text = np.char.replace(text, ',', '')
+    try:
+        column = text.astype(np.int64 if kind == 'int' else np.float64).astype(np.float64)
+    except ValueError:
+        pattern, cast = (_JS_INT, int) if kind == 'int' else (_JS_FLOAT, float)
+        column = np.array([_js_parse(value, pattern, cast) for value in text.tolist()], dtype=np.float64)
+    column[np.isnan(column) | (column == 0)] = default
+    return column
+
+
+def detect_mode(header: Sequence[str]) -> str:
+    """依欄位名稱選擇模式"""
+    for mode, field in (('scenario', 'revenue'), ('salary', 'salary'), ('income', 'income')):
+        if field in header:
+            return mode
+    raise ValueError(f"無法判斷模式：需要 revenue、salary 或 income 欄位（實際為 {', '.join(header)}）")
+
+
+def format_column(name: str, values: 'np.ndarray', decimals: int) -> List[str]:
+    """把一欄結果轉為 CSV 文字；inf 與 nan（不適用或驗證失敗）輸出為空白"""
+    if name in _LABELS:
+        labels = np.array(('',) + _LABELS[name], dtype=object)
+        codes = np.where(np.isnan(values.astype(np.float64)), -1, values).astype(np.int64)
+        return labels[codes + 1].tolist()
+    if values.dtype == object:
+        return values.tolist()
+    finite = np.isfinite(values)
+    values = np.where(finite, values, 0.0)
+    if name in _INTEGER_OUTPUTS:
+        text = list(map(str, values.astype(np.int64).tolist()))
+    else:
+        # 逐格以 str.format 格式化（比 np.char.mod 快），四捨五入為 0 的負數不輸出 -0.00
+        zero = (values < 0) & (values > -0.5 * 10.0 ** -decimals)
+        text = list(map(f'{{:.{decimals}f}}'.format, np.where(zero, 0.0, values).tolist()))
+    for index in np.flatnonzero(~finite).tolist():
+        text[index] = ''
+    return text
+
+
+def iter_chunks(reader: Iterator[List[str]], width: int, chunk_size: int) -> Iterator[List[List[str]]]:
+    """每次取出 chunk_size 列，欄位不足的列補上空白"""
+    while True:
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        yield [row if len(row) >= width else row + [''] * (width - len(row)) for row in rows]
+
+
+def process_csv(source: TextIO, dest: TextIO, mode: Optional[str] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, decimals: int = DEFAULT_DECIMALS) -> int:
+    """
+    串流計算 CSV：每塊轉成欄位陣列一次計算，結果欄位附加在原有欄位之後
+
+    Args:
+        source (TextIO): 輸入 CSV（第一列為欄位名稱）
+        dest (TextIO): 輸出 CSV
+        mode (str): 'scenario'、'salary' 或 'income'，None 表示依欄位判斷
+        chunk_size (int): 每塊的列數
+        decimals (int): 金額的小數位數
+
+    Returns:
+        int: 計算的列數
+
+    Raises:
+        ValueError: 輸入為空、無法判斷模式或缺少必要欄位
+    """
+    _require_numpy()
+    reader = csv.reader(source)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("輸入沒有欄位名稱")
+    mode = mode or detect_mode(header)
+    inputs = MODE_INPUTS[mode]
+    outputs = MODE_OUTPUTS[mode]
+    positions = {name: index for index, name in enumerate(header)}
+    # 各模式的第一個欄位（營收、薪資或所得）必須存在，其餘欄位可以省略而使用默認值
+    if inputs[0][0] not in positions:
+        raise ValueError(f"{mode} 模式需要 {inputs[0][0]} 欄位")
+
+    writer = csv.writer(dest, lineterminator='\n')
+    writer.writerow(header + [name for name in outputs if name not in positions])
+    total = 0
+    for rows in iter_chunks(reader, len(header), max(1, chunk_size)):
+        fields = list(zip(*rows))
+        columns = {}
+        for name, kind, default in inputs:
+            values = fields[positions[name]] if name in positions else [''] * len(rows)
+            columns[name] = parse_column(values, kind, default)
+        with np.errstate(invalid='ignore'):
+            results = EVALUATORS[mode](columns)
+        formatted = [format_column(name, results[name], decimals) for name in outputs]
+        # 與輸入同名的結果欄位（例如重新計算過的檔案）直接覆寫
+        for name, column in zip(outputs, formatted):
+            if name in positions:
+                fields[positions[name]] = column
+        extra = [column for name, column in zip(outputs, formatted) if name not in positions]
+        writer.writerows(zip(*fields, *extra))
+        total += len(rows)
+    return total
+
+
+# ==================== 與網頁版比對 ====================
+
+# 在 node 中以最小的 DOM 替身執行網頁的 <script>：表單值由樣本提供，console.log 的中間結果收集起來
+_NODE_HARNESS = r"""
+const vm = require('vm');
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+let values = {};
+let logs = [];
+const noop = () => {};
+function element(id) {
+  return {
+    get value() { return id in values ? String(values[id]) : ''; },
+    set value(v) { values[id] = v; },
+    innerHTML: '', textContent: '', className: '', style: {},
+    classList: { add: noop, remove: noop, toggle: noop, contains: () => false },
+    addEventListener: noop, scrollIntoView: noop, focus: noop,
+  };
+}
+const context = {
+  console: { log: (label, data) => logs.push([String(label), data]), error: noop, warn: noop },
+  document: {
+    getElementById: element, addEventListener: noop,
+    querySelectorAll: () => [], querySelector: () => null, createElement: () => element(''),
+  },
+  window: { addEventListener: noop },
+  alert: noop, setTimeout: noop,
+};
+vm.createContext(context);
+vm.runInContext(input.script, context);
+const number = (v) => (v === Infinity ? 'Infinity' : v);
+const output = {
+  progressive: input.incomes.map((x) => number(context.calculateProgressiveTax(x))),
+  marginal: input.incomes.map((x) => Number(context.getMarginalTaxRate(x))),
+  corporate: input.incomes.map((x) => number(context.calculateCorporateTax(x))),
+  deductions: input.families.map(([status, children]) => context.calculateDeductions(status, children).total),
+  scenarios: input.scenarios.map((scenario) => {
+    values = scenario;
+    logs = [];
+    try {
+      context.performCalculation();
+    } catch (e) {
+      return { error: e.message };
+    }
+    const find = (prefix) => (logs.find(([label]) => label.startsWith(prefix)) || [null, {}])[1];
+    const incomes = find('💰');
+    const distribution = find('📊 盈餘分配');
+    const totals = find('🎯');
+    return {
+      taxableIncome1: number(incomes.taxableIncome1), taxableIncome2: incomes.taxableIncome2,
+      taxableIncome3: incomes.taxableIncome3, corporateTax1: number(incomes.corporateTax1),
+      corporateTax2: incomes.corporateTax2, corporateTax3: incomes.corporateTax3,
+      actualDistributedProfit: distribution['實際分配'], retainedEarningsTax: distribution['保留盈餘稅'],
+      totalTaxCompany: totals.totalTaxCompany, totalTaxSole: totals.totalTaxSole,
+      recommended: totals.recommended,
+    };
+  }),
+};
+process.stdout.write(JSON.stringify(output));
+"""
+
+# 與網頁 console.log 對應的 scenario 輸出欄位
+_PARITY_FIELDS = ('taxableIncome1', 'taxableIncome2', 'taxableIncome3', 'corporateTax1', 'corporateTax2',
+                  'corporateTax3', 'actualDistributedProfit', 'retainedEarningsTax', 'totalTaxCompany',
+                  'totalTaxSole', 'recommended')
+
+
+def extract_script(html_path: str = TAX_CALCULATOR_HTML) -> str:
+    """取出稅務計算機的 <script> 內容"""
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    match = re.search(r'<script>(.*?)</script>', html, re.S)
+    if not match:
+        raise ValueError(f"{html_path} 中找不到 <script>")
+    return match.group(1)
+
+
+def sample_inputs(seed: int = 2024, size: int = 400) -> Dict[str, list]:
+    """
+    比對用的樣本：級距邊界附近的所得、家庭組合，以及涵蓋各分支的隨機情境
+
+    Returns:
+        Dict[str, list]: incomes、families 與 scenarios（表單欄位 -> 文字）
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    limits = [limit for limit, _, _ in TAX_BRACKETS[:-1]] + [CORPORATE_TAX_THRESHOLD]
+    edges = [value + delta for value in limits for delta in (-1, -0.5, 0, 0.5, 1)]
+    incomes = [0, -1000, 0.01] + edges + rng.uniform(0, 8e6, size).round(2).tolist()
+    families = [[status, children] for status in ('single', 'married', 'widowed') for children in (-1, 0, 1, 3)]
+
+    scenarios = [
+        # 營收超過擴大書審上限、未填純益率、各盈餘來源、比例為 0 的表單默認值與驗證錯誤
+        {'revenue': '30,000,001', 'profitRate': '6', 'incomeStandard': '8', 'netProfitRate': '10'},
+        {'revenue': '5000000', 'profitRate': '', 'incomeStandard': '9', 'netProfitRate': '7',
+         'profitSource': 'bookAudit'},
+        {'revenue': '1,200,000', 'profitRate': '6', 'incomeStandard': '6', 'netProfitRate': '6',
+         'distributionRatio': '0', 'shareholdingRatio': '0'},
+        {'revenue': '0', 'incomeStandard': '8', 'netProfitRate': '10'},
+        {'revenue': '1000000', 'incomeStandard': '', 'netProfitRate': '10'},
+        {'revenue': '1000000', 'incomeStandard': '8', 'netProfitRate': '10', 'shareholdingRatio': '120'},
+        {'revenue': '1000000', 'incomeStandard': '8', 'netProfitRate': '10', 'distributionRatio': '-5'},
+    ]
+    sources = ('optimal', 'bookAudit', 'standard', 'netProfit')
+    for _ in range(size):
+        scenarios.append({
+            'revenue': str(int(rng.choice([rng.integers(100000, 3000000), rng.integers(3000000, 60000000)]))),
+            'profitRate': str(rng.choice([0, 6, 8, 10, 12.5])),
+            'incomeStandard': str(rng.choice([5, 8, 12, 20])),
+            'netProfitRate': str(rng.choice([3, 7, 10, 15, 30])),
+            'shareholdingRatio': str(rng.choice([25, 50, 100])),
+            'profitSource': str(rng.choice(sources)),
+            'distributionRatio': str(rng.choice([10, 50, 80, 100])),
+            'maritalStatus': str(rng.choice(['single', 'married'])),
+            'salary': str(int(rng.choice([0, rng.integers(0, 3000000)]))),
+            'children': str(int(rng.integers(0, 4))),
+        })
+    for scenario in scenarios:
+        for name, kind, default in MODE_INPUTS['scenario']:
+            scenario.setdefault(name, '' if kind != 'text' else default)
+    return {'incomes': incomes, 'families': families, 'scenarios': scenarios}
+
+
+def _mismatches(name: str, expected, actual) -> List[str]:
+    """逐項比對兩組數值（inf 與 'Infinity' 視為相同）"""
+    expected = np.array([np.inf if value == 'Infinity' else value for value in expected], dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    same = np.isclose(expected, actual, rtol=1e-12, atol=1e-9) | (expected == actual)
+    return [f"{name}[{index}]: 預期 {float(expected[index])!r}，實際 {float(actual[index])!r}"
+            for index in np.flatnonzero(~same)]
+
+
+def self_check(html_path: str = TAX_CALCULATOR_HTML, node: Optional[str] = None) -> List[str]:
+    """
+    以 node 執行網頁中的原始函數，與批次引擎逐項比對
+
+    沒有 node 時只檢查級距陣列本身（速算扣除額與累計稅額一致）。
+
+    Args:
+        html_path (str): 稅務計算機 HTML
+        node (str): node 執行檔，None 表示在 PATH 中尋找
+
+    Returns:
+        List[str]: 不一致的項目，空列表表示全部一致
+
+    Raises:
+        RuntimeError: node 執行失敗
+    """
+    brackets = bracket_arrays()
+    problems = _mismatches('TAX_BRACKETS', brackets['deductions'],
+                           brackets['floors'] * brackets['rates'] - brackets['base'])
+    node = node or shutil.which('node')
+    if node is None:
+        return problems
+
+    samples = sample_inputs()
+    payload = json.dumps(dict(samples, script=extract_script(html_path)), ensure_ascii=False)
+    completed = subprocess.run([node, '-e', _NODE_HARNESS], input=payload.encode('utf-8'),
+                               capture_output=True, timeout=120)
+    if completed.returncode != 0:
+        raise RuntimeError(f"node 執行失敗：{completed.stderr.decode('utf-8', 'replace').strip()}")
+    expected = json.loads(completed.stdout)
+
+    incomes = np.array(samples['incomes'], dtype=np.float64)
+    problems += _mismatches('calculateProgressiveTax', expected['progressive'], progressive_tax(incomes))
+    problems += _mismatches('getMarginalTaxRate', expected['marginal'], marginal_rate(incomes))
+    problems += _mismatches('calculateCorporateTax', expected['corporate'], corporate_tax(incomes))
+    families = samples['families']
+    problems += _mismatches('calculateDeductions', expected['deductions'],
+                            deductions([status != 'single' for status, _ in families],
+                                       [children for _, children in families]))
+
+    scenarios = samples['scenarios']
+    columns = {name: parse_column([scenario[name] for scenario in scenarios], kind, default)
+               for name, kind, default in MODE_INPUTS['scenario']}
+    with np.errstate(invalid='ignore'):
+        results = evaluate_scenarios(columns)
+    for index, reference in enumerate(expected['scenarios']):
+        if 'error' in reference or results['error'][index]:
+            if reference.get('error', '') != results['error'][index]:
+                problems.append(f"performCalculation[{index}]: 網頁錯誤 {reference.get('error')!r}，"
+                                f"批次錯誤 {results['error'][index]!r}")
+            continue
+        for name in _PARITY_FIELDS:
+            actual = results[name][index]
+            if name == 'recommended':
+                actual = RECOMMENDATIONS[int(actual)]
+                if actual != reference[name]:
+                    problems.append(f"{name}[{index}]: 網頁 {reference[name]}，批次 {actual}")
+                continue
+            problems += [f"performCalculation[{index}].{message}"
+                         for message in _mismatches(name, [reference[name]], [actual])]
+    return problems
+
+
+def _open_output(path: str):
+    """輸出到暫存檔，完成後才改名（中斷時不留下不完整的結果）"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    return os.fdopen(fd, 'w', encoding='utf-8', newline=''), tmp_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description='以 NumPy 批次計算稅務計算機的綜所稅與營所稅')
+    parser.add_argument('input', nargs='?', help='輸入 CSV（- 表示標準輸入）')
+    parser.add_argument('-o', '--output', default='-', help='輸出 CSV（默認 - 為標準輸出）')
+    parser.add_argument('--mode', choices=sorted(EVALUATORS), help='計算模式（默認依欄位判斷）')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='每塊的列數')
+    parser.add_argument('--decimals', type=int, default=DEFAULT_DECIMALS, help='金額的小數位數')
+    parser.add_argument('--self-check', action='store_true', help='以 node 執行網頁版並比對樣本結果')
+    parser.add_argument('--html', default=TAX_CALCULATOR_HTML, help='稅務計算機 HTML（--self-check 使用）')
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("❌ 批次引擎需要 NumPy，請執行: pip install numpy", file=sys.stderr)
+        return 1
+
+    if args.self_check:
+        has_node = shutil.which('node') is not None
+        if not has_node:
+            print("⚠️ 找不到 node，只檢查級距陣列，略過與網頁版的比對", file=sys.stderr)
+        try:
+            problems = self_check(args.html)
+        except (OSError, ValueError, RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"❌ 比對失敗: {e}", file=sys.stderr)
+            return 1
+        for problem in problems[:20]:
+            print(f"   ❌ {problem}", file=sys.stderr)
+        if problems:
+            print(f"❌ 與網頁版有 {len(problems)} 項不一致", file=sys.stderr)
+            return 1
+        print("✅ 批次引擎與網頁版的計算結果一致" if has_node else "✅ 級距陣列一致", file=sys.stderr)
+        return 0
+
+    if not args.input:
+        parser.error('需要輸入 CSV 或 --self-check')
+
+    start = time.perf_counter()
+    tmp_path = None
+    try:
+        with contextlib.ExitStack() as stack:
+            if args.input == '-':
+                source = sys.stdin
+            else:
+                source = stack.enter_context(open(args.input, 'r', encoding='utf-8-sig', newline=''))
+            if args.output == '-':
+                dest = sys.stdout
+            else:
+                dest, tmp_path = _open_output(args.output)
+                stack.enter_context(dest)
+            rows = process_csv(source, dest, args.mode, args.chunk_size, max(0, args.decimals))
+        if tmp_path:
+            os.replace(tmp_path, args.output)
+            tmp_path = None
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"✅ 已計算 {rows:,} 列（{elapsed:.2f} 秒，每秒 {rate:,.0f} 列）", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
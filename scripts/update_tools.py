@@ -6,264 +6,779 @@ GitHub Profile 工具掃描與更新腳本
 自動掃描所有倉庫並更新工具列表
 """
 
+import asyncio
 import os
-import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from functools import partial
+from itertools import chain
+from urllib.parse import quote
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 
-try:
-    from github import Github
-    import requests
-except ImportError:
-    print("📦 安裝必要的依賴...")
-    os.system("pip install PyGithub requests")
-    from github import Github
-    import requests
+# 讓 scripts/ 下的腳本可以導入倉庫根目錄的 dashboard 套件
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from dashboard.async_client import DEFAULT_CONCURRENCY, AsyncGitHubClient
+from dashboard import render
+from dashboard.badges import tool_images
+from dashboard.change_detect import noop_exit_code, stamp_stream
+from dashboard.graphql import GITHUB_API_URL, GraphQLClient, graphql_url_for
+from dashboard.history import MetricsHistory, Sample
+from dashboard.html_build import HtmlBuilder, payload_sizes
+from dashboard.metadata_cache import RepoMetadataCache, fingerprint
+from dashboard.publish import GitDataPublisher, PublishError
+from dashboard.readme_sections import Section, SectionError, update_sections
+from dashboard.scheduler import RequestScheduler, SchedulerError, install_scheduler
+from dashboard.telemetry import Telemetry, profiled
 
-def get_tools_list(github_token: str, username: str) -> List[Dict]:
+
+# 根目錄含有這些副檔名的文件即視為小工具倉庫
+TOOL_EXTENSIONS = ('.HTML', '.html', '.htm')
+
+# 倉庫清單來源：'rest' 逐倉庫請求，'graphql' 每 100 個倉庫一個請求
+ENGINES = ('rest', 'graphql')
+
+
+def _build_tool_info(name: str, description: Optional[str], url: str, repo_url: str,
+                     stars: int, forks: int, language: Optional[str], updated: str,
+                     files: List[str], topics: List[str]) -> Dict:
+    """組出工具資訊字典（REST 與 GraphQL 兩種來源共用）"""
+    return {
+        'name': name,
+        'description': description or '實用小工具',
+        'url': url,
+        'repo_url': repo_url,
+        'stars': stars,
+        'forks': forks,
+        'language': language or 'HTML',
+        'updated': updated,
+        'files': files,
+        'topics': topics
+    }
+
+
+def _probe_repo(repo, username: str,
+                metadata_cache: Optional[RepoMetadataCache] = None) -> Tuple[Optional[Dict], List[str]]:
+    """
+    檢查單一倉庫是否為工具並提取其資訊
+
+    Args:
+        repo: PyGithub Repository 物件
+        username: GitHub 用戶名
+        metadata_cache: 跨執行快取；倉庫未變更時不發送任何請求
+
+    Returns:
+        (工具資訊或 None, 日誌行列表)；日誌由呼叫端依序輸出，
+        讓並行掃描時的輸出保持穩定
+    """
+    log = [f"📂 檢查倉庫: {repo.name}"]
+    version = fingerprint(repo.pushed_at, repo.updated_at)
+
+    hit, probe = metadata_cache.lookup(repo.id, version) if metadata_cache else (False, None)
+    if hit:
+        log.append("   💾 自上次掃描後未變更，沿用快取")
+    else:
+        # 檢查是否有 HTML 文件（小工具的標誌）
+        tool_files = []
+        try:
+            contents = repo.get_contents("")
+            for content in contents:
+                if content.name.endswith(TOOL_EXTENSIONS):
+                    tool_files.append(content.name)
+                    log.append(f"   ✓ 找到工具文件: {content.name}")
+        except SchedulerError:
+            # 被限流時整次掃描失敗，而不是默默少掉一個工具
+            raise
+        except Exception as e:
+            # 讀取失敗不寫入快取，下次重新探測
+            log.append(f"   ⚠️  無法讀取內容: {e}")
+            return None, log
+
+        # 不是工具的倉庫不再請求其他資訊
+        if tool_files:
+            # 獲取倉庫語言
+            languages = repo.get_languages()
+            probe = {
+                'files': tool_files,
+                'language': max(languages, key=languages.get) if languages else None,
+                'topics': list(repo.get_topics()),
+            }
+        if metadata_cache is not None:
+            metadata_cache.store(repo.id, version, probe)
+
+    if probe is None:
+        return None, log
+
+    # 倉庫清單本身已包含 Pages 狀態，不需額外請求
+    if repo.has_pages:
+        pages_url = f"https://{username}.github.io/{repo.name}/"
+        log.append(f"   ✓ Pages URL: {pages_url}")
+    else:
+        # 如果沒有 Pages，使用倉庫 URL
+        pages_url = repo.html_url
+        log.append(f"   ℹ️  使用倉庫 URL: {pages_url}")
+
+    tool_info = _build_tool_info(
+        repo.name, repo.description, pages_url, repo.html_url,
+        repo.stargazers_count, repo.forks_count, probe['language'],
+        repo.updated_at.strftime('%Y-%m-%d'), probe['files'], probe['topics'],
+    )
+    log.append(f"   ✅ 已添加工具: {repo.name}\n")
+    return tool_info, log
+
+
+def _inventory_tool(node: Dict, username: str) -> Tuple[Optional[Dict], List[str]]:
+    """
+    由 GraphQL 倉庫清單節點判斷是否為工具並提取其資訊（不發送任何請求）
+
+    Args:
+        node: Inventory 查詢的 repositories 節點
+        username: GitHub 用戶名
+
+    Returns:
+        (工具資訊或 None, 日誌行列表)
+    """
+    log = [f"📂 檢查倉庫: {node['name']}"]
+
+    # 空倉庫沒有 HEAD，object 為 null
+    tree = node.get('object')
+    if not tree:
+        log.append("   ⚠️  無法讀取內容: 倉庫沒有任何提交")
+        return None, log
+
+    tool_files = []
+    for entry in tree.get('entries', []):
+        if entry['name'].endswith(TOOL_EXTENSIONS):
+            tool_files.append(entry['name'])
+            log.append(f"   ✓ 找到工具文件: {entry['name']}")
+    if not tool_files:
+        return None, log
+
+    # 有 github-pages 部署即表示已啟用 Pages
+    if node['deployments']['totalCount']:
+        pages_url = f"https://{username}.github.io/{node['name']}/"
+        log.append(f"   ✓ Pages URL: {pages_url}")
+    else:
+        pages_url = node['url']
+        log.append(f"   ℹ️  使用倉庫 URL: {pages_url}")
+
+    language = node.get('primaryLanguage') or {}
+    topics = [item['topic']['name'] for item in node['repositoryTopics']['nodes']]
+
+    tool_info = _build_tool_info(
+        node['name'], node.get('description'), pages_url, node['url'],
+        node['stargazerCount'], node['forkCount'], language.get('name'),
+        node['updatedAt'][:10], tool_files, topics,
+    )
+    log.append(f"   ✅ 已添加工具: {node['name']}\n")
+    return tool_info, log
+
+
+def get_tools_list(github_token: str, username: str, max_workers: int = 1,
+                   cache_dir: Optional[str] = None,
+                   base_url: str = GITHUB_API_URL,
+                   telemetry: Optional[Telemetry] = None,
+                   engine: str = 'rest',
+                   metadata_cache: Optional[RepoMetadataCache] = None,
+                   scheduler: Optional[RequestScheduler] = None) -> List[Dict]:
     """
     掃描所有倉庫並提取工具資訊
     
     Args:
         github_token: GitHub Personal Access Token
         username: GitHub 用戶名
+        max_workers: 同時檢查的倉庫數量上限，1 表示逐一掃描
+        cache_dir: 條件請求快取目錄，None 表示不使用快取
+        base_url: GitHub API 基礎網址（Enterprise 或本地測試伺服器）
+        telemetry: 遙測收集器，提供時統計每個 API 請求
+        engine: 倉庫清單來源，'rest'（逐倉庫請求）或 'graphql'（單一分頁查詢）
+        metadata_cache: 跨執行的倉庫中繼資料快取（REST 模式使用；GraphQL 清單本身只需一個請求）
+        scheduler: 請求排程器（速率限制退避與請求預算），None 表示以 max_workers 為並行上限新建
     
     Returns:
-        工具列表
-    """
-    g = Github(github_token)
-    user = g.get_user(username)
+        工具列表（依 API 返回的倉庫順序排列）
     
-    tools = []
+    Raises:
+        SchedulerError: 重試後仍被速率限制，或請求預算用完
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"未知的資料來源: {engine}，可用: {', '.join(ENGINES)}")
+    max_workers = max(1, max_workers)
+    http_cache = None
+    if telemetry is not None:
+        telemetry.install()
+    install_scheduler(scheduler or RequestScheduler(max_concurrency=max_workers))
+    if cache_dir:
+        from dashboard.http_cache import enable_http_cache
+        http_cache = enable_http_cache(cache_dir, pool_size=max_workers)
     
     print(f"\n{'='*60}")
     print(f"🔍 掃描用戶 {username} 的倉庫...")
+    if engine == 'graphql':
+        print("⚡ GraphQL 模式: 每 100 個倉庫一個請求")
+    elif max_workers > 1:
+        print(f"⚡ 並行模式: 最多 {max_workers} 個倉庫同時檢查")
     print(f"{'='*60}\n")
     
-    for repo in user.get_repos():
-        # 跳過 Profile 倉庫本身
-        if repo.name == username:
-            continue
+    tools = []
+    if engine == 'graphql':
+        client = GraphQLClient(github_token, url=graphql_url_for(base_url))
+        # 跳過 Profile 倉庫本身；其餘倉庫在本地過濾，不再逐一請求
+        for node in client.iter_repositories(username):
+            if node['name'] == username:
+                continue
+            tool_info, log = _inventory_tool(node, username)
+            print('\n'.join(log))
+            if tool_info is not None:
+                tools.append(tool_info)
+    else:
+        # PyGithub 只有 REST 模式需要，在此才導入（依賴由 requirements.txt 安裝，不在執行時安裝）
+        from github import Github
         
-        print(f"📂 檢查倉庫: {repo.name}")
+        # 節流交給排程器，不再固定每 0.25 秒一個請求
+        g = Github(github_token, base_url=base_url, pool_size=max_workers, seconds_between_requests=None)
+        user = g.get_user(username)
         
-        # 檢查是否有 HTML 文件（小工具的標誌）
-        has_html = False
-        tool_files = []
+        # 跳過 Profile 倉庫本身
+        repos = (repo for repo in user.get_repos() if repo.name != username)
+        probe = partial(_probe_repo, username=username, metadata_cache=metadata_cache)
         
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # executor.map 依輸入順序返回結果，工具網格的順序因此保持穩定
+            for tool_info, log in executor.map(probe, repos):
+                print('\n'.join(log))
+                if tool_info is not None:
+                    tools.append(tool_info)
+    
+    print(f"{'='*60}")
+    print(f"✅ 共找到 {len(tools)} 個工具")
+    if http_cache is not None:
+        print(f"💾 HTTP 快取: {http_cache.hits} 命中 / {http_cache.misses} 未命中")
+    if metadata_cache is not None and engine == 'rest':
+        print(f"💾 倉庫快取: {metadata_cache.hits} 個未變更 / {metadata_cache.misses} 個重新探測")
+    print(f"{'='*60}\n")
+    
+    return tools
+
+
+async def _probe_repo_async(client: AsyncGitHubClient, repo: Dict, username: str,
+                            metadata_cache: Optional[RepoMetadataCache] = None
+                            ) -> Tuple[Optional[Dict], List[str]]:
+    """
+    _probe_repo 的非同步版本，輸入為倉庫清單中的 JSON
+
+    Args:
+        client: 非同步客戶端
+        repo: GET /users/{user}/repos 返回的倉庫 JSON
+        username: GitHub 用戶名
+        metadata_cache: 跨執行快取；倉庫未變更時不發送任何請求
+
+    Returns:
+        (工具資訊或 None, 日誌行列表)
+    """
+    log = [f"📂 檢查倉庫: {repo['name']}"]
+    path = f"/repos/{repo['full_name']}"
+    version = fingerprint(repo.get('pushed_at'), repo.get('updated_at'))
+
+    hit, probe = metadata_cache.lookup(repo['id'], version) if metadata_cache else (False, None)
+    if hit:
+        log.append("   💾 自上次掃描後未變更，沿用快取")
+    else:
+        tool_files = []
         try:
-            contents = repo.get_contents("")
-            for content in contents:
-                if content.name.endswith(('.HTML', '.html', '.htm')):
-                    has_html = True
-                    tool_files.append(content.name)
-                    print(f"   ✓ 找到工具文件: {content.name}")
+            for content in await client.get_json(f"{path}/contents"):
+                if content['name'].endswith(TOOL_EXTENSIONS):
+                    tool_files.append(content['name'])
+                    log.append(f"   ✓ 找到工具文件: {content['name']}")
+        except SchedulerError:
+            raise
         except Exception as e:
-            print(f"   ⚠️  無法讀取內容: {e}")
-            continue
-        
-        # 檢查是否啟用 GitHub Pages
-        pages_url = None
-        try:
-            # 嘗試獲取 Pages 資訊
-            pages = repo.get_pages_build()
-            pages_url = f"https://{username}.github.io/{repo.name}/"
-            print(f"   ✓ Pages URL: {pages_url}")
-        except:
-            # 如果沒有 Pages，使用倉庫 URL
-            pages_url = repo.html_url
-            print(f"   ℹ️  使用倉庫 URL: {pages_url}")
-        
-        if has_html or tool_files:
-            # 獲取倉庫語言
-            languages = repo.get_languages()
-            main_language = max(languages, key=languages.get) if languages else 'HTML'
-            
-            tool_info = {
-                'name': repo.name,
-                'description': repo.description or '實用小工具',
-                'url': pages_url,
-                'repo_url': repo.html_url,
-                'stars': repo.stargazers_count,
-                'forks': repo.forks_count,
-                'language': main_language,
-                'updated': repo.updated_at.strftime('%Y-%m-%d'),
+            log.append(f"   ⚠️  無法讀取內容: {e}")
+            return None, log
+
+        if tool_files:
+            # 語言與主題彼此獨立，同時請求
+            languages, topics = await asyncio.gather(
+                client.get_json(f"{path}/languages"),
+                client.get_json(f"{path}/topics"),
+            )
+            probe = {
                 'files': tool_files,
-                'topics': list(repo.get_topics())
+                'language': max(languages, key=languages.get) if languages else None,
+                'topics': list(topics.get('names', [])),
             }
+        if metadata_cache is not None:
+            metadata_cache.store(repo['id'], version, probe)
+
+    if probe is None:
+        return None, log
+
+    if repo.get('has_pages'):
+        pages_url = f"https://{username}.github.io/{repo['name']}/"
+        log.append(f"   ✓ Pages URL: {pages_url}")
+    else:
+        pages_url = repo['html_url']
+        log.append(f"   ℹ️  使用倉庫 URL: {pages_url}")
+
+    tool_info = _build_tool_info(
+        repo['name'], repo.get('description'), pages_url, repo['html_url'],
+        repo['stargazers_count'], repo['forks_count'], probe['language'],
+        repo['updated_at'][:10], probe['files'], probe['topics'],
+    )
+    log.append(f"   ✅ 已添加工具: {repo['name']}\n")
+    return tool_info, log
+
+
+async def get_tools_list_async(github_token: str, username: str,
+                               concurrency: int = DEFAULT_CONCURRENCY,
+                               base_url: str = GITHUB_API_URL,
+                               engine: str = 'rest',
+                               metadata_cache: Optional[RepoMetadataCache] = None,
+                               scheduler: Optional[RequestScheduler] = None) -> List[Dict]:
+    """
+    get_tools_list 的非同步版本，返回相同格式的工具列表
+
+    REST 引擎列出倉庫後以 asyncio.gather 同時檢查所有倉庫，
+    同時在途的請求數由 concurrency 限制（共用 keep-alive 連線池）。
+
+    Args:
+        github_token: GitHub Personal Access Token
+        username: GitHub 用戶名
+        concurrency: 同時在途的請求上限
+        base_url: GitHub API 基礎網址
+        engine: 倉庫清單來源，'rest' 或 'graphql'
+        metadata_cache: 跨執行的倉庫中繼資料快取（REST 模式使用）
+        scheduler: 請求排程器，None 表示以 concurrency 為並行上限新建
+
+    Returns:
+        工具列表（依 API 返回的倉庫順序排列）
+
+    Raises:
+        SchedulerError: 重試後仍被速率限制，或請求預算用完
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"未知的資料來源: {engine}，可用: {', '.join(ENGINES)}")
+
+    print(f"\n{'='*60}")
+    print(f"🔍 掃描用戶 {username} 的倉庫...")
+    print(f"⚡ 非同步模式: 最多 {concurrency} 個並行請求")
+    print(f"{'='*60}\n")
+
+    async with AsyncGitHubClient(github_token, base_url=base_url, concurrency=concurrency,
+                                 scheduler=scheduler) as client:
+        if engine == 'graphql':
+            results = [_inventory_tool(node, username)
+                       async for node in client.iter_repositories(username)
+                       if node['name'] != username]
+        else:
+            # 跳過 Profile 倉庫本身
+            repos = [repo async for repo in client.paginate(f"/users/{username}/repos")
+                     if repo['name'] != username]
+            # gather 依輸入順序返回結果，工具網格的順序與同步版本相同
+            results = await asyncio.gather(*(_probe_repo_async(client, repo, username, metadata_cache)
+                                             for repo in repos))
+
+    tools = []
+    for tool_info, log in results:
+        print('\n'.join(log))
+        if tool_info is not None:
             tools.append(tool_info)
-            print(f"   ✅ 已添加工具: {repo.name}\n")
-    
+
     print(f"{'='*60}")
     print(f"✅ 共找到 {len(tools)} 個工具")
+    if metadata_cache is not None and engine == 'rest':
+        print(f"💾 倉庫快取: {metadata_cache.hits} 個未變更 / {metadata_cache.misses} 個重新探測")
     print(f"{'='*60}\n")
-    
+
     return tools
 
 
-def generate_tools_markdown(tools: List[Dict]) -> str:
+def _tool_repo(tool: Dict) -> Tuple[str, str]:
+    """工具倉庫的 (owner, name)；name 也是建置輸出的目錄"""
+    owner, name = tool['repo_url'].rstrip('/').split('/')[-2:]
+    return owner, name
+
+
+def _build_tool(tool: Dict, builder: HtmlBuilder, session, base_url: str,
+                headers: Dict[str, str]) -> List[str]:
+    """
+    建置單一工具的 HTML 文件，並把合計的大小記在 tool['payload']
+
+    根目錄清單中的 blob SHA 即文件的內容雜湊：未變更的文件不下載也不重新壓縮。
+
+    Returns:
+        日誌行列表
+    """
+    owner, name = _tool_repo(tool)
+    api = f"{base_url.rstrip('/')}/repos/{owner}/{name}/contents"
+    log = [f"🏗️  建置工具: {name}"]
+    response = session.get(f"{api}/", headers=headers, timeout=30)
+    if response.status_code != 200:
+        log.append(f"   ⚠️  無法列出文件: HTTP {response.status_code}")
+        return log
+    shas = {item['name']: item['sha'] for item in response.json() if item.get('type') == 'file'}
+
+    entries = []
+    for filename in tool['files']:
+        key = f"{name}/{filename}"
+        entry = builder.cached(key, shas.get(filename, ''))
+        if entry is None:
+            raw = session.get(f"{api}/{quote(filename)}",
+                              headers={**headers, 'Accept': 'application/vnd.github.raw'}, timeout=30)
+            if raw.status_code != 200:
+                log.append(f"   ⚠️  無法下載 {filename}: HTTP {raw.status_code}")
+                return log
+            try:
+                entry = builder.build(key, raw.content, shas.get(filename))
+            except UnicodeDecodeError:
+                log.append(f"   ⚠️  {filename} 不是 UTF-8，略過")
+                return log
+            log.append(f"   ✓ {filename}: {render.format_size(entry['source'])} → "
+                       f"{render.format_size(entry['minified'])}")
+        else:
+            log.append(f"   💾 {filename}: 未變更，沿用上次的建置")
+        entries.append(entry)
+    tool['payload'] = payload_sizes(entries)
+    return log
+
+
+def build_tools(tools: List[Dict], github_token: str, build_dir: str,
+                base_url: str = GITHUB_API_URL, max_workers: int = 1) -> HtmlBuilder:
     """
-    生成工具列表的 Markdown
+    建置階段：壓縮每個工具的 HTML 文件並預先產生 gzip/brotli 版本
+    
+    輸出寫到 build_dir（可部署到 Pages 或上傳為產物），壓縮前後的大小記在
+    每個工具的 'payload' 中，工具網格會顯示載入量。個別工具失敗時只略過其大小，
+    並保留該工具上次的建置輸出。
     
     Args:
-        tools: 工具列表
+        tools: get_tools_list 的結果（就地加上 'payload'）
+        github_token: GitHub token
+        build_dir: 輸出目錄（含建置清單，應跨執行保留）
+        base_url: GitHub API 基礎網址
+        max_workers: 同時建置的工具數
     
     Returns:
-        Markdown 格式的工具列表
+        建置器（建置與略過的檔案數）
     """
-    if not tools:
-        return """
-<table>
-<tr>
-<td align="center">
-
-### 🔧 暫無工具
-
-目前還沒有可用的工具，敬請期待！
+    from dashboard.transport import get_session
+    
+    session = get_session()
+    headers = {'Authorization': f'token {github_token}'}
+    builder = HtmlBuilder(build_dir)
+    
+    def build(tool):
+        try:
+            log = _build_tool(tool, builder, session, base_url, headers)
+        except SchedulerError:
+            raise
+        except Exception as e:
+            log = [f"🏗️  建置工具: {tool['name']}", f"   ⚠️  建置失敗: {e}"]
+        if 'payload' not in tool:
+            # 暫時的失敗（例如 5xx）不清除上次的建置，只有已不在列表中的工具才會被移除
+            kept = builder.keep(f"{_tool_repo(tool)[1]}/")
+            if kept:
+                log.append(f"   💾 保留上次的建置（{kept} 個文件）")
+        return log
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for log in executor.map(build, tools):
+            print('\n'.join(log))
+    removed = builder.save()
+    print(f"🏗️  建置完成: {builder.built} 個文件，{builder.skipped} 個未變更略過，"
+          f"移除 {removed} 個已不存在的文件（{build_dir}）\n")
+    return builder
 
-[![提交建議](https://img.shields.io/badge/💡_提交建議-9C27B0?style=for-the-badge)](https://github.com/abc214315/abc214315/issues)
 
-</td>
-</tr>
-</table>
-"""
+def record_history(tools: List[Dict], history_path: str) -> Tuple[str, int]:
+    """
+    把每個工具與總計的星標、Fork 附加到指標歷史，並由歷史渲染趨勢行
     
-    lines = []
+    Args:
+        tools: 工具列表
+        history_path: 指標歷史檔路徑
     
-    # 開始表格
-    lines.append("\n<table>")
+    Returns:
+        (趨勢行, 附加的記錄數)；歷史中還不到兩筆總計記錄時趨勢行為空字串
+    """
+    samples = {f"tool:{tool['name']}": Sample(stars=tool['stars'], forks=tool['forks']) for tool in tools}
+    samples['tools'] = Sample(stars=sum(tool['stars'] for tool in tools),
+                              forks=sum(tool['forks'] for tool in tools))
+    history = MetricsHistory(history_path)
+    appended = history.record(samples)
+    print(f"📈 指標歷史: 附加 {appended} 筆記錄（{history_path}）")
     
-    # 每行 3 個工具
-    for i in range(0, len(tools), 3):
-        lines.append("<tr>")
-        
-        # 處理當前行的工具（最多 3 個）
-        row_tools = tools[i:i+3]
-        
-        for tool in row_tools:
-            # 提取工具顯示名稱
-            display_name = tool['name'].replace('-', ' ').replace('_', ' ').title()
-            
-            # 如果有 HTML 文件，列出它們
-            files_info = ""
-            if tool['files']:
-                files_list = ' '.join([f"`{f}`" for f in tool['files'][:3]])  # 最多顯示 3 個
-                files_info = f"\n\n**📄 文件**: {files_list}"
-            
-            # 主題標籤
-            topics_info = ""
-            if tool['topics']:
-                topics_badges = ' '.join([f"`{t}`" for t in tool['topics'][:3]])
-                topics_info = f"\n\n{topics_badges}"
-            
-            cell = f"""
-<td align="center" width="33%">
+    trend = render.trend_line('趨勢', (
+        render.trend('⭐', history.values('tools', 'stars', render.SPARK_POINTS)),
+        render.trend('🍴', history.values('tools', 'forks', render.SPARK_POINTS)),
+    ))
+    return trend, appended
 
-### 🔧 {display_name}
 
-<img src="https://img.icons8.com/fluency/96/000000/code.png" width="80px" />
-
-{tool['description']}{files_info}{topics_info}
+def render_tools(tools: List[Dict], fmt: str = 'html', trend: str = '',
+                 images: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """
+    逐段渲染工具列表、統計與頁尾
+    
+    Args:
+        tools: 工具列表
+        fmt: 'html'（預設的卡片網格）、'markdown'（表格）或 'json'
+        trend: record_history 的趨勢行，接在統計之後
+        images: HTML 網格中的圖片網址（dashboard.badges.tool_images），默認為外部服務
+    
+    Returns:
+        輸出片段，可以直接交給 update_readme 串流寫入
+    """
+    render.check_format(fmt)
+    if not tools:
+        return iter((render.empty_tools_html(images) if fmt == 'html' else "\n目前還沒有可用的工具，敬請期待！\n",))
+    
+    totals: Dict[str, int] = {}
+    
+    def body():
+        if fmt == 'json':
+            yield "\n```json\n"
+            yield from render.tools_grid(tools, fmt, totals)
+            yield "\n```"
+        else:
+            yield from render.tools_grid(tools, fmt, totals, images)
+        # 統計資訊（網格輸出完畢後 totals 才完整）
+        yield render.tools_stats(totals) + trend
+    
+    # 更新時間（資料雜湊附在其後，資料未變時沿用舊時間戳記）
+    update_time = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+    return chain(stamp_stream(body(), f"\n\n*🕐 最後更新: {update_time}*"), ('\n',))
 
-[![使用工具](https://img.shields.io/badge/🚀_立即使用-4CAF50?style=for-the-badge)]({tool['url']})
-[![查看源碼](https://img.shields.io/badge/📦_源碼-2196F3?style=for-the-badge)]({tool['repo_url']})
 
-⭐ {tool['stars']} | 🍴 {tool['forks']} | 💻 {tool['language']}
+def generate_tools_markdown(tools: List[Dict], fmt: str = 'html', trend: str = '',
+                            images: Optional[Dict[str, str]] = None) -> str:
+    """
+    生成工具列表的完整區段內容
+    
+    Args:
+        tools: 工具列表
+        fmt: 輸出格式，見 render_tools
+        trend: record_history 的趨勢行
+        images: HTML 網格中的圖片網址
+    
+    Returns:
+        區段內容
+    """
+    return ''.join(render_tools(tools, fmt, trend, images))
 
-📅 更新: {tool['updated']}
 
-</td>
-"""
-            lines.append(cell)
-        
-        # 如果該行不足 3 個，填充空單元格
-        for _ in range(3 - len(row_tools)):
-            lines.append('<td width="33%"></td>')
-        
-        lines.append("</tr>")
-    
-    lines.append("</table>\n")
+def publish_readme(tools_content: Section, readme_path: str, publisher: GitDataPublisher,
+                   files: Iterable[str] = (), deletions: Iterable[str] = ()) -> bool:
+    """
+    透過 Git Data API 直接提交 README（與指標歷史、徽章），不需要檢出倉庫
     
-    # 統計資訊
-    total_stars = sum(tool['stars'] for tool in tools)
-    total_forks = sum(tool['forks'] for tool in tools)
+    Args:
+        tools_content: 工具列表內容或片段
+        readme_path: README 在倉庫中的路徑
+        publisher: Git Data API 發布器
+        files: 與 README 放在同一個提交中的本地檔案（與遠端相同的略過）
+        deletions: 在同一個提交中從倉庫刪除的檔案（不再引用的舊徽章）
     
-    lines.append(f"\n**📊 統計**: {len(tools)} 個工具 | ⭐ {total_stars} Stars | 🍴 {total_forks} Forks")
+    Returns:
+        建立了新提交時返回 True
+    """
+    contents = {}
+    for path in files:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                contents[path] = f.read()
     
-    # 更新時間
-    update_time = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
-    lines.append(f"\n*🕐 最後更新: {update_time}*\n")
+    try:
+        sha = publisher.publish({readme_path: {'TOOLS_LIST': tools_content}}, contents,
+                                message=f"🤖 自動更新工具列表 [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]",
+                                deletions=deletions)
+    except SectionError:
+        print("⚠️  警告: README 中找不到標記 <!-- TOOLS_LIST:START --> 或 <!-- TOOLS_LIST:END -->")
+        return False
+    except PublishError as e:
+        print(f"❌ 錯誤: 發布失敗: {e}")
+        sys.exit(1)
     
-    return '\n'.join(lines)
+    if sha is None:
+        print("ℹ️  內容沒有變更，無需更新\n")
+        return False
+    retries = publisher.attempts - 1
+    print(f"✅ 已提交 {sha[:7]} 到 {publisher.repo_name}"
+          + (f"（ref 衝突重試 {retries} 次）" if retries else "") + "\n")
+    return True
 
 
-def update_readme(tools_content: str, readme_path: str = 'README.md') -> None:
+def update_readme(tools_content: Section, readme_path: str = 'README.md',
+                  publisher: Optional[GitDataPublisher] = None, files: Iterable[str] = (),
+                  deletions: Iterable[str] = ()) -> bool:
     """
     更新 README 文件
     
     Args:
-        tools_content: 工具列表內容
+        tools_content: 工具列表內容，或 render_tools 的輸出片段（串流寫入）
         readme_path: README 文件路徑
+        publisher: 設置時透過 Git Data API 直接提交，不寫入本地檔案
+        files: 透過 API 發布時一併提交的本地檔案（指標歷史、徽章）
+        deletions: 透過 API 發布時一併刪除的檔案（不再引用的舊徽章）
+    
+    Returns:
+        內容有變更並已寫入時返回 True
     """
     print(f"📖 讀取 {readme_path}...")
     
+    if publisher is not None:
+        return publish_readme(tools_content, readme_path, publisher, files, deletions)
+    
     try:
-        with open(readme_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        changed = update_sections(readme_path, {'TOOLS_LIST': tools_content})
     except FileNotFoundError:
         print(f"❌ 錯誤: 找不到 {readme_path}")
         sys.exit(1)
-    
-    # 替換工具列表部分
-    start_marker = '<!-- TOOLS_LIST:START -->'
-    end_marker = '<!-- TOOLS_LIST:END -->'
-    
-    if start_marker not in content or end_marker not in content:
-        print(f"⚠️  警告: README 中找不到標記 {start_marker} 或 {end_marker}")
+    except SectionError:
+        print("⚠️  警告: README 中找不到標記 <!-- TOOLS_LIST:START --> 或 <!-- TOOLS_LIST:END -->")
         print("請確保 README.md 中包含這些標記")
-        return
-    
-    pattern = r'<!-- TOOLS_LIST:START -->.*?<!-- TOOLS_LIST:END -->'
-    replacement = f'{start_marker}\n{tools_content}\n{end_marker}'
+        return False
     
-    updated_content = re.sub(pattern, replacement, content, flags=re.DOTALL)
-    
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-    
-    print(f"✅ {readme_path} 更新成功！\n")
+    if changed:
+        print(f"✅ {readme_path} 更新成功！\n")
+    else:
+        print("ℹ️  內容沒有變更，無需更新\n")
+    return changed
 
 
 def main():
     """主函數"""
     github_token = os.getenv('GITHUB_TOKEN')
     username = os.getenv('GITHUB_ACTOR', 'abc214315')
+    max_workers = int(os.getenv('TOOLS_MAX_WORKERS', '1'))
+    engine = os.getenv('TOOLS_ENGINE', 'rest')
+    async_concurrency = int(os.getenv('TOOLS_ASYNC_CONCURRENCY', '0'))
+    cache_dir = os.getenv('GITHUB_HTTP_CACHE')
+    metadata_path = os.getenv('TOOLS_METADATA_CACHE')
+    base_url = os.getenv('GITHUB_API_URL', GITHUB_API_URL)
+    metrics_path = os.getenv('DASHBOARD_METRICS')
+    profile_path = os.getenv('DASHBOARD_PROFILE')
+    # README 區段格式：html（預設的卡片網格）、markdown 或 json
+    output_format = render.check_format(os.getenv('TOOLS_FORMAT', 'html'))
+    # 指標歷史檔（提交到倉庫中），設置時在統計下方顯示星標與 Fork 趨勢
+    history_path = os.getenv('TOOLS_HISTORY')
+    # 自架徽章目錄（如 assets/badges），設置時網格中的圖片改用倉庫內以內容雜湊命名的 SVG
+    badge_dir = os.getenv('TOOLS_BADGE_DIR')
+    # 建置輸出目錄（含建置清單，應跨執行保留），設置時壓縮並預壓縮工具的 HTML，網格顯示載入量
+    build_dir = os.getenv('TOOLS_BUILD_DIR')
+    # 'api'：透過 Git Data API 直接提交 README，不需要檢出倉庫也不需要 git push
+    publish = os.getenv('DASHBOARD_PUBLISH', '').lower()
+    telemetry = Telemetry('工具儀表板')
+    # 本次執行的請求上限（含重試），0 表示不限制
+    telemetry.scheduler = RequestScheduler(max_concurrency=async_concurrency or max_workers,
+                                           budget=int(os.getenv('TOOLS_REQUEST_BUDGET', '0')))
     
     if not github_token:
         print("❌ 錯誤: 未設置 GITHUB_TOKEN 環境變量")
         print("請在 GitHub Actions 中設置 secrets.GITHUB_TOKEN")
         sys.exit(1)
     
+    publisher = None
+    if publish == 'api':
+        readme_repo = os.getenv('DASHBOARD_PUBLISH_REPO') or os.getenv('GITHUB_REPOSITORY')
+        if not readme_repo:
+            print("❌ 錯誤: DASHBOARD_PUBLISH=api 需要 GITHUB_REPOSITORY")
+            sys.exit(1)
+        publisher = GitDataPublisher(github_token, readme_repo,
+                                     branch=os.getenv('DASHBOARD_PUBLISH_BRANCH') or None, base_url=base_url)
+    elif publish:
+        print(f"❌ 錯誤: 未知的 DASHBOARD_PUBLISH: {publish}（可用: api）")
+        sys.exit(1)
+    
     print("\n" + "="*60)
     print("🚀 開始更新工具儀表板")
     print("="*60)
     
     try:
-        # 獲取工具列表
-        tools = get_tools_list(github_token, username)
+        metadata_cache = RepoMetadataCache.load(metadata_path) if metadata_path else None
         
-        # 生成 Markdown
-        tools_content = generate_tools_markdown(tools)
+        with profiled(profile_path):
+            # 獲取工具列表
+            with telemetry.stage('get_tools_list'):
+                if async_concurrency > 0:
+                    telemetry.install()
+                    tools = asyncio.run(get_tools_list_async(github_token, username,
+                                                             concurrency=async_concurrency,
+                                                             base_url=base_url, engine=engine,
+                                                             metadata_cache=metadata_cache,
+                                                             scheduler=telemetry.scheduler))
+                else:
+                    tools = get_tools_list(github_token, username, max_workers=max_workers,
+                                           cache_dir=cache_dir, base_url=base_url, telemetry=telemetry,
+                                           engine=engine, metadata_cache=metadata_cache,
+                                           scheduler=telemetry.scheduler)
+            
+            # 完整掃描過倉庫清單後才移除消失的倉庫並保存
+            if metadata_cache is not None and engine == 'rest':
+                evicted = metadata_cache.prune()
+                metadata_cache.save(metadata_path)
+                print(f"💾 已保存倉庫快取: {metadata_path}（移除 {evicted} 個已不存在的倉庫）")
+            
+            # 建置工具文件（內容雜湊未變的文件不下載也不重新壓縮）
+            if build_dir and tools:
+                with telemetry.stage('build'):
+                    build_tools(tools, github_token, build_dir, base_url=base_url,
+                                max_workers=async_concurrency or max_workers)
+            
+            # 記錄指標歷史（在渲染前記錄，本次的數值也會出現在趨勢中）
+            trend, appended = '', 0
+            if history_path and tools:
+                with telemetry.stage('history'):
+                    if publisher is not None:
+                        # 以已提交的歷史為基礎附加，本地沒有檢出或檢出已落後時不會覆蓋遠端記錄
+                        try:
+                            publisher.download(history_path)
+                        except PublishError as e:
+                            print(f"⚠️  無法讀取遠端指標歷史，沿用本地檔案: {e}")
+                    trend, appended = record_history(tools, history_path)
+            
+            # 產生自架徽章（只寫入新的或內容改變的檔案）
+            images, badges = tool_images(badge_dir if output_format == 'html' else None)
+            if badges is not None:
+                print(f"🏷️  徽章: 新寫入 {badges.written} 個，沿用 {badges.reused} 個（{badge_dir}）")
+            
+            # 渲染工具列表並直接串流寫入 README（渲染耗時另列為 generate_tools_markdown 階段）
+            files = ([history_path] if history_path else []) + (badges.paths() if badges else [])
+            # 透過 API 發布時，不再引用的舊徽章在同一個提交中從倉庫刪除
+            stale = badges.stale() if badges is not None and publisher is not None else []
+            content = telemetry.timed('generate_tools_markdown',
+                                      render_tools(tools, output_format, trend, images))
+            with telemetry.stage('update_readme'):
+                changed = update_readme(content, publisher=publisher, files=files, deletions=stale)
+            
+            # 寫入本地檢出時，新徽章與移除的舊徽章也需要提交（透過 API 發布時已含在提交中）
+            assets_changed = 0
+            if badges is not None:
+                # 舊檔名的徽章不再被引用，從檢出中移除
+                removed = badges.prune()
+                if removed:
+                    print(f"🧹 已移除 {removed} 個未引用的徽章")
+                if publisher is None:
+                    assets_changed = badges.written + removed
         
-        # 更新 README
-        update_readme(tools_content)
+        report = telemetry.report()
+        print(f"📈 API 請求: {report['total_requests']} 個，{report['total_bytes'] / 1024:.1f} KiB")
+        for resource, limit in report['rate_limits'].items():
+            print(f"   └─ 速率限制 {resource}: 剩餘 {limit['remaining']}/{limit.get('limit', '?')}")
+        stats = report['scheduler']
+        print(f"🚦 排程器: 重試 {stats['retries']} 次，節流 {stats['throttled']} 次，"
+              f"等待 {stats['waited_seconds']:.1f}s，最小並行視窗 {stats['min_window']:g}")
+        telemetry.emit(metrics_path, os.getenv('GITHUB_STEP_SUMMARY'))
         
         print("="*60)
-        print("✅ 儀表板更新完成！")
+        print("✅ 儀表板更新完成！" if changed else "ℹ️  儀表板無需更新")
         print("="*60 + "\n")
         
+        # 指標歷史有新記錄或徽章有變更時仍需提交，不回報無變更
+        if not changed and not appended and not assets_changed:
+            sys.exit(noop_exit_code())
+        
     except Exception as e:
         print(f"\n❌ 錯誤: {e}")
         import traceback
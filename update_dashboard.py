@@ -11,29 +11,66 @@ License: MIT
 Version: 2.0.0
 """
 
+import asyncio
 import os
-import re
 import sys
-from datetime import datetime
-from typing import List, Dict, Optional
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Dict, Optional
 import logging
 
-# 嘗試導入 PyGithub
-try:
-    from github import Github, GithubException
-except ImportError:
-    print("❌ Error: PyGithub not installed")
-    print("💡 Run: pip install PyGithub")
-    sys.exit(1)
+from dashboard.async_client import DEFAULT_CONCURRENCY, AsyncGitHubClient, BudgetExhausted
+from dashboard import render
+from dashboard.change_detect import noop_exit_code, stamp_stream
+from dashboard.commit_graph import CommitGraph, CommitGraphError
+from dashboard.graphql import GITHUB_API_URL, GraphQLClient, GraphQLError, graphql_url_for
+from dashboard.history import MISSING, MetricsHistory, Sample
+from dashboard.local_git import GITHUB_SERVER_URL, BranchRef, LocalGitError, LocalGitRepository
+from dashboard.publish import GitDataPublisher, PublishError
+from dashboard.readme_sections import Section, SectionError, update_sections
+from dashboard.records import BranchRecord
+from dashboard.scheduler import RequestScheduler, SchedulerError, install_scheduler
+from dashboard.selection import ORDERS, TopRecent, name_filter, parse_patterns, top_recent
+from dashboard.snapshot import BranchSnapshot
+from dashboard.telemetry import Telemetry, profiled
 
-# 配置日誌
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+# PyGithub、requests 與 aiohttp 都在需要的階段才導入，
+# 讓預檢與無變更的執行不必付出這些套件的載入成本
 logger = logging.getLogger(__name__)
 
+# 最後提交超過這個天數、且尚未合併的分支標記為陳舊
+DEFAULT_STALE_DAYS = 90
+
+# 趨勢中的活躍分支：最近幾天內有提交
+ACTIVE_DAYS = 7
+
+
+def _iter_pages(paginated):
+    """
+    逐頁產生 PaginatedList 的元素
+
+    直接迭代 PaginatedList 會把所有已載入的物件留在其內部列表中直到迭代結束；
+    這裡每次只持有一頁，處理完的 Branch/Commit 物件即可被回收。
+    """
+    if not hasattr(paginated, '_fetchNextPage'):
+        yield from paginated
+        return
+    while paginated._couldGrow():
+        yield from paginated._fetchNextPage()
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """
+    解析 ISO 8601 時間（GitHub 的 '...Z'、git 的 '+08:00' 或快照中的字串）
+
+    Python 3.11 之前的 datetime.fromisoformat 不接受結尾的 'Z'，
+    所有引擎都經由這裡解析，在支援的直譯器上結果一致。
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
 
 class BranchDashboardUpdater:
     """
@@ -42,16 +79,77 @@ class BranchDashboardUpdater:
     負責從 GitHub API 獲取分支資訊並更新 README.md
     """
     
-    def __init__(self, token: str, repo_name: str):
+    # 支援的分支資料來源
+    ENGINES = ('rest', 'graphql', 'local')
+    
+    def __init__(self, token: str, repo_name: str, engine: str = 'rest',
+                 cache_dir: Optional[str] = None, snapshot_path: Optional[str] = None,
+                 order: str = 'name', include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None, base_url: str = GITHUB_API_URL,
+                 async_concurrency: int = 0, request_budget: int = 0,
+                 checkout_path: str = '.', server_url: str = GITHUB_SERVER_URL,
+                 branch_metrics: bool = False, default_branch: Optional[str] = None,
+                 stale_days: int = DEFAULT_STALE_DAYS, output_format: str = 'markdown',
+                 history_path: Optional[str] = None, publisher: Optional[GitDataPublisher] = None):
         """
         初始化更新器
         
         Args:
             token (str): GitHub Personal Access Token
             repo_name (str): 倉庫名稱，格式為 'owner/repo'
+            engine (str): 分支資料來源，'rest'（PyGithub）、'graphql'（單一分頁查詢）
+                或 'local'（讀取本地檢出的 refs，不發送 API 請求）
+            cache_dir (str): 條件請求快取目錄，None 表示不使用快取
+            snapshot_path (str): 分支狀態快照檔案，None 表示每次都完整獲取
+            order (str): 分支選擇方式，'recent'（最近提交）或 'name'（名稱順序）
+            include (List[str]): 只顯示符合這些 glob 的分支
+            exclude (List[str]): 排除符合這些 glob 的分支
+            base_url (str): GitHub API 基礎網址（Enterprise 或本地測試伺服器）
+            async_concurrency (int): 大於 0 時改用非同步客戶端獲取分支，並限制同時在途的請求數
+            request_budget (int): 本次執行最多發送的請求數（含重試），0 表示不限制
+            checkout_path (str): 'local' 引擎讀取的倉庫目錄
+            server_url (str): 'local' 引擎組出提交連結用的網站網址
+            branch_metrics (bool): 是否由本地檢出的提交圖計算 ahead/behind 與分支狀態
+            default_branch (str): 比較基準的預設分支，None 表示由 origin/HEAD 或 main/master 推測
+            stale_days (int): 最後提交超過此天數且未合併的分支標記為陳舊
+            output_format (str): README 區段的格式，'markdown'、'html' 或 'json'
+            history_path (str): 指標歷史檔路徑，設置時記錄分支數並在表格下方顯示趨勢
+            publisher (GitDataPublisher): 設置時透過 Git Data API 直接提交 README（與指標歷史），
+                不寫入本地檔案
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"未知的資料來源: {engine}，可用: {', '.join(self.ENGINES)}")
+        if order not in ORDERS:
+            raise ValueError(f"未知的排序方式: {order}，可用: {', '.join(ORDERS)}")
+        
         self.token = token
         self.repo_name = repo_name
+        self.engine = engine
+        self.base_url = base_url
+        self.async_concurrency = async_concurrency
+        self.request_budget = request_budget
+        self.scheduler = None
+        self.server_url = server_url.rstrip('/')
+        self.local = LocalGitRepository(checkout_path) if engine == 'local' else None
+        self.checkout_path = checkout_path
+        self.branch_metrics = branch_metrics
+        self.default_branch = default_branch
+        self.stale_days = stale_days
+        self.output_format = render.check_format(output_format)
+        self.history_path = history_path
+        self.history_appended = 0
+        self.publisher = publisher
+        self.published_sha = None
+        self.branch_count = 0
+        self._trend_line = ''
+        self.cache_dir = cache_dir
+        self.http_cache = None
+        self.snapshot_path = snapshot_path
+        self.order = order
+        self._accept = name_filter(include, exclude)
+        self._pending_snapshot = None
+        self.status = 'pending'  # 'updated'、'unchanged' 或 'failed'
+        self.telemetry = Telemetry('分支儀表板')
         self.github = None
         self.repo = None
     
@@ -62,9 +160,30 @@ class BranchDashboardUpdater:
         Returns:
             bool: 連接成功返回 True，失敗返回 False
         """
+        if self.engine == 'local':
+            # 本地引擎只讀取檢出的 refs，不需要 PyGithub、token 或網路
+            logger.info(f"📂 使用本地 Git 資料: {os.path.abspath(self.local.path)}")
+            return True
+        
+        try:
+            from github import Github, GithubException
+        except ImportError:
+            logger.error("❌ Error: PyGithub not installed")
+            logger.info("💡 Run: pip install PyGithub")
+            return False
+        
         try:
             logger.info("🔍 正在連接到 GitHub API...")
-            self.github = Github(self.token)
+            self.telemetry.install()
+            self.install_scheduler(self.async_concurrency or DEFAULT_CONCURRENCY)
+            if self.cache_dir and self.http_cache is None:
+                from dashboard.http_cache import enable_http_cache
+
+                self.http_cache = enable_http_cache(self.cache_dir)
+                logger.info(f"💾 已啟用 HTTP 快取: {self.cache_dir}")
+            # 節流交給排程器，不再固定每 0.25 秒一個請求
+            self.github = Github(self.token, base_url=self.base_url, per_page=100,
+                                 seconds_between_requests=None)
             
             # 獲取目標倉庫
             logger.info(f"📦 正在獲取倉庫: {self.repo_name}")
@@ -85,203 +204,791 @@ class BranchDashboardUpdater:
             logger.error(f"❌ 連接錯誤: {str(e)}")
             return False
     
-    def fetch_branches(self, limit: int = 15) -> List[Dict]:
+    def install_scheduler(self, concurrency: int) -> RequestScheduler:
+        """
+        建立本次執行的請求排程器並安裝到共用 session
+        
+        Args:
+            concurrency (int): 並行視窗上限
+            
+        Returns:
+            RequestScheduler: 排程器（非同步客戶端默認共用同一個）
+        """
+        self.scheduler = install_scheduler(RequestScheduler(max_concurrency=concurrency,
+                                                            budget=self.request_budget))
+        self.telemetry.scheduler = self.scheduler
+        return self.scheduler
+    
+    def fetch_branches(self, limit: int = 15) -> List[BranchRecord]:
         """
         獲取分支資訊
         
+        依 self.order 選出要顯示的分支：'recent' 以固定大小的堆積串流選出
+        最近提交的分支，'name' 依名稱順序取前幾個。分支頁面逐頁消化，
+        不會一次把所有分支載入記憶體。
+        
         Args:
             limit (int): 最多獲取的分支數量，默認 15
             
         Returns:
-            List[Dict]: 分支資訊列表，每個元素包含分支的詳細資訊
+            List[BranchRecord]: 分支資訊列表，每個元素包含分支的詳細資訊
         """
+        if self.engine == 'graphql':
+            return self._fetch_branches_graphql(limit)
+        if self.engine == 'local':
+            return self._fetch_branches_local(limit)
+        
         try:
             logger.info("🌿 正在獲取分支列表...")
-            branches = list(self.repo.get_branches())
-            total_branches = len(branches)
-            logger.info(f"✅ 找到 {total_branches} 個分支")
+            seen = 0
+            
+            def iter_branch_infos():
+                nonlocal seen
+                # 逐頁載入，只從提交的原始 JSON 取出需要的欄位，不保留 PyGithub 物件
+                for branch in _iter_pages(self.repo.get_branches()):
+                    if not self.accept_branch(branch.name):
+                        continue
+                    seen += 1
+                    self.branch_count += 1
+                    try:
+                        branch_info = self._branch_info_from_commit_json(branch.name, branch.commit.raw_data)
+                        logger.info(f"   ✓ 已處理: {branch.name}")
+                        yield branch_info
+                        
+                    except SchedulerError:
+                        # 被限流或預算用完時放棄整次更新，而不是輸出缺少分支的儀表板
+                        raise
+                    except Exception as e:
+                        logger.warning(f"   ⚠️  處理分支 '{branch.name}' 時出錯: {str(e)}")
+                        continue
             
-            if total_branches == 0:
-                logger.warning("⚠️  倉庫中沒有分支")
+            branch_data = self._select(iter_branch_infos(), limit, key=lambda info: info['timestamp'])
+            
+            if seen == 0:
+                logger.warning("⚠️  倉庫中沒有符合條件的分支")
                 return []
             
+            logger.info(f"✅ 掃描 {seen} 個分支，選出 {len(branch_data)} 個")
+            return branch_data
+            
+        except SchedulerError as e:
+            logger.error(f"❌ 無法完成所有請求（速率限制或請求預算），放棄本次更新: {str(e)}")
+            return []
+        except Exception as e:
+            logger.error(f"❌ 獲取分支時出錯: {str(e)}")
+            return []
+    
+    def _fetch_branches_graphql(self, limit: int) -> List[BranchRecord]:
+        """
+        透過 GraphQL 獲取分支資訊
+        
+        一次分頁查詢（每頁 100 個 refs）即取得分支名稱與 HEAD 提交的
+        標題、作者、日期與連結，不需要逐分支的 REST 請求。
+        只有最後選出的分支才會組裝成分支資訊。
+        
+        Args:
+            limit (int): 最多獲取的分支數量
+            
+        Returns:
+            List[BranchRecord]: 與 REST 引擎相同格式的分支資訊列表
+        """
+        try:
+            logger.info("🌿 正在透過 GraphQL 獲取分支列表...")
+            owner, name = self.repo_name.split('/', 1)
+            client = self._graphql_client()
+            
+            # 依名稱排序時只需要前 limit 個，頁面大小隨之縮小
+            page_size = 100 if self.order == 'recent' else min(limit, 100)
+            seen = 0
+            
+            def iter_commit_nodes():
+                nonlocal seen
+                for node in client.iter_branch_refs(owner, name, page_size=page_size):
+                    if not self.accept_branch(node['name']):
+                        continue
+                    if 'oid' not in (node.get('target') or {}):
+                        logger.warning(f"   ⚠️  分支 '{node['name']}' 未指向提交，已略過")
+                        continue
+                    seen += 1
+                    self.branch_count += 1
+                    yield node
+            
+            nodes = self._select(
+                iter_commit_nodes(), limit,
+                key=lambda node: _parse_timestamp(node['target']['committedDate'])
+            )
+            
             branch_data = []
-            processed_count = 0
+            for node in nodes:
+                branch_data.append(self._branch_info_from_node(node))
+                logger.info(f"   ✓ [{len(branch_data)}/{len(nodes)}] 已處理: {node['name']}")
+            
+            if not branch_data:
+                logger.warning("⚠️  倉庫中沒有符合條件的分支")
+            else:
+                logger.info(f"✅ 掃描 {seen} 個分支，成功處理 {len(branch_data)} 個")
+            return branch_data
+            
+        except GraphQLError as e:
+            logger.error(f"❌ GraphQL 查詢錯誤: {str(e)}")
+            return []
+        except Exception as e:
+            logger.error(f"❌ 獲取分支時出錯: {str(e)}")
+            return []
+    
+    def _fetch_branches_local(self, limit: int) -> List[BranchRecord]:
+        """
+        由本地檢出的 refs 組出分支資訊
+        
+        一次 git for-each-ref 即取得所有分支的 HEAD 提交標題、作者與日期，
+        不發送任何 API 請求。
+        
+        Args:
+            limit (int): 最多獲取的分支數量
+            
+        Returns:
+            List[BranchRecord]: 與 REST 引擎相同格式的分支資訊列表
+        """
+        try:
+            logger.info("🌿 正在讀取本地分支 refs...")
+            seen = 0
+            
+            def iter_refs():
+                nonlocal seen
+                for ref in self.local.iter_branch_refs():
+                    if self.accept_branch(ref.name):
+                        seen += 1
+                        self.branch_count += 1
+                        yield ref
+            
+            selected = self._select(iter_refs(), limit, key=lambda ref: ref.committed)
+            branch_data = [self._branch_info_from_local(ref) for ref in selected]
+            
+            if not branch_data:
+                logger.warning("⚠️  倉庫中沒有符合條件的分支")
+            else:
+                logger.info(f"✅ 掃描 {seen} 個分支，選出 {len(branch_data)} 個")
+            return branch_data
             
-            # 處理每個分支
-            for branch in branches[:limit]:
+        except LocalGitError as e:
+            logger.error(f"❌ 讀取本地倉庫時出錯: {str(e)}")
+            return []
+    
+    def annotate_branch_metrics(self, branches: List[BranchRecord]) -> None:
+        """
+        為分支資訊加上相對預設分支的 ahead/behind、最後提交天數與狀態
+        
+        只為要顯示的分支與預設分支建立一次提交圖（一次 git rev-list），
+        再以可達性與 generation 數計算，不逐分支走完整歷史，也不發送 API 請求。
+        新增欄位：ahead、behind（無法計算時為 None）、age_days，
+        以及 status（'default'、'merged'、'stale' 或 'active'）。
+        
+        Args:
+            branches (List[BranchRecord]): fetch_branches 返回的分支資訊（原地修改）
+        """
+        checkout = self.local or LocalGitRepository(self.checkout_path)
+        counts = {}
+        try:
+            heads = checkout.branch_heads()
+            default = self.default_branch or checkout.default_branch()
+            if default not in heads:
+                logger.warning(f"⚠️  本地檢出中找不到預設分支 '{default}'，略過 ahead/behind")
+            else:
+                # API 引擎的資料可能比檢出新，只比較本地 HEAD 與顯示的提交一致的分支
+                tips = {branch['name']: heads[branch['name']] for branch in branches
+                        if heads.get(branch['name'], '').startswith(branch['sha'])}
+                graph = CommitGraph.from_git(checkout.path, set(tips.values()) | {heads[default]})
+                counts = graph.ahead_behind(heads[default], tips)
+                logger.info(f"🧮 提交圖: {len(graph)} 個提交，比較基準 {default}")
+        except (LocalGitError, CommitGraphError) as e:
+            logger.warning(f"⚠️  無法建立提交圖，略過 ahead/behind: {str(e)}")
+            default = None
+        
+        now = datetime.now(timezone.utc)
+        for branch in branches:
+            ahead, behind = counts.get(branch['name']) or (None, None)
+            age_days = (now - _parse_timestamp(branch['timestamp'])).days
+            if branch['name'] == default:
+                status = 'default'
+            elif ahead == 0:
+                status = 'merged'
+            elif age_days >= self.stale_days:
+                status = 'stale'
+            else:
+                status = 'active'
+            branch.update(ahead=ahead, behind=behind, age_days=age_days, status=status)
+    
+    async def fetch_branches_async(self, limit: int = 15,
+                                   concurrency: int = DEFAULT_CONCURRENCY,
+                                   client: Optional[AsyncGitHubClient] = None) -> List[BranchRecord]:
+        """
+        fetch_branches 的非同步版本，返回相同格式的分支資訊
+        
+        REST 引擎先逐頁列出分支，再以 asyncio.gather 並行獲取各分支的
+        HEAD 提交（同時在途的請求不超過 concurrency）；GraphQL 引擎的
+        分頁查詢本身依游標串接，改用非同步客戶端只是共用同一個連線池。
+        
+        Args:
+            limit (int): 最多獲取的分支數量，默認 15
+            concurrency (int): 同時在途的請求上限（傳入 client 時不使用）
+            client (AsyncGitHubClient): 共用的非同步客戶端（多倉庫模式），
+                None 表示自行建立
+            
+        Returns:
+            List[BranchRecord]: 分支資訊列表
+        """
+        if self.engine == 'local':
+            # 本地讀取沒有可重疊的網路等待
+            return self._fetch_branches_local(limit)
+        try:
+            if client is not None:
+                return await self._fetch_branches_with(client, limit)
+            logger.info(f"🌿 正在非同步獲取分支列表（最多 {concurrency} 個並行請求）...")
+            async with AsyncGitHubClient(self.token, base_url=self.base_url,
+                                         concurrency=concurrency) as client:
+                return await self._fetch_branches_with(client, limit)
+        except SchedulerError as e:
+            # 共用客戶端（多倉庫模式）由呼叫端決定略過倉庫或放棄更新
+            if client is not None:
+                raise
+            logger.error(f"❌ 無法完成所有請求（速率限制或請求預算），放棄本次更新: {str(e)}")
+            return []
+        except Exception as e:
+            logger.error(f"❌ 獲取 {self.repo_name} 的分支時出錯: {str(e)}")
+            return []
+    
+    async def _fetch_branches_with(self, client: AsyncGitHubClient, limit: int) -> List[BranchRecord]:
+        """以指定的非同步客戶端獲取並選出分支"""
+        owner, name = self.repo_name.split('/', 1)
+        if self.engine == 'graphql':
+            return await self._fetch_branches_graphql_async(client, owner, name, limit)
+        
+        heads = []
+        async with aclosing(client.paginate(f"/repos/{owner}/{name}/branches")) as branches:
+            async for branch in branches:
+                if not self.accept_branch(branch['name']):
+                    continue
+                heads.append((branch['name'], branch['commit']['sha']))
+                self.branch_count += 1
+                # 依名稱排序時不需要讀取其餘分支頁
+                if self.order == 'name' and len(heads) >= limit:
+                    break
+        
+        # 固定數量的工作者逐一獲取提交，回應一到就轉成精簡資料列並推入選擇器，
+        # 記憶體只與 limit 和並行數有關。鍵附上原始順序，時間相同時與依序處理的結果一致
+        if self.order == 'recent':
+            selector = TopRecent(limit, key=lambda item: (item[1]['timestamp'], -item[0]))
+        else:
+            selector = TopRecent(limit, key=lambda item: -item[0])
+        pending = iter(enumerate(heads))
+        failure: Optional[SchedulerError] = None
+        
+        async def work():
+            nonlocal failure
+            for index, (branch_name, sha) in pending:
+                if failure is not None:
+                    return
                 try:
-                    commit = branch.commit
-                    
-                    # 獲取提交訊息的第一行（標題）
-                    commit_message = commit.commit.message.split('\n')[0]
-                    
-                    # 處理過長的提交訊息
-                    max_length = 60
-                    if len(commit_message) > max_length:
-                        commit_title = commit_message[:max_length - 3] + "..."
-                    else:
-                        commit_title = commit_message
-                    
-                    # 轉義 Markdown 特殊字符
-                    commit_title = self._escape_markdown(commit_title)
-                    
-                    # 獲取作者資訊
-                    author = commit.commit.author.name
-                    if len(author) > 20:
-                        author = author[:17] + "..."
-                    
-                    # 格式化日期
-                    date = commit.commit.author.date.strftime('%Y-%m-%d')
-                    
-                    # 提交連結資訊
-                    commit_url = commit.html_url
-                    commit_sha = commit.sha[:7]
-                    
-                    # 組裝分支資訊
-                    branch_info = {
-                        'name': branch.name,
-                        'title': commit_title,
-                        'author': author,
-                        'date': date,
-                        'url': commit_url,
-                        'sha': commit_sha
-                    }
-                    
-                    branch_data.append(branch_info)
-                    processed_count += 1
-                    logger.info(f"   ✓ [{processed_count}/{min(limit, total_branches)}] 已處理: {branch.name}")
-                    
+                    commit = await client.get_json(f"/repos/{owner}/{name}/commits/{sha}")
+                    selector.push((index, self._branch_info_from_commit_json(branch_name, commit)))
+                except SchedulerError as e:
+                    # 被限流或預算用完時停止所有工作者，放棄這個倉庫
+                    failure = e
+                    return
                 except Exception as e:
-                    logger.warning(f"   ⚠️  處理分支 '{branch.name}' 時出錯: {str(e)}")
+                    logger.warning(f"   ⚠️  處理分支 '{branch_name}' 時出錯: {e}")
+        
+        await asyncio.gather(*(work() for _ in range(min(client.concurrency, len(heads)))))
+        if failure is not None:
+            raise failure
+        branch_data = [record for _, record in selector.items()]
+        
+        if not heads:
+            logger.warning(f"⚠️  {self.repo_name} 中沒有符合條件的分支")
+            return []
+        logger.info(f"✅ {self.repo_name}: 掃描 {len(heads)} 個分支，選出 {len(branch_data)} 個")
+        return branch_data
+    
+    async def _fetch_branches_graphql_async(self, client: AsyncGitHubClient, owner: str,
+                                            name: str, limit: int) -> List[BranchRecord]:
+        """以非同步客戶端執行 BranchRefs 分頁查詢，串流選出要顯示的分支"""
+        page_size = 100 if self.order == 'recent' else min(limit, 100)
+        selector = TopRecent(limit, key=lambda node: _parse_timestamp(node['target']['committedDate']))
+        nodes = []
+        seen = 0
+        async with aclosing(client.iter_branch_refs(owner, name, page_size=page_size)) as refs:
+            async for node in refs:
+                if not self.accept_branch(node['name']) or 'oid' not in (node.get('target') or {}):
+                    continue
+                seen += 1
+                self.branch_count += 1
+                if self.order == 'recent':
+                    selector.push(node)
                     continue
+                nodes.append(node)
+                if len(nodes) >= limit:
+                    break
+        
+        selected = selector.items() if self.order == 'recent' else nodes
+        branch_data = [self._branch_info_from_node(node) for node in selected]
+        if not branch_data:
+            logger.warning(f"⚠️  {self.repo_name} 中沒有符合條件的分支")
+        else:
+            logger.info(f"✅ {self.repo_name}: 掃描 {seen} 個分支，選出 {len(branch_data)} 個")
+        return branch_data
+    
+    def _branch_info_from_node(self, node: Dict) -> BranchRecord:
+        """由 GraphQL refs 節點組裝分支資訊"""
+        commit = node['target']
+        return self._build_branch_info(
+            name=node['name'],
+            message=commit['messageHeadline'],
+            author=commit['author']['name'],
+            date=_parse_timestamp(commit['author']['date']),
+            url=commit['url'],
+            sha=commit['oid'],
+            committed=_parse_timestamp(commit['committedDate'])
+        )
+    
+    def _branch_info_from_local(self, ref: BranchRef) -> BranchRecord:
+        """由 LocalGitRepository.iter_branch_refs() 的項目組裝分支資訊"""
+        return self._build_branch_info(
+            name=ref.name,
+            message=ref.message,
+            author=ref.author,
+            date=_parse_timestamp(ref.date),
+            url=f"{self.server_url}/{self.repo_name}/commit/{ref.sha}",
+            sha=ref.sha,
+            committed=_parse_timestamp(ref.committed)
+        )
+    
+    def _branch_info_from_commit_json(self, name: str, commit: Dict) -> BranchRecord:
+        """由 REST 提交 JSON（GET /repos/{owner}/{repo}/commits/{sha}）組裝分支資訊"""
+        detail = commit['commit']
+        return self._build_branch_info(
+            name=name,
+            message=detail['message'],
+            author=detail['author']['name'],
+            date=_parse_timestamp(detail['author']['date']),
+            url=commit['html_url'],
+            sha=commit['sha'],
+            committed=_parse_timestamp(detail['committer']['date'])
+        )
+    
+    def _branch_info_from_push(self, name: str, commit: Dict) -> BranchRecord:
+        """由 push webhook 的 head_commit 組裝分支資訊（timestamp 同時作為排序用的時間）"""
+        return self._build_branch_info(
+            name=name,
+            message=commit['message'],
+            author=commit['author']['name'],
+            date=_parse_timestamp(commit['timestamp']),
+            url=commit['url'],
+            sha=commit['id']
+        )
+    
+    def _graphql_client(self) -> GraphQLClient:
+        """建立指向 self.base_url 對應 GraphQL 端點的客戶端"""
+        return GraphQLClient(self.token, url=graphql_url_for(self.base_url))
+    
+    def _select(self, items, limit: int, key) -> List:
+        """
+        依 self.order 從串流中選出要顯示的項目
+        
+        Args:
+            items: 依名稱排序的項目串流
+            limit (int): 最多選出的數量
+            key: 'recent' 排序使用的時間鍵
             
-            logger.info(f"✅ 成功處理 {len(branch_data)} 個分支")
-            return branch_data
+        Returns:
+            List: 選出的項目
+        """
+        if self.order == 'recent':
+            return top_recent(items, limit, key=key)
+        return list(islice(items, limit))
+    
+    def list_branch_heads(self) -> Dict[str, str]:
+        """
+        輕量獲取所有分支的 HEAD SHA（不載入提交詳情）
+        
+        Returns:
+            Dict[str, str]: 分支名稱 -> HEAD SHA，依分支名稱排序，已套用名稱篩選
+        """
+        logger.info("🔎 正在獲取分支 refs 清單...")
+        if self.engine == 'graphql':
+            owner, name = self.repo_name.split('/', 1)
+            client = self._graphql_client()
+            heads = {
+                node['name']: node['target']['oid']
+                for node in client.iter_branch_heads(owner, name)
+                if node.get('target') and 'oid' in node['target']
+            }
+        elif self.engine == 'local':
+            heads = self.local.branch_heads()
+        else:
+            prefix = 'refs/heads/'
+            heads = {
+                ref.ref[len(prefix):]: ref.object.sha
+                for ref in self.repo.get_git_matching_refs('heads/')
+                if ref.object.type == 'commit'
+            }
+        heads = {name: sha for name, sha in sorted(heads.items()) if self.accept_branch(name)}
+        self.branch_count += len(heads)
+        logger.info(f"✅ 找到 {len(heads)} 個分支")
+        return heads
+    
+    def hydrate_branches(self, heads: Dict[str, str]) -> Dict[str, BranchRecord]:
+        """
+        只為指定的分支獲取提交詳情
+        
+        Args:
+            heads (Dict[str, str]): 要獲取的 {branch: head_sha}
+            
+        Returns:
+            Dict[str, BranchRecord]: 分支名稱 -> 分支資訊；獲取失敗的分支不會出現在結果中
+        """
+        if not heads:
+            return {}
+        
+        logger.info(f"🌿 正在獲取 {len(heads)} 個分支的提交...")
+        rows = {}
+        if self.engine == 'local':
+            # 再串流讀一次 refs，只組裝指定的分支
+            for ref in self.local.iter_branch_refs():
+                if heads.get(ref.name) == ref.sha:
+                    rows[ref.name] = self._branch_info_from_local(ref)
+        elif self.engine == 'graphql':
+            owner, name = self.repo_name.split('/', 1)
+            try:
+                commits = self._graphql_client().fetch_commits(owner, name, list(set(heads.values())))
+            except GraphQLError as e:
+                logger.error(f"❌ GraphQL 查詢錯誤: {str(e)}")
+                return {}
+            for branch_name, sha in heads.items():
+                commit = commits.get(sha)
+                if commit is None:
+                    logger.warning(f"   ⚠️  找不到分支 '{branch_name}' 的提交 {sha[:7]}")
+                    continue
+                rows[branch_name] = self._build_branch_info(
+                    name=branch_name,
+                    message=commit['messageHeadline'],
+                    author=commit['author']['name'],
+                    date=_parse_timestamp(commit['author']['date']),
+                    url=commit['url'],
+                    sha=commit['oid'],
+                    committed=_parse_timestamp(commit['committedDate'])
+                )
+                logger.info(f"   ✓ 已處理: {branch_name}")
+        else:
+            for branch_name, sha in heads.items():
+                try:
+                    rows[branch_name] = self._branch_info_from_commit_json(
+                        branch_name, self.repo.get_commit(sha).raw_data
+                    )
+                    logger.info(f"   ✓ 已處理: {branch_name}")
+                except SchedulerError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"   ⚠️  處理分支 '{branch_name}' 時出錯: {str(e)}")
+        return rows
+    
+    def fetch_branches_incremental(self, limit: int = 15) -> Optional[List[BranchRecord]]:
+        """
+        依據分支狀態快照增量獲取分支資訊
+        
+        先以輕量的 refs 清單比對快照：完全沒有變更時返回 None，
+        否則只重新獲取 HEAD 已移動的分支，其餘沿用快照中的資料。
+        
+        Args:
+            limit (int): 最多獲取的分支數量
             
+        Returns:
+            Optional[List[BranchRecord]]: 分支資訊列表；沒有任何分支變更時返回 None
+        """
+        try:
+            heads = self.list_branch_heads()
         except Exception as e:
-            logger.error(f"❌ 獲取分支時出錯: {str(e)}")
+            logger.error(f"❌ 獲取分支 refs 時出錯: {str(e)}")
             return []
+        
+        snapshot = BranchSnapshot.load(self.snapshot_path)
+        moved, removed = snapshot.diff(heads)
+        
+        if self.order == 'recent':
+            # 依最近提交排序需要每個分支的提交時間：只為已移動的分支獲取
+            rows = self.hydrate_branches({name: heads[name] for name in moved})
+            dates = {
+                name: rows[name]['timestamp'] if name in rows else snapshot.dates[name]
+                for name in heads
+                if name in rows or (name not in moved and name in snapshot.dates)
+            }
+            selected = [name for name, _ in top_recent(dates.items(), limit, key=lambda item: item[1])]
+        else:
+            selected = list(heads)[:limit]
+            dates = {}
+            rows = {}
+        
+        # 顯示的分支與上次相同且都沒有移動時無需更新；
+        # 依最近提交排序時任何分支移動都可能改變排名，因此需全部未移動
+        relevant = moved if self.order == 'recent' else [name for name in moved if name in selected]
+        if not relevant and selected == list(snapshot.rows):
+            logger.info("ℹ️  顯示的分支都沒有移動，沿用上次的結果")
+            return None
+        
+        logger.info(f"🔄 {len(moved)} 個分支已變更，{len(removed)} 個分支已刪除")
+        
+        # 選中但沒有可用資料的分支（新進榜或先前獲取失敗）
+        missing = [
+            name for name in selected
+            if name not in rows and (name in moved or name not in snapshot.rows)
+        ]
+        rows.update(self.hydrate_branches({name: heads[name] for name in missing}))
+        
+        branch_data = []
+        for name in selected:
+            if name in rows:
+                branch_data.append(rows[name])
+            elif name not in moved and name in snapshot.rows:
+                branch_data.append(BranchRecord.from_dict(snapshot.rows[name]))
+        
+        # 只有成功獲取的分支才記錄新的 HEAD，失敗的分支下次重試
+        failed = {name for name in moved if name not in rows and name in selected}
+        if self.order == 'recent':
+            failed |= {name for name in moved if name not in dates}
+        for row in rows.values():
+            dates.setdefault(row['name'], row['timestamp'])
+        self._pending_snapshot = BranchSnapshot(
+            heads={name: sha for name, sha in heads.items() if name not in failed},
+            rows={row['name']: dict(row) for row in branch_data},
+            dates=dates
+        )
+        logger.info(f"✅ 成功處理 {len(branch_data)} 個分支（重新獲取 {len(rows)} 個）")
+        return branch_data
     
-    def generate_table(self, branches: List[Dict]) -> str:
+    def accept_branch(self, name: str) -> bool:
         """
-        生成 Markdown 表格
+        判斷分支名稱是否符合 include / exclude glob
         
         Args:
-            branches (List[Dict]): 分支資訊列表
+            name (str): 分支名稱
             
         Returns:
-            str: 格式化的 Markdown 表格字符串
+            bool: 應該顯示時返回 True
         """
-        logger.info("📝 正在生成 Markdown 表格...")
+        return self._accept(name)
+    
+    @classmethod
+    def _build_branch_info(cls, name: str, message: str, author: str,
+                           date: datetime, url: str, sha: str,
+                           committed: Optional[datetime] = None) -> BranchRecord:
+        """
+        組裝單一分支的資訊
         
-        # 表格標題行
-        lines = [
-            "| 🌿 Branch | 📝 Latest Commit | 👤 Author | ⏰ Time | 🔗 Link |",
-            "|-----------|------------------|-----------|---------|---------|"
-        ]
+        Args:
+            name (str): 分支名稱
+            message (str): 提交訊息（只取第一行）
+            author (str): 作者名稱
+            date (datetime): 提交日期（作者日期，顯示用）
+            url (str): 提交連結
+            sha (str): 完整提交 SHA
+            committed (datetime): 提交者日期，用於依最近提交排序，默認與 date 相同
+            
+        Returns:
+            BranchRecord: 渲染用的分支資訊（標題未轉義，由渲染器依輸出格式轉義）
+        """
+        # 獲取提交訊息的第一行（標題）
+        commit_message = message.split('\n')[0]
         
-        # 添加每個分支的資料行
-        for branch in branches:
-            line = (
-                f"| `{branch['name']}` | "
-                f"{branch['title']} | "
-                f"{branch['author']} | "
-                f"{branch['date']} | "
-                f"[`{branch['sha']}`]({branch['url']}) |"
-            )
-            lines.append(line)
+        # 處理過長的提交訊息
+        max_length = 60
+        if len(commit_message) > max_length:
+            commit_title = commit_message[:max_length - 3] + "..."
+        else:
+            commit_title = commit_message
         
-        # 添加更新時間戳記
-        update_time = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
-        lines.append(f"\n*🕐 Last updated: {update_time}*")
+        # 處理過長的作者名稱
+        if len(author) > 20:
+            author = author[:17] + "..."
+        
+        # 統一為 UTC 的 ISO 8601 字串，可直接以字串比較先後
+        committed = committed or date
+        if committed.tzinfo is not None:
+            committed = committed.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        return BranchRecord(
+            name=name,
+            title=commit_title,
+            author=author,
+            date=date.strftime('%Y-%m-%d'),
+            url=url,
+            sha=sha[:7],
+            timestamp=committed.strftime('%Y-%m-%dT%H:%M:%SZ')
+        )
+    
+    def record_history(self, branches: List[BranchRecord]) -> str:
+        """
+        把本次的分支數與活躍分支數附加到指標歷史，並由歷史渲染趨勢行
         
-        table_content = '\n'.join(lines)
-        logger.info(f"✅ 表格生成完成，共 {len(branches)} 行資料")
+        活躍分支數只計算選出的分支中最近 ACTIVE_DAYS 天內有提交的分支；
+        依名稱排序且沒有快照時只掃描到第 limit 個分支為止，分支總數記為未知。
         
+        Args:
+            branches (List[BranchRecord]): 選出的分支資訊
+            
+        Returns:
+            str: 趨勢行，歷史中還不到兩筆記錄時為空字串
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=ACTIVE_DAYS)).strftime('%Y-%m-%dT%H:%M:%S')
+        active = sum(1 for branch in branches if branch['timestamp'] >= cutoff)
+        total = self.branch_count if self.snapshot_path or self.order == 'recent' else MISSING
+        
+        if self.publisher is not None:
+            self.sync_history()
+        history = MetricsHistory(self.history_path)
+        self.history_appended = history.record({self.repo_name: Sample(branches=total, active=active)})
+        logger.info(f"📈 指標歷史: {'已附加新記錄' if self.history_appended else '數值未變，未附加'}"
+                    f"（{self.history_path}）")
+        
+        return render.trend_line('Trend', (
+            render.trend('🌿 Branches', history.values(self.repo_name, 'branches', render.SPARK_POINTS)),
+            render.trend(f'🔥 Active ({ACTIVE_DAYS}d)', history.values(self.repo_name, 'active', render.SPARK_POINTS)),
+        ))
+    
+    def sync_history(self) -> None:
+        """
+        以目標分支上已提交的指標歷史取代本地檔案
+        
+        透過 API 發布時本地可能沒有檢出（或檢出已落後），直接在本地檔案上附加
+        會覆蓋遠端較新的記錄。讀取失敗時沿用本地檔案。
+        """
+        try:
+            if self.publisher.download(self.history_path):
+                logger.info(f"📥 已取得遠端指標歷史: {self.history_path}")
+        except PublishError as e:
+            logger.warning(f"⚠️  無法讀取遠端指標歷史，沿用本地檔案: {str(e)}")
+    
+    def render_table(self, branches: Iterable[BranchRecord]) -> Iterator[str]:
+        """
+        逐段渲染表格與頁尾（資料雜湊邊渲染邊計算）
+        
+        輸出格式由 self.output_format 決定；啟用 branch_metrics 時多出
+        ahead/behind 與狀態兩欄。片段可以直接交給 update_readme 串流寫入。
+        
+        Args:
+            branches (Iterable[BranchRecord]): 分支資訊
+            
+        Returns:
+            Iterator[str]: 輸出片段
+        """
+        logger.info("📝 正在生成表格...")
+        return self._stamped(render.branch_table(branches, self.output_format, metrics=self.branch_metrics))
+    
+    def _stamped(self, chunks: Iterator[str]) -> Iterator[str]:
+        """
+        加上趨勢行與更新時間戳記（資料雜湊附在其後，資料未變時沿用舊時間戳記）；
+        JSON 包在程式碼區塊中
+        """
+        if self.output_format == 'json':
+            chunks = chain(("```json\n",), chunks, ("\n```",))
+        if self._trend_line:
+            chunks = chain(chunks, (self._trend_line,))
+        update_time = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+        return stamp_stream(chunks, f"\n\n*🕐 Last updated: {update_time}*")
+    
+    def generate_table(self, branches: Iterable[BranchRecord]) -> str:
+        """
+        生成完整的表格字串
+        
+        Args:
+            branches (Iterable[BranchRecord]): 分支資訊
+            
+        Returns:
+            str: 格式化的表格字符串
+        """
+        table_content = ''.join(self.render_table(branches))
+        logger.info("✅ 表格生成完成")
         return table_content
     
-    def update_readme(self, table_content: str, readme_path: str = 'README.md') -> bool:
+    def update_readme(self, table_content: Section, readme_path: str = 'README.md') -> bool:
         """
         更新 README 文件
         
         Args:
-            table_content (str): 要插入的表格內容
+            table_content (Section): 要插入的表格內容，或 render_table 的輸出片段（串流寫入）
             readme_path (str): README 文件路徑，默認為 'README.md'
             
         Returns:
             bool: 更新成功返回 True，沒有變更或失敗返回 False
         """
+        if self.publisher is not None:
+            return self.publish_readme(table_content, readme_path)
+        
         try:
             logger.info(f"📖 正在讀取 {readme_path}...")
             
             # 檢查文件是否存在
             if not os.path.exists(readme_path):
                 logger.error(f"❌ 找不到 {readme_path} 文件")
+                self.status = 'failed'
                 return False
             
-            # 讀取 README 內容
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                readme_content = f.read()
-            
-            # 檢查必要的標記是否存在
-            start_marker = '<!-- BRANCH_ACTIVITY:START -->'
-            end_marker = '<!-- BRANCH_ACTIVITY:END -->'
-            
-            if start_marker not in readme_content:
-                logger.error(f"❌ README 中找不到起始標記: {start_marker}")
-                return False
-            
-            if end_marker not in readme_content:
-                logger.error(f"❌ README 中找不到結束標記: {end_marker}")
-                return False
-            
-            # 使用正則表達式替換內容
+            # 一次掃描標記、拼接區段，並以暫存檔 + 改名原子寫入
             logger.info("✏️  正在更新 README 內容...")
-            pattern = r'<!-- BRANCH_ACTIVITY:START -->.*?<!-- BRANCH_ACTIVITY:END -->'
-            replacement = f'{start_marker}\n{table_content}\n{end_marker}'
-            
-            updated_content = re.sub(
-                pattern,
-                replacement,
-                readme_content,
-                flags=re.DOTALL
-            )
-            
-            # 檢查是否有實際變更
-            if updated_content == readme_content:
+            if not update_sections(readme_path, {'BRANCH_ACTIVITY': table_content}):
                 logger.info("ℹ️  內容沒有變更，無需更新")
+                self.status = 'unchanged'
                 return False
             
-            # 寫入更新後的內容
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
-            
             logger.info(f"✅ {readme_path} 更新成功！")
+            self.status = 'updated'
             return True
             
+        except SectionError as e:
+            logger.error(f"❌ {str(e)}")
+            self.status = 'failed'
+            return False
         except Exception as e:
             logger.error(f"❌ 更新 README 時出錯: {str(e)}")
+            self.status = 'failed'
             return False
     
-    @staticmethod
-    def _escape_markdown(text: str) -> str:
+    def publish_readme(self, table_content: Section, readme_path: str = 'README.md') -> bool:
         """
-        轉義 Markdown 特殊字符
+        透過 Git Data API 直接提交 README，不需要檢出倉庫
+        
+        在分支最新的 README 上拼接區段；指標歷史檔與 README 放在同一個提交中。
+        其他工作在期間推送時，於新的 HEAD 上重新拼接並重試。
         
         Args:
-            text (str): 原始文本
+            table_content (Section): 要插入的表格內容或片段
+            readme_path (str): README 在倉庫中的路徑
             
         Returns:
-            str: 轉義後的文本
+            bool: 建立了新提交返回 True，沒有變更或失敗返回 False
         """
-        # Markdown 特殊字符列表
-        special_chars = ['\\', '`', '*', '_', '{', '}', '[', ']', '(', ')', '#', '+', '-', '.', '!', '|']
+        files = {}
+        if self.history_path and os.path.exists(self.history_path):
+            with open(self.history_path, 'rb') as f:
+                files[self.history_path] = f.read()
+        
+        try:
+            logger.info(f"📤 正在透過 Git Data API 發布 {readme_path} 到 {self.publisher.repo_name}...")
+            self.published_sha = self.publisher.publish({readme_path: {'BRANCH_ACTIVITY': table_content}},
+                                                        files, message='📊 Update branch dashboard [skip ci]')
+        except (PublishError, SectionError) as e:
+            logger.error(f"❌ 發布失敗: {str(e)}")
+            self.status = 'failed'
+            return False
         
-        for char in special_chars:
-            text = text.replace(char, '\\' + char)
+        if self.published_sha is None:
+            logger.info("ℹ️  內容沒有變更，無需更新")
+            self.status = 'unchanged'
+            return False
         
-        return text
+        retries = self.publisher.attempts - 1
+        logger.info(f"✅ 已提交 {self.published_sha[:7]}"
+                    + (f"（ref 衝突重試 {retries} 次）" if retries else ""))
+        self.status = 'updated'
+        return True
     
     def run(self, limit: int = 15, readme_path: str = 'README.md') -> bool:
         """
@@ -298,25 +1005,73 @@ class BranchDashboardUpdater:
         logger.info("🚀 開始更新分支儀表板")
         logger.info("=" * 60)
         
+        self.status = 'failed'
+        
         # 1. 連接到 GitHub
-        if not self.connect():
+        with self.telemetry.stage('connect'):
+            connected = self.connect()
+        if not connected:
             logger.error("❌ 無法連接到 GitHub，更新失敗")
             return False
         
-        # 2. 獲取分支資訊
-        branches = self.fetch_branches(limit)
+        # 2. 獲取分支資訊（有快照時只獲取已變更的分支）
+        self._pending_snapshot = None
+        self.branch_count = 0
+        with self.telemetry.stage('fetch_branches'):
+            if self.snapshot_path:
+                try:
+                    branches = self.fetch_branches_incremental(limit)
+                except SchedulerError as e:
+                    # 只沿用部分分支會讓快照與儀表板不一致，整次放棄
+                    logger.error(f"❌ 無法完成所有請求（速率限制或請求預算），放棄本次更新: {str(e)}")
+                    branches = []
+            else:
+                if self.async_concurrency > 0:
+                    branches = asyncio.run(self.fetch_branches_async(limit, self.async_concurrency))
+                else:
+                    branches = self.fetch_branches(limit)
+        if self.snapshot_path and branches is None:
+            logger.info("=" * 60)
+            logger.info("ℹ️  分支沒有變更，略過表格生成與 README 更新")
+            logger.info("=" * 60)
+            self.status = 'unchanged'
+            return False
         if not branches:
             logger.error("❌ 沒有獲取到分支資訊，更新失敗")
             return False
         
-        # 3. 生成表格
-        table_content = self.generate_table(branches)
+        # 由本地提交圖計算 ahead/behind 與分支狀態
+        if self.branch_metrics:
+            with self.telemetry.stage('commit_graph'):
+                self.annotate_branch_metrics(branches)
+        
+        # 記錄指標歷史（在渲染前記錄，本次的數值也會出現在趨勢中）
+        if self.history_path:
+            with self.telemetry.stage('history'):
+                self._trend_line = self.record_history(branches)
         
-        # 4. 更新 README
-        success = self.update_readme(table_content, readme_path)
+        # 3. 渲染表格並直接串流寫入 README（渲染耗時另列為 generate_table 階段）
+        table = self.telemetry.timed('generate_table', self.render_table(branches))
+        with self.telemetry.stage('update_readme'):
+            success = self.update_readme(table, readme_path)
         
-        # 5. 顯示結果
+        # README 寫入成功（或資料確實未變）後才保存快照，避免下次執行誤判為無變更
+        if self.status != 'failed' and self._pending_snapshot is not None:
+            self._pending_snapshot.save(self.snapshot_path)
+            logger.info(f"💾 已保存分支快照: {self.snapshot_path}")
+        
+        # 4. 顯示結果
         logger.info("=" * 60)
+        if self.http_cache is not None:
+            logger.info(f"💾 HTTP 快取: {self.http_cache.hits} 命中 / {self.http_cache.misses} 未命中")
+        report = self.telemetry.report()
+        logger.info(f"📈 API 請求: {report['total_requests']} 個，{report['total_bytes'] / 1024:.1f} KiB")
+        for resource, limit in report['rate_limits'].items():
+            logger.info(f"   └─ 速率限制 {resource}: 剩餘 {limit['remaining']}/{limit.get('limit', '?')}")
+        if report.get('scheduler'):
+            stats = report['scheduler']
+            logger.info(f"🚦 排程器: 重試 {stats['retries']} 次，節流 {stats['throttled']} 次，"
+                        f"等待 {stats['waited_seconds']:.1f}s，最小並行視窗 {stats['min_window']:g}")
         if success:
             logger.info("✅ 儀表板更新完成！")
         else:
@@ -326,37 +1081,293 @@ class BranchDashboardUpdater:
         return success
 
 
-def main():
+class MultiRepoDashboardUpdater(BranchDashboardUpdater):
     """
-    主函數
+    多倉庫分支儀表板更新器
+    
+    以一個共用的非同步客戶端同時獲取多個倉庫（明確列表，或整個用戶/組織）
+    的分支活動，在全域請求預算內合併成一張表格。倉庫清單逐頁串流進有界佇列，
+    每個倉庫只保留最近的 per_repo 個分支，再以固定大小的堆積選出 limit 個，
+    記憶體用量與倉庫總數無關。
+    """
+    
+    # 表格排列方式：'recent' 全部依提交時間排序，'grouped' 依倉庫分組
+    LAYOUTS = ('recent', 'grouped')
+    
+    def __init__(self, token: str, repos: Optional[List[str]] = None, owner: Optional[str] = None,
+                 engine: str = 'graphql', per_repo: int = 5, layout: str = 'recent',
+                 include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                 base_url: str = GITHUB_API_URL, concurrency: int = DEFAULT_CONCURRENCY,
+                 request_budget: int = 0, output_format: str = 'markdown',
+                 publisher: Optional[GitDataPublisher] = None):
+        """
+        初始化更新器
+        
+        Args:
+            token (str): GitHub Personal Access Token
+            repos (List[str]): 倉庫列表，格式為 'owner/repo'
+            owner (str): 用戶或組織名稱，掃描其擁有的所有未封存倉庫（與 repos 擇一）
+            engine (str): 分支資料來源，'rest' 或 'graphql'
+            per_repo (int): 每個倉庫最多保留的分支數量
+            layout (str): 表格排列方式，'recent' 或 'grouped'
+            include (List[str]): 只顯示符合這些 glob 的分支
+            exclude (List[str]): 排除符合這些 glob 的分支
+            base_url (str): GitHub API 基礎網址
+            concurrency (int): 同時處理的倉庫數與同時在途的請求上限
+            request_budget (int): 本次執行最多發送的請求數，0 表示不限制
+            output_format (str): README 區段的格式，'markdown'、'html' 或 'json'
+            publisher (GitDataPublisher): 設置時透過 Git Data API 直接提交 README
+        """
+        if not repos and not owner:
+            raise ValueError("需要指定倉庫列表或擁有者")
+        if engine == 'local':
+            raise ValueError("多倉庫模式的資料不在本地檢出中，請使用 'rest' 或 'graphql'")
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"未知的排列方式: {layout}，可用: {', '.join(self.LAYOUTS)}")
+        
+        super().__init__(token, owner or ','.join(repos), engine=engine, order='recent',
+                         include=include, exclude=exclude, base_url=base_url,
+                         request_budget=request_budget, output_format=output_format,
+                         publisher=publisher)
+        self.repos = list(repos or [])
+        self.owner = owner
+        self.per_repo = max(1, per_repo)
+        self.layout = layout
+        self.include = include
+        self.exclude = exclude
+        self.concurrency = max(1, concurrency)
+        self.scanned = 0
+        self.skipped = 0
+    
+    def connect(self) -> bool:
+        """多倉庫模式不需要預先獲取倉庫物件，只安裝遙測與排程器"""
+        self.telemetry.install()
+        self.install_scheduler(self.concurrency)
+        target = f"{self.owner} 的所有倉庫" if self.owner else f"{len(self.repos)} 個倉庫"
+        logger.info(f"🔍 多倉庫模式: {target}（最多 {self.concurrency} 個並行）")
+        if self.request_budget:
+            logger.info(f"   └─ 請求預算: {self.request_budget}")
+        return True
+    
+    def fetch_branches(self, limit: int = 15) -> List[BranchRecord]:
+        """
+        獲取所有倉庫的分支並合併選出最近的 limit 個
+        
+        Args:
+            limit (int): 表格最多顯示的分支數量
+            
+        Returns:
+            List[BranchRecord]: 分支資訊列表（多了 'repo' 欄位），依 self.layout 排列
+        """
+        try:
+            rows = asyncio.run(self.fetch_all_async(limit))
+        except SchedulerError as e:
+            # 某個倉庫的工作遇到速率限制或全域預算用完，不是倉庫列表本身的錯誤
+            logger.error(f"❌ 無法完成所有請求（速率限制或請求預算），放棄本次更新: {str(e)}")
+            return []
+        except Exception as e:
+            logger.error(f"❌ 獲取倉庫列表時出錯: {str(e)}")
+            return []
+        
+        logger.info(f"✅ 掃描 {self.scanned} 個倉庫，選出 {len(rows)} 個分支")
+        if self.skipped:
+            logger.warning(f"⚠️  請求預算用完，略過 {self.skipped} 個倉庫")
+        if self.layout == 'grouped':
+            # 倉庫依其最新分支的先後排列，組內維持由新到舊（sorted 為穩定排序）
+            first_seen = {}
+            for index, row in enumerate(rows):
+                first_seen.setdefault(row['repo'], index)
+            rows = sorted(rows, key=lambda row: first_seen[row['repo']])
+        return rows
+    
+    async def _iter_repo_names(self, client: AsyncGitHubClient):
+        """依設定產生要掃描的倉庫名稱（擁有者模式逐頁串流）"""
+        if not self.owner:
+            for repo_name in self.repos:
+                yield repo_name
+            return
+        async for repo in client.paginate(f"/users/{self.owner}/repos"):
+            if not repo.get('archived'):
+                yield repo['full_name']
+    
+    async def fetch_all_async(self, limit: int) -> List[BranchRecord]:
+        """
+        以生產者/工作者模式並行掃描所有倉庫
+        
+        生產者把倉庫名稱放進有界佇列，concurrency 個工作者共用同一個客戶端
+        （連線池與排程器的請求預算），各自把倉庫的前 per_repo 個分支推入全域堆積。
+        預算用完時略過其餘倉庫；重試後仍被速率限制則放棄整次更新。
+        
+        Args:
+            limit (int): 最多選出的分支數量
+            
+        Returns:
+            List[BranchRecord]: 依提交時間由新到舊排序的分支資訊
+        """
+        selector = TopRecent(limit, key=lambda row: row['timestamp'])
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        
+        async with AsyncGitHubClient(self.token, base_url=self.base_url, concurrency=self.concurrency,
+                                     max_requests=self.request_budget, scheduler=self.scheduler) as client:
+            async def produce():
+                try:
+                    async with aclosing(self._iter_repo_names(client)) as names:
+                        async for repo_name in names:
+                            await queue.put(repo_name)
+                except BudgetExhausted:
+                    pass
+                finally:
+                    for _ in range(self.concurrency):
+                        await queue.put(None)
+            
+            async def work():
+                while (repo_name := await queue.get()) is not None:
+                    if client.exhausted:
+                        self.skipped += 1
+                        continue
+                    updater = BranchDashboardUpdater(self.token, repo_name, engine=self.engine,
+                                                     order='recent', include=self.include,
+                                                     exclude=self.exclude, base_url=self.base_url)
+                    try:
+                        rows = await updater.fetch_branches_async(self.per_repo, client=client)
+                    except BudgetExhausted:
+                        self.skipped += 1
+                        continue
+                    self.scanned += 1
+                    for row in rows:
+                        row['repo'] = repo_name
+                        selector.push(row)
+            
+            await asyncio.gather(produce(), *(work() for _ in range(self.concurrency)))
+        
+        return selector.items()
+    
+    def render_table(self, branches: Iterable[BranchRecord]) -> Iterator[str]:
+        """
+        逐段渲染含倉庫欄位的表格與頁尾
+        
+        Args:
+            branches (Iterable[BranchRecord]): fetch_branches 返回的分支資訊
+            
+        Returns:
+            Iterator[str]: 輸出片段
+        """
+        logger.info("📝 正在生成多倉庫表格...")
+        return self._stamped(render.branch_table(branches, self.output_format, repo_column=True,
+                                                 grouped=self.layout == 'grouped'))
+
+
+def updater_from_env() -> BranchDashboardUpdater:
+    """
+    依環境變數建立更新器（main 與常駐模式共用）
+    
+    缺少必要的環境變數時記錄錯誤並以退出碼 1 結束。
+    
+    Returns:
+        BranchDashboardUpdater: 單一倉庫或多倉庫模式的更新器
     """
     # 從環境變數獲取配置
     github_token = os.getenv('GITHUB_TOKEN')
     repo_name = os.getenv('GITHUB_REPOSITORY')
+    engine = os.getenv('DASHBOARD_ENGINE', 'rest')
+    cache_dir = os.getenv('GITHUB_HTTP_CACHE')
+    snapshot_path = os.getenv('DASHBOARD_SNAPSHOT')
+    order = os.getenv('DASHBOARD_ORDER', 'recent')
+    include = parse_patterns(os.getenv('DASHBOARD_INCLUDE'))
+    exclude = parse_patterns(os.getenv('DASHBOARD_EXCLUDE'))
+    base_url = os.getenv('GITHUB_API_URL', GITHUB_API_URL)
+    async_concurrency = int(os.getenv('DASHBOARD_ASYNC_CONCURRENCY', '0'))
+    request_budget = int(os.getenv('DASHBOARD_REQUEST_BUDGET', '0'))
+    # ahead/behind 與陳舊分支標記（需要 fetch-depth: 0 的本地檢出）
+    branch_metrics = os.getenv('DASHBOARD_BRANCH_METRICS', '').lower() in ('1', 'true', 'yes')
+    # 多倉庫模式：明確的倉庫列表或整個用戶/組織
+    repos = parse_patterns(os.getenv('DASHBOARD_REPOS'))
+    owner = os.getenv('DASHBOARD_OWNER')
+    # README 區段格式：markdown（預設）、html 或 json
+    output_format = os.getenv('DASHBOARD_FORMAT', 'markdown')
+    # 指標歷史檔（提交到倉庫中），設置時在表格下方顯示分支數趨勢
+    history_path = os.getenv('DASHBOARD_HISTORY')
+    # 'api'：透過 Git Data API 直接提交 README，不需要檢出倉庫也不需要 git push
+    publish = os.getenv('DASHBOARD_PUBLISH', '').lower()
     
-    # 驗證必要的環境變數
-    if not github_token:
+    # 驗證必要的環境變數（本地引擎只讀取檢出的 refs，不需要 token）
+    if not github_token and (engine != 'local' or repos or owner):
         logger.error("❌ 錯誤: 未設置 GITHUB_TOKEN 環境變數")
         logger.info("💡 請在 GitHub Secrets 中添加 GITHUB_TOKEN")
         sys.exit(1)
     
-    if not repo_name:
+    if not repo_name and not (repos or owner):
         logger.error("❌ 錯誤: 未設置 GITHUB_REPOSITORY 環境變數")
         logger.info("💡 這通常由 GitHub Actions 自動設置")
         sys.exit(1)
     
+    publisher = None
+    if publish == 'api':
+        # README 所在的倉庫：多倉庫模式下也是執行工作流程的倉庫
+        readme_repo = os.getenv('DASHBOARD_PUBLISH_REPO') or repo_name
+        if not github_token or not readme_repo:
+            logger.error("❌ 錯誤: DASHBOARD_PUBLISH=api 需要 GITHUB_TOKEN 與 GITHUB_REPOSITORY")
+            sys.exit(1)
+        publisher = GitDataPublisher(github_token, readme_repo,
+                                     branch=os.getenv('DASHBOARD_PUBLISH_BRANCH') or None, base_url=base_url)
+    elif publish:
+        logger.error(f"❌ 錯誤: 未知的 DASHBOARD_PUBLISH: {publish}（可用: api）")
+        sys.exit(1)
+    
     # 創建更新器實例
-    updater = BranchDashboardUpdater(github_token, repo_name)
+    if repos or owner:
+        return MultiRepoDashboardUpdater(
+            github_token, repos=repos, owner=owner, engine=engine,
+            per_repo=int(os.getenv('DASHBOARD_PER_REPO', '5')),
+            layout=os.getenv('DASHBOARD_LAYOUT', 'recent'),
+            include=include, exclude=exclude, base_url=base_url,
+            concurrency=async_concurrency or DEFAULT_CONCURRENCY,
+            request_budget=request_budget, output_format=output_format, publisher=publisher,
+        )
+    return BranchDashboardUpdater(github_token, repo_name, engine=engine, cache_dir=cache_dir,
+                                  snapshot_path=snapshot_path, order=order,
+                                  include=include, exclude=exclude, base_url=base_url,
+                                  async_concurrency=async_concurrency,
+                                  request_budget=request_budget,
+                                  server_url=os.getenv('GITHUB_SERVER_URL', GITHUB_SERVER_URL),
+                                  branch_metrics=branch_metrics,
+                                  default_branch=os.getenv('DASHBOARD_DEFAULT_BRANCH') or None,
+                                  stale_days=int(os.getenv('DASHBOARD_STALE_DAYS', str(DEFAULT_STALE_DAYS))),
+                                  output_format=output_format, history_path=history_path,
+                                  publisher=publisher)
+
+
+def main():
+    """
+    主函數
+    """
+    # 配置日誌
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    
+    # 從環境變數獲取配置
+    updater = updater_from_env()
+    limit = int(os.getenv('DASHBOARD_LIMIT', '15'))
+    metrics_path = os.getenv('DASHBOARD_METRICS')
+    profile_path = os.getenv('DASHBOARD_PROFILE')
     
     # 執行更新
     try:
-        success = updater.run(limit=15, readme_path='README.md')
+        with profiled(profile_path):
+            success = updater.run(limit=limit, readme_path='README.md')
+        updater.telemetry.emit(metrics_path, os.getenv('GITHUB_STEP_SUMMARY'))
         
         # 根據結果設置退出碼
         if success:
             sys.exit(0)  # 成功
+        elif updater.status == 'unchanged' and not updater.history_appended:
+            # 指標歷史有新記錄時仍需提交，不回報無變更
+            sys.exit(noop_exit_code())  # 無變更：默認 0，可由 DASHBOARD_NOOP_EXIT_CODE 指定
         else:
-            sys.exit(0)  # 無變更也視為成功（不觸發錯誤）
+            sys.exit(0)  # 失敗也不觸發錯誤（沿用原行為）
             
     except KeyboardInterrupt:
         logger.warning("\n⚠️  用戶中斷執行")